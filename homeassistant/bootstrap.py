@@ -2,18 +2,26 @@
 import asyncio
 import contextlib
 from datetime import datetime
+import importlib
 import logging
 import logging.handlers
 import os
 import sys
 import threading
 from time import monotonic
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple
 
 import voluptuous as vol
 import yarl
 
-from homeassistant import config as conf_util, config_entries, core, loader
+from homeassistant import (
+    config as conf_util,
+    config_entries,
+    core,
+    loader,
+    requirements,
+)
 from homeassistant.components import http
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
@@ -21,6 +29,7 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
@@ -41,6 +50,8 @@ ERROR_LOG_FILENAME = "home-assistant.log"
 
 # hass.data key for logging information.
 DATA_LOGGING = "logging"
+# hass.data key for the time it took to import integration modules.
+DATA_IMPORT_TIMES = "bootstrap_import_times"
 
 LOG_SLOW_STARTUP_INTERVAL = 60
 
@@ -425,10 +436,126 @@ async def async_setup_multi_components(
         )
 
 
+def _import_integration_modules(
+    integration: loader.Integration, platforms: Iterable[str]
+) -> Dict[str, Tuple[ModuleType, float]]:
+    """Import the component and platforms of an integration.
+
+    Returns the imported modules and how long each took to import.
+    Integrations or platforms that fail to import are skipped, setting
+    them up will import them again and report the error.
+    """
+    modules = {}
+    names = [(integration.domain, integration.pkg_path)]
+    names.extend(
+        (f"{integration.domain}.{platform}", f"{integration.pkg_path}.{platform}")
+        for platform in platforms
+        if (
+            platform in integration.platforms
+            if integration.platforms is not None
+            else (integration.file_path / f"{platform}.py").exists()
+            or (integration.file_path / platform / "__init__.py").exists()
+        )
+    )
+
+    for cache_key, name in names:
+        start = monotonic()
+        try:
+            module = importlib.import_module(name)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Unable to prefetch %s", name, exc_info=True)
+            if cache_key == integration.domain:
+                break
+            continue
+        modules[cache_key] = (module, monotonic() - start)
+
+    return modules
+
+
+async def _async_prefetch_integrations(
+    hass: core.HomeAssistant,
+    integrations: Iterable[loader.Integration],
+    platforms: Set[str],
+    process_requirements: bool = False,
+) -> None:
+    """Import integrations in the executor before they are set up.
+
+    Integrations are imported in groups ordered by the dependency graph,
+    so the modules of dependencies are imported before the integrations
+    that depend on them. Setup finds the imported modules in the cache
+    instead of importing them inside the event loop.
+
+    With process_requirements, the requirements of each group are
+    processed first and integrations whose requirements could not be
+    processed are left to report the error when they are set up.
+    """
+    cache = hass.data.setdefault(loader.DATA_COMPONENTS, {})
+    import_times = hass.data.setdefault(DATA_IMPORT_TIMES, {})
+
+    # All dependencies of an integration have less dependencies than
+    # the integration itself.
+    groups: Dict[int, list] = {}
+    for integration in integrations:
+        if integration.domain in cache or not integration.all_dependencies_resolved:
+            continue
+        groups.setdefault(len(integration.all_dependencies), []).append(integration)
+
+    start = monotonic()
+    for level in sorted(groups):
+        to_import = groups[level]
+        if process_requirements:
+            to_import = [
+                int_or_exc
+                for int_or_exc in await asyncio.gather(
+                    *(
+                        requirements.async_get_integration_with_requirements(
+                            hass, integration.domain
+                        )
+                        for integration in to_import
+                    ),
+                    return_exceptions=True,
+                )
+                if isinstance(int_or_exc, loader.Integration)
+            ]
+        for modules in await asyncio.gather(
+            *(
+                hass.async_add_executor_job(
+                    _import_integration_modules, integration, platforms
+                )
+                for integration in to_import
+            )
+        ):
+            for cache_key, (module, import_time) in modules.items():
+                cache.setdefault(cache_key, module)
+                import_times[cache_key] = import_time
+                startup_trace.async_add_phase_time(
+                    hass,
+                    cache_key.partition(".")[0],
+                    startup_trace.PHASE_IMPORT,
+                    import_time,
+                )
+
+    if not import_times:
+        return
+
+    _LOGGER.info(
+        "Imported %d modules in %.2f seconds, slowest: %s",
+        len(import_times),
+        monotonic() - start,
+        ", ".join(
+            f"{cache_key} ({import_times[cache_key]:.2f}s)"
+            for cache_key in sorted(import_times, key=import_times.get, reverse=True)[
+                :10
+            ]
+        ),
+    )
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: Dict[str, Any]
 ) -> None:
     """Set up all the integrations."""
+    trace = startup_trace.async_start_trace(hass)
     setup_started = hass.data[DATA_SETUP_STARTED] = {}
     domains_to_setup = _get_domains(hass, config)
 
@@ -473,19 +600,8 @@ async def _async_set_up_integrations(
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
 
     logging_domains = domains_to_setup & LOGGING_INTEGRATIONS
-
-    # Load logging as soon as possible
-    if logging_domains:
-        _LOGGER.info("Setting up logging: %s", logging_domains)
-        await async_setup_multi_components(hass, logging_domains, config, setup_started)
-
-    # Start up debuggers. Start these first in case they want to wait.
     debuggers = domains_to_setup & DEBUGGER_INTEGRATIONS
 
-    if debuggers:
-        _LOGGER.debug("Setting up debuggers: %s", debuggers)
-        await async_setup_multi_components(hass, debuggers, config, setup_started)
-
     # calculate what components to setup in what stage
     stage_1_domains = set()
 
@@ -511,21 +627,69 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
+    # Import the stage 1 integrations in the executor while logging and
+    # debuggers are set up. Stage 2 integrations are imported later, after
+    # their requirements are processed.
+    prefetch_task = asyncio.create_task(
+        _async_prefetch_integrations(
+            hass,
+            (
+                integration_cache[domain]
+                for domain in stage_1_domains - logging_domains - debuggers
+                if domain in integration_cache
+            ),
+            domains_to_setup,
+        )
+    )
+
+    # Load logging as soon as possible
+    if logging_domains:
+        _LOGGER.info("Setting up logging: %s", logging_domains)
+        with trace.async_stage("logging", logging_domains):
+            await async_setup_multi_components(
+                hass, logging_domains, config, setup_started
+            )
+
+    # Start up debuggers. Start these first in case they want to wait.
+    if debuggers:
+        _LOGGER.debug("Setting up debuggers: %s", debuggers)
+        with trace.async_stage("debuggers", debuggers):
+            await async_setup_multi_components(hass, debuggers, config, setup_started)
+
     # Kick off loading the registries. They don't need to be awaited.
     asyncio.create_task(hass.helpers.device_registry.async_get_registry())
     asyncio.create_task(hass.helpers.entity_registry.async_get_registry())
     asyncio.create_task(hass.helpers.area_registry.async_get_registry())
 
+    with trace.async_stage("prefetch"):
+        await prefetch_task
+
+    # Process the requirements of stage 2 integrations and import them
+    # while stage 1 is set up. Wrap up waits for this task.
+    hass.async_create_task(
+        _async_prefetch_integrations(
+            hass,
+            (
+                integration_cache[domain]
+                for domain in stage_2_domains
+                if domain in integration_cache
+            ),
+            domains_to_setup,
+            process_requirements=True,
+        )
+    )
+
     # Start setup
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
         try:
-            async with hass.timeout.async_timeout(
-                STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
-            ):
-                await async_setup_multi_components(
-                    hass, stage_1_domains, config, setup_started
-                )
+            with trace.async_stage("stage_1", stage_1_domains):
+                async with hass.timeout.async_timeout(
+                    STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
+                ):
+                    await async_setup_multi_components(
+                        hass, stage_1_domains, config, setup_started
+                    )
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 1 - moving forward")
 
@@ -535,19 +699,25 @@ async def _async_set_up_integrations(
     if stage_2_domains:
         _LOGGER.info("Setting up stage 2: %s", stage_2_domains)
         try:
-            async with hass.timeout.async_timeout(
-                STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
-            ):
-                await async_setup_multi_components(
-                    hass, stage_2_domains, config, setup_started
-                )
+            with trace.async_stage("stage_2", stage_2_domains):
+                async with hass.timeout.async_timeout(
+                    STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
+                ):
+                    await async_setup_multi_components(
+                        hass, stage_2_domains, config, setup_started
+                    )
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 2 - moving forward")
 
     # Wrap up startup
     _LOGGER.debug("Waiting for startup to wrap up")
     try:
-        async with hass.timeout.async_timeout(WRAP_UP_TIMEOUT, cool_down=COOLDOWN_TIME):
-            await hass.async_block_till_done()
+        with trace.async_stage(startup_trace.STAGE_WRAP_UP):
+            async with hass.timeout.async_timeout(
+                WRAP_UP_TIMEOUT, cool_down=COOLDOWN_TIME
+            ):
+                await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    trace.async_finish()
@@ -7,6 +7,7 @@ import aiohttp
 import async_timeout
 
 from homeassistant.const import HTTP_ACCEPTED, MATCH_ALL, STATE_ON
+from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
 
 from .const import API_CHANGE, Cause
@@ -15,21 +16,71 @@ from .messages import AlexaResponse
 
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 10
+MAX_CONCURRENT_REPORTS = 4
 
 
 async def async_enable_proactive_mode(hass, smart_home_config):
     """Enable the proactive mode.
 
     Proactive mode makes this component report state changes to Alexa.
+
+    Change reports are queued per entity, so an entity that changes again
+    before its report is sent is only reported once with its latest
+    properties. Reports that would not change the properties last reported
+    for an entity are skipped and at most MAX_CONCURRENT_REPORTS reports
+    are sent at the same time. Properties are only remembered as reported
+    once Alexa accepted the report.
     """
     # Validate we can get access token.
     await smart_home_config.async_get_access_token()
 
+    reported = {}
+    sending = {}
+    pending = {}
+    workers = set()
+
+    async def async_report_worker():
+        """Send the queued change reports."""
+        while pending:
+            entity_id = next(iter(pending))
+            alexa_entity, properties, compare_properties = pending.pop(entity_id)
+            sending[entity_id] = compare_properties
+            try:
+                if await async_send_changereport_message(
+                    hass, smart_home_config, alexa_entity, properties=properties
+                ):
+                    reported[entity_id] = compare_properties
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error sending ChangeReport for %s", entity_id)
+            finally:
+                sending.pop(entity_id, None)
+
+    @callback
+    def async_queue_changereport(alexa_entity):
+        """Queue a change report unless the properties did not change."""
+        entity_id = alexa_entity.entity_id
+        properties = list(alexa_entity.serialize_properties())
+        compare_properties = _comparable_properties(properties)
+
+        if sending.get(entity_id, reported.get(entity_id)) == compare_properties:
+            _LOGGER.debug("Not reporting unchanged properties of %s", entity_id)
+            pending.pop(entity_id, None)
+            return
+
+        pending[entity_id] = (alexa_entity, properties, compare_properties)
+
+        if len(workers) < MAX_CONCURRENT_REPORTS:
+            worker = hass.async_create_task(async_report_worker())
+            workers.add(worker)
+            worker.add_done_callback(workers.discard)
+
     async def async_entity_state_listener(changed_entity, old_state, new_state):
         if not hass.is_running:
             return
 
         if not new_state:
+            reported.pop(changed_entity, None)
+            pending.pop(changed_entity, None)
             return
 
         if new_state.domain not in ENTITY_ADAPTERS:
@@ -45,9 +96,7 @@ async def async_enable_proactive_mode(hass, smart_home_config):
 
         for interface in alexa_changed_entity.interfaces():
             if interface.properties_proactively_reported():
-                await async_send_changereport_message(
-                    hass, smart_home_config, alexa_changed_entity
-                )
+                async_queue_changereport(alexa_changed_entity)
                 return
             if (
                 interface.name() == "Alexa.DoorbellEventSource"
@@ -63,11 +112,22 @@ async def async_enable_proactive_mode(hass, smart_home_config):
     )
 
 
+def _comparable_properties(properties):
+    """Return the properties without the sample time."""
+    return [
+        {key: value for key, value in prop.items() if key != "timeOfSample"}
+        for prop in properties
+    ]
+
+
 async def async_send_changereport_message(
-    hass, config, alexa_entity, *, invalidate_access_token=True
+    hass, config, alexa_entity, *, invalidate_access_token=True, properties=None
 ):
     """Send a ChangeReport message for an Alexa entity.
 
+    The properties are serialized from the entity if not passed in. Returns
+    if Alexa accepted the report.
+
     https://developer.amazon.com/docs/smarthome/state-reporting-for-a-smart-home-skill.html#report-state-with-changereport-events
     """
     token = await config.async_get_access_token()
@@ -79,7 +139,8 @@ async def async_send_changereport_message(
     # this sends all the properties of the Alexa Entity, whether they have
     # changed or not. this should be improved, and properties that have not
     # changed should be moved to the 'context' object
-    properties = list(alexa_entity.serialize_properties())
+    if properties is None:
+        properties = list(alexa_entity.serialize_properties())
 
     payload = {
         API_CHANGE: {"cause": {"type": Cause.APP_INTERACTION}, "properties": properties}
@@ -102,7 +163,7 @@ async def async_send_changereport_message(
 
     except (asyncio.TimeoutError, aiohttp.ClientError):
         _LOGGER.error("Timeout sending report to Alexa")
-        return
+        return False
 
     response_text = await response.text()
 
@@ -110,7 +171,7 @@ async def async_send_changereport_message(
     _LOGGER.debug("Received (%s): %s", response.status, response_text)
 
     if response.status == HTTP_ACCEPTED:
-        return
+        return True
 
     response_json = json.loads(response_text)
 
@@ -120,7 +181,11 @@ async def async_send_changereport_message(
     ):
         config.async_invalidate_access_token()
         return await async_send_changereport_message(
-            hass, config, alexa_entity, invalidate_access_token=False
+            hass,
+            config,
+            alexa_entity,
+            invalidate_access_token=False,
+            properties=properties,
         )
 
     _LOGGER.error(
@@ -128,6 +193,7 @@ async def async_send_changereport_message(
         response_json["payload"]["code"],
         response_json["payload"]["description"],
     )
+    return False
 
 
 async def async_send_add_or_update_message(hass, config, entity_ids):
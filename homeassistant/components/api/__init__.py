@@ -229,7 +229,11 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            states_json = f'[{", ".join(state.as_json() for state in states)}]'
+        except (ValueError, TypeError):
+            return self.json(states)
+        return self.json_encoded(states_json.encode("UTF-8"))
 
 
 class APIEntityStateView(HomeAssistantView):
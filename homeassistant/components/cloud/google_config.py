@@ -6,6 +6,9 @@ from hass_nabucasa import cloud_api
 from hass_nabucasa.google_report_state import ErrorResponse
 
 from homeassistant.components.google_assistant.helpers import AbstractConfig
+from homeassistant.components.google_assistant.report_state import (
+    async_get_report_state_stats,
+)
 from homeassistant.const import (
     CLOUD_NEVER_EXPOSED_ENTITIES,
     EVENT_HOMEASSISTANT_STARTED,
@@ -13,6 +16,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, callback, split_entity_id
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.json import json_bytes
 
 from .const import (
     CONF_ENTITY_CONFIG,
@@ -132,12 +136,17 @@ class CloudGoogleConfig(AbstractConfig):
         entity_config = entity_configs.get(state.entity_id, {})
         return not entity_config.get(PREF_DISABLE_2FA, DEFAULT_DISABLE_2FA)
 
-    async def async_report_state(self, message, agent_user_id: str):
-        """Send a state report to Google."""
+    async def async_report_state(self, message, agent_user_id: str) -> bool:
+        """Send a state report to Google and return if it was accepted."""
         try:
             await self._cloud.google_report_state.async_send_message(message)
         except ErrorResponse as err:
             _LOGGER.warning("Error reporting state - %s: %s", err.code, err.message)
+            return False
+        async_get_report_state_stats(self.hass).async_record_payload(
+            len(json_bytes(message))
+        )
+        return True
 
     async def _async_request_sync_devices(self, agent_user_id: str):
         """Trigger a sync with Google."""
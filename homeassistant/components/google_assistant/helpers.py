@@ -112,17 +112,20 @@ class AbstractConfig(ABC):
         # pylint: disable=no-self-use
         return True
 
-    async def async_report_state(self, message, agent_user_id: str):
-        """Send a state report to Google."""
+    async def async_report_state(self, message, agent_user_id: str) -> bool:
+        """Send a state report to Google and return if it was accepted."""
         raise NotImplementedError
 
-    async def async_report_state_all(self, message):
-        """Send a state report to Google for all previously synced users."""
+    async def async_report_state_all(self, message) -> bool:
+        """Send a state report to Google for all previously synced users.
+
+        Returns if the report was accepted for all of them.
+        """
         jobs = [
             self.async_report_state(message, agent_user_id)
             for agent_user_id in self._store.agent_user_ids
         ]
-        await gather(*jobs)
+        return all(await gather(*jobs))
 
     @callback
     def async_enable_report_state(self):
@@ -12,10 +12,13 @@ import jwt
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     CLOUD_NEVER_EXPOSED_ENTITIES,
+    CONTENT_TYPE_JSON,
     HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_OK,
     HTTP_UNAUTHORIZED,
 )
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 
 from .const import (
@@ -37,6 +40,7 @@ from .const import (
     SOURCE_CLOUD,
 )
 from .helpers import AbstractConfig
+from .report_state import async_get_report_state_stats
 from .smart_home import async_handle_message
 
 _LOGGER = logging.getLogger(__name__)
@@ -184,7 +188,10 @@ class GoogleConfig(AbstractConfig):
             return HTTP_INTERNAL_SERVER_ERROR
 
     async def async_call_homegraph_api(self, url, data):
-        """Call a homegraph api with authentication."""
+        """Call a homegraph api with authentication.
+
+        Data is either a JSON serializable object or an encoded JSON body.
+        """
         session = async_get_clientsession(self.hass)
 
         async def _call():
@@ -192,7 +199,12 @@ class GoogleConfig(AbstractConfig):
                 "Authorization": f"Bearer {self._access_token}",
                 "X-GFE-SSL": "yes",
             }
-            async with session.post(url, headers=headers, json=data) as res:
+            if isinstance(data, bytes):
+                headers["Content-Type"] = CONTENT_TYPE_JSON
+                body = {"data": data}
+            else:
+                body = {"json": data}
+            async with session.post(url, headers=headers, **body) as res:
                 _LOGGER.debug(
                     "Response on %s with data %s was %s", url, data, await res.text()
                 )
@@ -218,14 +230,20 @@ class GoogleConfig(AbstractConfig):
             _LOGGER.error("Could not contact %s", url)
             return HTTP_INTERNAL_SERVER_ERROR
 
-    async def async_report_state(self, message, agent_user_id: str):
-        """Send a state report to Google."""
-        data = {
-            "requestId": uuid4().hex,
-            "agentUserId": agent_user_id,
-            "payload": message,
-        }
-        await self.async_call_homegraph_api(REPORT_STATE_BASE_URL, data)
+    async def async_report_state(self, message, agent_user_id: str) -> bool:
+        """Send a state report to Google and return if it was accepted."""
+        data = json_bytes(
+            {
+                "requestId": uuid4().hex,
+                "agentUserId": agent_user_id,
+                "payload": message,
+            }
+        )
+        if await self.async_call_homegraph_api(REPORT_STATE_BASE_URL, data) != HTTP_OK:
+            return False
+
+        async_get_report_state_stats(self.hass).async_record_payload(len(data))
+        return True
 
 
 class GoogleAssistantView(HomeAssistantView):
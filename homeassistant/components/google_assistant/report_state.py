@@ -1,10 +1,13 @@
 """Google Report State implementation."""
+from collections import deque
 import logging
+import time
 
 from homeassistant.const import MATCH_ALL
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 
+from .const import DOMAIN
 from .error import SmartHomeError
 from .helpers import AbstractConfig, GoogleEntity, async_get_entities
 
@@ -12,19 +15,129 @@ from .helpers import AbstractConfig, GoogleEntity, async_get_entities
 # https://github.com/actions-on-google/smart-home-nodejs/issues/196#issuecomment-439156639
 INITIAL_REPORT_DELAY = 60
 
+# Time to collect state changes before reporting them in one request
+REPORT_STATE_WINDOW = 1
+
+# Period over which the report rate is calculated
+REPORT_RATE_PERIOD = 60
+
+DATA_REPORT_STATE_STATS = f"{DOMAIN}_report_state_stats"
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class ReportStateStats:
+    """Keep track of the state reports sent to Google."""
+
+    def __init__(self):
+        """Initialize the stats."""
+        self.reports = 0
+        self.entities_reported = 0
+        self.payloads = 0
+        self.payload_bytes = 0
+        self.max_payload_bytes = 0
+        self._report_times = deque()
+
+    @callback
+    def async_record(self, message):
+        """Record a report of a message."""
+        self.reports += 1
+        self.entities_reported += len(message["devices"]["states"])
+        now = time.monotonic()
+        self._report_times.append(now)
+        self._async_prune(now)
+
+    @callback
+    def async_record_payload(self, size):
+        """Record the size of an encoded report sent to Google."""
+        self.payloads += 1
+        self.payload_bytes += size
+        self.max_payload_bytes = max(self.max_payload_bytes, size)
+
+    @callback
+    def _async_prune(self, now):
+        """Forget the reports sent before the rate period."""
+        cutoff = now - REPORT_RATE_PERIOD
+        while self._report_times and self._report_times[0] < cutoff:
+            self._report_times.popleft()
+
+    @property
+    def reports_per_minute(self):
+        """Return the number of reports sent in the last minute."""
+        self._async_prune(time.monotonic())
+        return len(self._report_times)
+
+    def as_dict(self):
+        """Return the stats as a dictionary."""
+        return {
+            "reports": self.reports,
+            "reports_per_minute": self.reports_per_minute,
+            "entities_reported": self.entities_reported,
+            "payload_bytes": self.payload_bytes,
+            "max_payload_bytes": self.max_payload_bytes,
+            "average_payload_bytes": (
+                self.payload_bytes // self.payloads if self.payloads else 0
+            ),
+        }
+
+
+@callback
+def async_get_report_state_stats(hass: HomeAssistant) -> ReportStateStats:
+    """Return the report state stats."""
+    stats = hass.data.get(DATA_REPORT_STATE_STATS)
+    if stats is None:
+        stats = hass.data[DATA_REPORT_STATE_STATS] = ReportStateStats()
+    return stats
+
+
+async def system_health_info(hass):
+    """Get info for the info page."""
+    return async_get_report_state_stats(hass).as_dict()
+
+
 @callback
 def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig):
-    """Enable state reporting."""
+    """Enable state reporting.
+
+    The last reported data of each entity is cached to detect changes that
+    Google does not care about. Changes are collected for a short window
+    and sent in one report, changes that are reverted within the window
+    are not reported.
+    """
+    stats = async_get_report_state_stats(hass)
+    hass.components.system_health.async_register_info(DOMAIN, system_health_info)
+    reported = {}
+    pending = {}
+    unsub_pending = None
+
+    async def async_report_pending(_now):
+        """Report the pending state changes."""
+        nonlocal unsub_pending
+        unsub_pending = None
+
+        if not pending:
+            return
+
+        states = dict(pending)
+        message = {"devices": {"states": states}}
+        pending.clear()
+
+        _LOGGER.debug("Reporting states: %s", message)
+        if not await google_config.async_report_state_all(message):
+            return
+
+        reported.update(states)
+        stats.async_record(message)
 
     async def async_entity_state_listener(changed_entity, old_state, new_state):
+        nonlocal unsub_pending
+
         if not hass.is_running:
             return
 
         if not new_state:
+            reported.pop(changed_entity, None)
+            pending.pop(changed_entity, None)
             return
 
         if not google_config.should_expose(new_state):
@@ -41,18 +154,29 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
             _LOGGER.debug("Not reporting state for %s: %s", changed_entity, err.code)
             return
 
-        if old_state:
-            old_entity = GoogleEntity(hass, google_config, old_state)
+        if changed_entity in reported:
+            old_entity_data = reported[changed_entity]
+        elif old_state:
+            try:
+                old_entity_data = GoogleEntity(
+                    hass, google_config, old_state
+                ).query_serialize()
+            except SmartHomeError:
+                old_entity_data = None
+        else:
+            old_entity_data = None
 
-            # Only report to Google if data that Google cares about has changed
-            if entity_data == old_entity.query_serialize():
-                return
+        # Only report to Google if data that Google cares about has changed
+        if entity_data == old_entity_data:
+            pending.pop(changed_entity, None)
+            return
 
-        _LOGGER.debug("Reporting state for %s: %s", changed_entity, entity_data)
+        pending[changed_entity] = entity_data
 
-        await google_config.async_report_state_all(
-            {"devices": {"states": {changed_entity: entity_data}}}
-        )
+        if unsub_pending is None:
+            unsub_pending = async_call_later(
+                hass, REPORT_STATE_WINDOW, async_report_pending
+            )
 
     async def inital_report(_now):
         """Report initially all states."""
@@ -70,10 +194,24 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
         if not entities:
             return
 
-        await google_config.async_report_state_all({"devices": {"states": entities}})
+        message = {"devices": {"states": entities}}
+        if not await google_config.async_report_state_all(message):
+            return
+
+        reported.update(entities)
+        stats.async_record(message)
 
     async_call_later(hass, INITIAL_REPORT_DELAY, inital_report)
 
-    return hass.helpers.event.async_track_state_change(
+    unsub_state_change = hass.helpers.event.async_track_state_change(
         MATCH_ALL, async_entity_state_listener
     )
+
+    @callback
+    def unsub():
+        """Stop reporting states."""
+        unsub_state_change()
+        if unsub_pending is not None:
+            unsub_pending()
+
+    return unsub
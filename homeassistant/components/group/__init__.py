@@ -2,7 +2,7 @@
 import asyncio
 from contextvars import ContextVar
 import logging
-from typing import Any, Dict, Iterable, List, Optional, Set, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
 
 import voluptuous as vol
 
@@ -56,6 +56,7 @@ SERVICE_REMOVE = "remove"
 PLATFORMS = ["light", "cover", "notify"]
 
 REG_KEY = f"{DOMAIN}_registry"
+DATA_EXPANSIONS = f"{DOMAIN}_expansions"
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -128,7 +129,15 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
     Async friendly.
     """
+    return _expand_entity_ids(hass, entity_ids, {})
+
+
+def _expand_entity_ids(
+    hass: HomeAssistantType, entity_ids: Iterable[Any], groups: Dict[str, Any]
+) -> List[str]:
+    """Expand entity_ids and add the members of the expanded groups to groups."""
     found_ids: List[str] = []
+    seen_ids: Set[str] = set()
     for entity_id in entity_ids:
         if not isinstance(entity_id, str) or entity_id in (
             ENTITY_MATCH_NONE,
@@ -143,27 +152,64 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
             domain, _ = ha.split_entity_id(entity_id)
 
             if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id
-                    for ent_id in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids
-                )
-
+                members, group_members = _expand_group(hass, entity_id)
+                groups.update(group_members)
             else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+                members = [entity_id]
 
         except AttributeError:
             # Raised by split_entity_id if entity_id is not a string
-            pass
+            continue
+
+        for ent_id in members:
+            if ent_id not in seen_ids:
+                seen_ids.add(ent_id)
+                found_ids.append(ent_id)
 
     return found_ids
 
 
+def _group_members(hass: HomeAssistantType, entity_id: str) -> Any:
+    """Return the entity_id attribute of a group state."""
+    state = hass.states.get(entity_id)
+    if state is None:
+        return None
+    return state.attributes.get(ATTR_ENTITY_ID)
+
+
+def _expand_group(
+    hass: HomeAssistantType, entity_id: str
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Return the expanded members of a group and the groups it was built from.
+
+    Expansions are cached until the members of one of the expanded groups,
+    including nested ones, change.
+    """
+    expansions: Dict[str, Tuple[List[str], Dict[str, Any]]] = hass.data.setdefault(
+        DATA_EXPANSIONS, {}
+    )
+    cached = expansions.get(entity_id)
+    if cached is not None:
+        for group_id, members in cached[1].items():
+            current = _group_members(hass, group_id)
+            if current is not members and current != members:
+                break
+        else:
+            return cached
+
+    members = _group_members(hass, entity_id)
+    groups = {entity_id: members}
+    child_entities = list(members) if members else []
+    if entity_id in child_entities:
+        child_entities.remove(entity_id)
+
+    expanded = expansions[entity_id] = (
+        _expand_entity_ids(hass, child_entities, groups),
+        groups,
+    )
+    return expanded
+
+
 @bind_hass
 def get_entity_ids(
     hass: HomeAssistantType, entity_id: str, domain_filter: Optional[str] = None
@@ -433,6 +479,8 @@ class Group(Entity):
         self._on_off = None
         self._assumed = None
         self._on_states = None
+        self._on_count = 0
+        self._assumed_count = 0
         self.user_defined = user_defined
         self.mode = any
         if mode:
@@ -664,6 +712,8 @@ class Group(Entity):
         self._on_off = {}
         self._assumed = {}
         self._on_states = set()
+        self._on_count = 0
+        self._assumed_count = 0
 
         for entity_id in self.trackable:
             state = self.hass.states.get(entity_id)
@@ -679,12 +729,24 @@ class Group(Entity):
         domain_on_state = self.hass.data[REG_KEY].on_states_by_domain.get(
             domain, {STATE_ON}
         )
-        self._on_off[entity_id] = state.state in domain_on_state
-        self._assumed[entity_id] = state.attributes.get(ATTR_ASSUMED_STATE)
+        is_on = state.state in domain_on_state
+        is_assumed = bool(state.attributes.get(ATTR_ASSUMED_STATE))
+
+        # Keep the counters in step with the previous state of the member
+        self._on_count += is_on - self._on_off.get(entity_id, False)
+        self._assumed_count += is_assumed - self._assumed.get(entity_id, False)
+        self._on_off[entity_id] = is_on
+        self._assumed[entity_id] = is_assumed
 
         if domain in self.hass.data[REG_KEY].on_states_by_domain:
             self._on_states.update(domain_on_state)
 
+    def _mode_applies(self, count):
+        """Return if the mode holds when count members match it."""
+        if self.mode is all:
+            return count == len(self._on_off)
+        return count > 0
+
     @callback
     def _async_update_group_state(self, tr_state=None):
         """Update group state.
@@ -706,7 +768,7 @@ class Group(Entity):
             or self._assumed_state
             and not tr_state.attributes.get(ATTR_ASSUMED_STATE)
         ):
-            self._assumed_state = self.mode(self._assumed.values())
+            self._assumed_state = self._mode_applies(self._assumed_count)
 
         elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
             self._assumed_state = True
@@ -716,7 +778,7 @@ class Group(Entity):
         # have the same on state we use this state
         # and its hass.data[REG_KEY].on_off_mapping to off
         if num_on_states == 1:
-            on_state = list(self._on_states)[0]
+            on_state = next(iter(self._on_states))
         # If we do not have an on state for any domains
         # we use None (which will be STATE_UNKNOWN)
         elif num_on_states == 0:
@@ -727,7 +789,7 @@ class Group(Entity):
         else:
             on_state = STATE_ON
 
-        group_is_on = self.mode(self._on_off.values())
+        group_is_on = self._mode_applies(self._on_count)
         if group_is_on:
             self._state = on_state
         else:
@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -123,6 +124,13 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # State changes since the start of the period as (timestamp, matches)
+        # tuples, backfilled from the database once and then kept up to date
+        # from state changed events.
+        self._changes = None
+        self._changes_start = None
+        self._live_changes = deque()
+
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
 
@@ -131,14 +139,25 @@ class HistoryStatsSensor(Entity):
             """Register state tracking."""
 
             @callback
-            def force_refresh(*args):
-                """Force the component to refresh."""
+            def state_changed(event):
+                """Record the state change and refresh."""
+                new_state = event.data.get("new_state")
+                old_state = event.data.get("old_state")
+                if new_state is not None and (
+                    old_state is None or old_state.state != new_state.state
+                ):
+                    self._live_changes.append(
+                        (
+                            new_state.last_changed.timestamp(),
+                            new_state.state == self._entity_state,
+                        )
+                    )
                 self.async_schedule_update_ha_state(True)
 
-            force_refresh()
+            self.async_schedule_update_ha_state(True)
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], state_changed
                 )
             )
 
@@ -223,27 +242,28 @@ class HistoryStatsSensor(Entity):
             and end_timestamp <= now_timestamp
         ):
             # Don't compute anything as the value cannot have changed
+            if self._changes is not None:
+                self._merge_live_changes()
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
+        if self._changes is None or start_timestamp < self._changes_start:
+            # The period starts before the known history
+            if not self._backfill(start, start_timestamp):
+                return
+        else:
+            self._slide_start(start_timestamp)
 
-        if self._entity_id not in history_list.keys():
-            return
+        self._merge_live_changes()
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
+        last_state = False
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
+        for current_time, current_state in self._changes:
+            if current_time >= end_timestamp:
+                break
 
             if last_state:
                 elapsed += current_time - last_time
@@ -264,6 +284,53 @@ class HistoryStatsSensor(Entity):
         # Save counter
         self.count = count
 
+    def _backfill(self, start, start_timestamp):
+        """Load the state changes since the start of the period.
+
+        Returns False if the entity has no history.
+        """
+        history_list = history.state_changes_during_period(
+            self.hass, start, None, str(self._entity_id)
+        )
+
+        if self._entity_id not in history_list.keys():
+            # The entity is not recorded, the live changes will not be used
+            self._live_changes.clear()
+            return False
+
+        # The first item is the state at the start of the period
+        self._changes = [
+            (
+                max(item.last_changed.timestamp(), start_timestamp),
+                item.state == self._entity_state,
+            )
+            for item in history_list[self._entity_id]
+        ]
+        self._changes_start = start_timestamp
+        return True
+
+    def _slide_start(self, start_timestamp):
+        """Drop the state changes before the start of the period."""
+        self._changes_start = start_timestamp
+        changes = self._changes
+        index = 0
+        while index < len(changes) and changes[index][0] <= start_timestamp:
+            index += 1
+
+        if index:
+            # The last change before the start is the state at the start
+            del changes[: index - 1]
+            changes[0] = (start_timestamp, changes[0][1])
+
+    def _merge_live_changes(self):
+        """Add the state changes that are not in the history yet."""
+        live_changes = self._live_changes
+        changes = self._changes
+        while live_changes:
+            change = live_changes.popleft()
+            if not changes or change[0] > changes[-1][0]:
+                changes.append(change)
+
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
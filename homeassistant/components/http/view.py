@@ -1,6 +1,5 @@
 """Support for views."""
 import asyncio
-import json
 import logging
 from typing import Any, Callable, List, Optional
 
@@ -16,7 +15,7 @@ import voluptuous as vol
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
 from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_bytes
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
@@ -49,12 +48,21 @@ class HomeAssistantView:
     ) -> web.Response:
         """Return a JSON response."""
         try:
-            msg = json.dumps(result, cls=JSONEncoder, allow_nan=False).encode("UTF-8")
+            msg = json_bytes(result)
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_encoded(msg, status_code, headers)
+
+    @staticmethod
+    def json_encoded(
+        result_json: bytes,
+        status_code: int = HTTP_OK,
+        headers: Optional[LooseHeaders] = None,
+    ) -> web.Response:
+        """Return a response for an already JSON encoded result."""
         response = web.Response(
-            body=msg,
+            body=result_json,
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
@@ -33,6 +33,7 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
 )
+from homeassistant.util.async_ import run_callback_threadsafe
 
 from .const import (
     API_VERSION_2,
@@ -44,6 +45,13 @@ from .const import (
     CODE_INVALID_INPUTS,
     COMPONENT_CONFIG_SCHEMA_CONNECTION,
     CONF_API_VERSION,
+    CONF_BATCH,
+    CONF_BATCH_CONNECTIONS,
+    CONF_BATCH_FLUSH_INTERVAL,
+    CONF_BATCH_GZIP,
+    CONF_BATCH_MAX_BYTES,
+    CONF_BATCH_MAX_POINTS,
+    CONF_BATCH_RETRY_BUFFER,
     CONF_BUCKET,
     CONF_COMPONENT_CONFIG,
     CONF_COMPONENT_CONFIG_DOMAIN,
@@ -67,6 +75,11 @@ from .const import (
     CONF_VERIFY_SSL,
     CONNECTION_ERROR,
     DEFAULT_API_VERSION,
+    DEFAULT_BATCH_CONNECTIONS,
+    DEFAULT_BATCH_FLUSH_INTERVAL,
+    DEFAULT_BATCH_MAX_BYTES,
+    DEFAULT_BATCH_MAX_POINTS,
+    DEFAULT_BATCH_RETRY_BUFFER,
     DEFAULT_HOST_V2,
     DEFAULT_SSL_V2,
     DOMAIN,
@@ -92,6 +105,7 @@ from .const import (
     WRITE_ERROR,
     WROTE_MESSAGE,
 )
+from .writer import InfluxBatchWriter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -150,9 +164,32 @@ _CUSTOMIZE_ENTITY_SCHEMA = vol.Schema(
     }
 )
 
+_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_BATCH_MAX_POINTS, default=DEFAULT_BATCH_MAX_POINTS
+        ): cv.positive_int,
+        vol.Optional(
+            CONF_BATCH_MAX_BYTES, default=DEFAULT_BATCH_MAX_BYTES
+        ): cv.positive_int,
+        vol.Optional(
+            CONF_BATCH_FLUSH_INTERVAL, default=DEFAULT_BATCH_FLUSH_INTERVAL
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_BATCH_CONNECTIONS, default=DEFAULT_BATCH_CONNECTIONS
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(
+            CONF_BATCH_RETRY_BUFFER, default=DEFAULT_BATCH_RETRY_BUFFER
+        ): cv.positive_int,
+        vol.Optional(CONF_BATCH_GZIP, default=True): cv.boolean,
+    }
+)
+
 _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {
         vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+        # An empty batch key enables batching with the defaults
+        vol.Optional(CONF_BATCH): vol.All(lambda value: value or {}, _BATCH_SCHEMA),
         vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
         vol.Optional(CONF_OVERRIDE_MEASUREMENT): cv.string,
         vol.Optional(CONF_TAGS, default={}): vol.Schema({cv.string: cv.string}),
@@ -435,6 +472,11 @@ def get_influx_connection(conf, test_write=False, test_read=False):
     return InfluxClient(databases, write_v1, query_v1, close_v1)
 
 
+async def system_health_info(hass):
+    """Get info for the info page."""
+    return hass.data[DOMAIN].stats
+
+
 def setup(hass, config):
     """Set up the InfluxDB component."""
     conf = config[DOMAIN]
@@ -446,6 +488,22 @@ def setup(hass, config):
         return True
 
     event_to_json = _generate_event_to_json(conf)
+
+    if CONF_BATCH in conf:
+        influx.close()
+        writer = hass.data[DOMAIN] = InfluxBatchWriter(
+            hass, conf, conf[CONF_BATCH], event_to_json
+        )
+        writer.start()
+        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, lambda _: writer.stop())
+        run_callback_threadsafe(
+            hass.loop,
+            hass.components.system_health.async_register_info,
+            DOMAIN,
+            system_health_info,
+        ).result()
+        return True
+
     max_tries = conf.get(CONF_RETRY_COUNT)
     instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
     instance.start()
@@ -30,6 +30,13 @@ CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_RETRY_COUNT = "max_retries"
 CONF_IGNORE_ATTRIBUTES = "ignore_attributes"
 CONF_PRECISION = "precision"
+CONF_BATCH = "batch"
+CONF_BATCH_MAX_POINTS = "max_points"
+CONF_BATCH_MAX_BYTES = "max_bytes"
+CONF_BATCH_FLUSH_INTERVAL = "flush_interval"
+CONF_BATCH_CONNECTIONS = "connections"
+CONF_BATCH_RETRY_BUFFER = "retry_buffer"
+CONF_BATCH_GZIP = "gzip"
 
 CONF_LANGUAGE = "language"
 CONF_QUERIES = "queries"
@@ -56,6 +63,13 @@ DEFAULT_FIELD = "value"
 DEFAULT_RANGE_START = "-15m"
 DEFAULT_RANGE_STOP = "now()"
 DEFAULT_FUNCTION_FLUX = "|> limit(n: 1)"
+DEFAULT_HOST_V1 = "localhost"
+DEFAULT_PORT_V1 = 8086
+DEFAULT_BATCH_MAX_POINTS = 5000
+DEFAULT_BATCH_MAX_BYTES = 1024 * 1024
+DEFAULT_BATCH_FLUSH_INTERVAL = 1
+DEFAULT_BATCH_CONNECTIONS = 2
+DEFAULT_BATCH_RETRY_BUFFER = 50000
 
 INFLUX_CONF_MEASUREMENT = "measurement"
 INFLUX_CONF_TAGS = "tags"
@@ -117,6 +131,7 @@ RETRY_MESSAGE = f"%s Retrying in {RETRY_INTERVAL} seconds."
 CATCHING_UP_MESSAGE = "Catching up, dropped %d old events."
 RESUMED_MESSAGE = "Resumed, lost %d events."
 WROTE_MESSAGE = "Wrote %d events."
+DROPPED_RETRY_MESSAGE = "Retry buffer full, dropped %d points."
 RUNNING_QUERY_MESSAGE = "Running query: %s."
 QUERY_NO_RESULTS_MESSAGE = "Query returned no results, sensor state set to UNKNOWN: %s."
 QUERY_MULTIPLE_RESULTS_MESSAGE = (
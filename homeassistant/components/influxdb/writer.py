@@ -0,0 +1,418 @@
+"""Batching line protocol writer for InfluxDB."""
+from collections import deque
+from datetime import datetime, timezone
+import gzip
+import logging
+import math
+import queue
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PATH,
+    CONF_PORT,
+    CONF_SSL,
+    CONF_TOKEN,
+    CONF_URL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import callback
+
+from .const import (
+    API_VERSION_2,
+    CLIENT_ERROR_V1,
+    CLIENT_ERROR_V2,
+    CODE_INVALID_INPUTS,
+    CONF_API_VERSION,
+    CONF_BATCH_CONNECTIONS,
+    CONF_BATCH_FLUSH_INTERVAL,
+    CONF_BATCH_GZIP,
+    CONF_BATCH_MAX_BYTES,
+    CONF_BATCH_MAX_POINTS,
+    CONF_BATCH_RETRY_BUFFER,
+    CONF_BUCKET,
+    CONF_DB_NAME,
+    CONF_ORG,
+    CONF_PRECISION,
+    CONNECTION_ERROR,
+    DEFAULT_HOST_V1,
+    DEFAULT_PORT_V1,
+    DOMAIN,
+    DROPPED_RETRY_MESSAGE,
+    INFLUX_CONF_FIELDS,
+    INFLUX_CONF_MEASUREMENT,
+    INFLUX_CONF_TAGS,
+    INFLUX_CONF_TIME,
+    RESUMED_MESSAGE,
+    RETRY_DELAY,
+    TIMEOUT,
+    WRITE_ERROR,
+    WROTE_MESSAGE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_PRECISION_DIVISORS = {"ns": 1, "us": 10 ** 3, "ms": 10 ** 6, "s": 10 ** 9}
+_MEASUREMENT_ESCAPES = str.maketrans({",": r"\,", " ": r"\ ", "\n": r"\n"})
+_KEY_ESCAPES = str.maketrans(
+    {"\\": "\\\\", ",": r"\,", "=": r"\=", " ": r"\ ", "\n": r"\n"}
+)
+_STRING_ESCAPES = str.maketrans({"\\": "\\\\", '"': r"\"", "\n": r"\n"})
+
+# Marker to flush the buffered points without waiting for the interval
+_FLUSH = object()
+
+
+def _timestamp(value: Any, precision: Optional[str]) -> int:
+    """Return a timestamp as an integer in the given precision."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - _EPOCH
+        nanoseconds = (
+            delta.days * 86400 + delta.seconds
+        ) * 10 ** 9 + delta.microseconds * 1000
+    else:
+        nanoseconds = int(value * 10 ** 9)
+    return nanoseconds // _PRECISION_DIVISORS[precision or "ns"]
+
+
+def _field_value(value: Any) -> Optional[str]:
+    """Return a field value in line protocol."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}i"
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return repr(value)
+    return f'"{str(value).translate(_STRING_ESCAPES)}"'
+
+
+def point_to_line(point: Dict[str, Any], precision: Optional[str] = None) -> str:
+    """Serialize a point to a line of InfluxDB line protocol.
+
+    Returns an empty string if the point has no fields to write.
+    """
+    fields = []
+    for key, value in point[INFLUX_CONF_FIELDS].items():
+        value = _field_value(value)
+        if value is not None:
+            fields.append(f"{str(key).translate(_KEY_ESCAPES)}={value}")
+
+    if not fields:
+        return ""
+
+    parts = [str(point[INFLUX_CONF_MEASUREMENT]).translate(_MEASUREMENT_ESCAPES)]
+    for key, value in sorted(point[INFLUX_CONF_TAGS].items()):
+        value = str(value)
+        if value:
+            parts.append(
+                f"{str(key).translate(_KEY_ESCAPES)}={value.translate(_KEY_ESCAPES)}"
+            )
+
+    return (
+        f"{','.join(parts)} {','.join(fields)} "
+        f"{_timestamp(point[INFLUX_CONF_TIME], precision)}"
+    )
+
+
+def get_write_request(conf: Dict) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+    """Return the URL, parameters and headers to write line protocol."""
+    params = {}
+    headers = {"Content-Type": "text/plain; charset=utf-8"}
+    precision = conf.get(CONF_PRECISION)
+    if precision:
+        params["precision"] = precision
+
+    if conf[CONF_API_VERSION] == API_VERSION_2:
+        params["org"] = conf[CONF_ORG]
+        params["bucket"] = conf[CONF_BUCKET]
+        headers["Authorization"] = f"Token {conf[CONF_TOKEN]}"
+        return f"{conf[CONF_URL]}/api/v2/write", params, headers
+
+    scheme = "https" if conf.get(CONF_SSL) else "http"
+    host = conf.get(CONF_HOST, DEFAULT_HOST_V1)
+    port = conf.get(CONF_PORT, DEFAULT_PORT_V1)
+    path = conf.get(CONF_PATH, "").strip("/")
+    url = f"{scheme}://{host}:{port}/"
+    if path:
+        url = f"{url}{path}/"
+
+    params["db"] = conf[CONF_DB_NAME]
+    if CONF_USERNAME in conf:
+        params["u"] = conf[CONF_USERNAME]
+        params["p"] = conf[CONF_PASSWORD]
+
+    return f"{url}write", params, headers
+
+
+class InfluxBatchWriter:
+    """Write events to InfluxDB in batches of line protocol.
+
+    One thread turns events into lines and collects them into batches. A
+    batch is sent when it reaches the maximum number of points or bytes, or
+    when its oldest point has waited for the flush interval. Batches are
+    sent by several threads, each with its own connection. Batches that
+    fail to be sent are kept in a retry buffer holding a bounded number of
+    points, the oldest points are dropped when it is full. The points
+    dropped while writes are failing are reported once writing resumes,
+    write_errors counts the requests that failed.
+    """
+
+    def __init__(
+        self,
+        hass,
+        conf: Dict,
+        batch_conf: Dict,
+        event_to_json: Callable[[Any], Optional[Dict]],
+    ):
+        """Initialize the writer."""
+        self.queue: queue.Queue = queue.Queue()
+        self._event_to_json = event_to_json
+        self._precision = conf.get(CONF_PRECISION)
+        self._url, self._params, self._headers = get_write_request(conf)
+        self._verify_ssl = conf[CONF_VERIFY_SSL]
+        self._client_error = (
+            CLIENT_ERROR_V2
+            if conf[CONF_API_VERSION] == API_VERSION_2
+            else CLIENT_ERROR_V1
+        )
+        self._max_points = batch_conf[CONF_BATCH_MAX_POINTS]
+        self._max_bytes = batch_conf[CONF_BATCH_MAX_BYTES]
+        self._flush_interval = batch_conf[CONF_BATCH_FLUSH_INTERVAL]
+        self._retry_buffer_points = batch_conf[CONF_BATCH_RETRY_BUFFER]
+        self._gzip = batch_conf[CONF_BATCH_GZIP]
+        if self._gzip:
+            self._headers["Content-Encoding"] = "gzip"
+
+        self._batches: queue.Queue = queue.Queue()
+        self._retry: Deque[Tuple[bytes, int]] = deque()
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._shutdown = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run_batcher, name=f"{DOMAIN}_batcher")
+        ] + [
+            threading.Thread(target=self._run_sender, name=f"{DOMAIN}_writer_{idx}")
+            for idx in range(batch_conf[CONF_BATCH_CONNECTIONS])
+        ]
+
+        self.events = 0
+        self.points_written = 0
+        self.batches_written = 0
+        self.bytes_written = 0
+        self.points_dropped = 0
+        self.write_errors = 0
+        self._retry_points = 0
+        self._failing = False
+        # Points dropped since writes started failing
+        self._lost_points = 0
+
+        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
+
+    @callback
+    def _event_listener(self, event):
+        """Queue events for the batcher thread."""
+        self.queue.put(event)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the throughput and backlog counters."""
+        return {
+            "events": self.events,
+            "points_written": self.points_written,
+            "batches_written": self.batches_written,
+            "bytes_written": self.bytes_written,
+            "points_dropped": self.points_dropped,
+            "write_errors": self.write_errors,
+            "queued_events": self.queue.qsize(),
+            "queued_batches": self._batches.qsize(),
+            "retry_points": self._retry_points,
+        }
+
+    def start(self) -> None:
+        """Start the writer threads."""
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Write the queued events and stop the writer threads.
+
+        Batches waiting in the retry buffer are not retried anymore.
+        """
+        self._shutdown.set()
+        self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def block_till_done(self) -> None:
+        """Block till all queued events are sent or in the retry buffer."""
+        self.queue.put(_FLUSH)
+        self.queue.join()
+        self._batches.join()
+
+    def _run_batcher(self) -> None:
+        """Turn events into batches of lines."""
+        lines: List[bytes] = []
+        size = 0
+        deadline = 0.0
+
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if lines else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+                from_queue = False
+            else:
+                from_queue = True
+
+            if item is None:
+                self.queue.task_done()
+                break
+
+            if item is not _FLUSH:
+                self.events += 1
+                point = self._event_to_json(item)
+                line = point_to_line(point, self._precision) if point else ""
+                if line:
+                    if not lines:
+                        deadline = time.monotonic() + self._flush_interval
+                    encoded = line.encode("utf-8")
+                    lines.append(encoded)
+                    size += len(encoded) + 1
+
+            if lines and (
+                item is _FLUSH
+                or len(lines) >= self._max_points
+                or size >= self._max_bytes
+            ):
+                self._queue_batch(lines)
+                lines = []
+                size = 0
+
+            if from_queue:
+                self.queue.task_done()
+
+        if lines:
+            self._queue_batch(lines)
+
+        for _ in range(len(self._threads) - 1):
+            self._batches.put(None)
+
+    def _queue_batch(self, lines: List[bytes]) -> None:
+        """Queue encoded lines to be sent as one batch."""
+        payload = b"\n".join(lines)
+        if self._gzip:
+            payload = gzip.compress(payload, compresslevel=5)
+        self._batches.put((payload, len(lines)))
+
+    def _next_batch(self) -> Tuple[Optional[Tuple[bytes, int]], bool]:
+        """Return the next batch and if it was taken from the queue."""
+        while True:
+            timeout = None
+            with self._lock:
+                if self._retry and not self._shutdown.is_set():
+                    timeout = self._retry_at - time.monotonic()
+                    if timeout <= 0:
+                        batch = self._retry.popleft()
+                        self._retry_points -= batch[1]
+                        return batch, False
+
+            try:
+                return self._batches.get(timeout=timeout), True
+            except queue.Empty:
+                continue
+
+    def _run_sender(self) -> None:
+        """Send batches with a connection of this thread."""
+        session = requests.Session()
+
+        while True:
+            batch, from_queue = self._next_batch()
+
+            if batch is None:
+                self._batches.task_done()
+                break
+
+            try:
+                self._send(session, batch)
+            except ValueError as err:
+                self._count_write_error()
+                _LOGGER.error(err)
+            except ConnectionError as err:
+                self._count_write_error()
+                self._retry_later(batch, err)
+            finally:
+                if from_queue:
+                    self._batches.task_done()
+
+        session.close()
+
+    def _send(self, session: requests.Session, batch: Tuple[bytes, int]) -> None:
+        """Send a batch to InfluxDB."""
+        payload, points = batch
+        try:
+            response = session.post(
+                self._url,
+                params=self._params,
+                headers=self._headers,
+                data=payload,
+                timeout=TIMEOUT,
+                verify=self._verify_ssl,
+            )
+        except (requests.exceptions.RequestException, OSError) as exc:
+            raise ConnectionError(CONNECTION_ERROR % exc) from exc
+
+        if response.status_code == CODE_INVALID_INPUTS:
+            raise ValueError(WRITE_ERROR % (f"{points} points", response.text))
+        if response.status_code >= 300:
+            raise ConnectionError(self._client_error % response.text)
+
+        with self._lock:
+            self.points_written += points
+            self.batches_written += 1
+            self.bytes_written += len(payload)
+            if self._failing:
+                _LOGGER.error(RESUMED_MESSAGE, self._lost_points)
+                self._failing = False
+                self._lost_points = 0
+
+        _LOGGER.debug(WROTE_MESSAGE, points)
+
+    def _count_write_error(self) -> None:
+        """Count a write request that failed."""
+        with self._lock:
+            self.write_errors += 1
+
+    def _retry_later(self, batch: Tuple[bytes, int], err: ConnectionError) -> None:
+        """Keep a batch to send again after the retry delay."""
+        dropped = 0
+        with self._lock:
+            if not self._failing:
+                _LOGGER.error(err)
+                self._failing = True
+
+            self._retry.append(batch)
+            self._retry_points += batch[1]
+            self._retry_at = time.monotonic() + RETRY_DELAY
+
+            while self._retry_points > self._retry_buffer_points:
+                _, points = self._retry.popleft()
+                self._retry_points -= points
+                dropped += points
+            self.points_dropped += dropped
+            self._lost_points += dropped
+
+        if dropped:
+            _LOGGER.warning(DROPPED_RETRY_MESSAGE, dropped)
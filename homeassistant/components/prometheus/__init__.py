@@ -1,12 +1,13 @@
 """Support for Prometheus metrics export."""
+from collections import Counter
 import logging
 import string
+import threading
 
 from aiohttp import web
 import prometheus_client
 import voluptuous as vol
 
-from homeassistant import core as hacore
 from homeassistant.components.climate.const import (
     ATTR_CURRENT_TEMPERATURE,
     ATTR_HVAC_ACTION,
@@ -32,6 +33,7 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import entityfilter, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
@@ -42,6 +44,7 @@ _LOGGER = logging.getLogger(__name__)
 API_ENDPOINT = "/api/prometheus"
 
 DOMAIN = "prometheus"
+CONF_COLLECT_ON_SCRAPE = "collect_on_scrape"
 CONF_FILTER = "filter"
 CONF_PROM_NAMESPACE = "namespace"
 CONF_COMPONENT_CONFIG = "component_config"
@@ -58,6 +61,7 @@ CONFIG_SCHEMA = vol.Schema(
         DOMAIN: vol.All(
             {
                 vol.Optional(CONF_FILTER, default={}): entityfilter.FILTER_SCHEMA,
+                vol.Optional(CONF_COLLECT_ON_SCRAPE, default=False): cv.boolean,
                 vol.Optional(CONF_PROM_NAMESPACE): cv.string,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
@@ -79,8 +83,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -103,7 +105,13 @@ def setup(hass, config):
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    if conf[CONF_COLLECT_ON_SCRAPE]:
+        # Only count the state changes, the states are read when scraped
+        hass.http.register_view(PrometheusView(prometheus_client, metrics))
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.async_count_event)
+    else:
+        hass.http.register_view(PrometheusView(prometheus_client))
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
     return True
 
 
@@ -140,6 +148,11 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics = {}
         self._climate_units = climate_units
+        self._domain_handlers = {}
+        self._filter_results = {}
+        self._pending_changes = Counter()
+        self._pending_states = {}
+        self._collect_lock = threading.Lock()
 
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
@@ -149,21 +162,89 @@ class PrometheusMetrics:
 
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
-        domain, _ = hacore.split_entity_id(entity_id)
 
-        if not self._filter(state.entity_id):
+        if not self._is_included(entity_id):
             return
 
-        handler = f"_handle_{domain}"
-
-        if hasattr(self, handler) and state.state != STATE_UNAVAILABLE:
-            getattr(self, handler)(state)
+        self._handle_state(state)
 
-        labels = self._labels(state)
         state_change = self._metric(
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
-        state_change.labels(**labels).inc()
+        state_change.labels(**self._labels(state)).inc()
+
+    @callback
+    def async_count_event(self, event):
+        """Count a state change to add when the metrics are collected."""
+        state = event.data.get("new_state")
+        if state is None:
+            return
+
+        entity_id = state.entity_id
+        if not self._is_included(entity_id):
+            return
+
+        self._pending_changes[entity_id] += 1
+        self._pending_states[entity_id] = state
+
+    @callback
+    def async_pop_state_changes(self):
+        """Return the counted state changes as (state, count) and reset them."""
+        state_changes = [
+            (self._pending_states[entity_id], count)
+            for entity_id, count in self._pending_changes.items()
+        ]
+        self._pending_changes.clear()
+        self._pending_states.clear()
+        return state_changes
+
+    def collect(self, states, state_changes):
+        """Update the metrics of the states and the counted state changes.
+
+        This runs in the executor on a snapshot of the states, concurrent
+        scrapes are collected one at a time.
+        """
+        with self._collect_lock:
+            for state in states:
+                if self._is_included(state.entity_id):
+                    self._handle_state(state)
+
+            if not state_changes:
+                return
+
+            state_change = self._metric(
+                "state_change",
+                self.prometheus_cli.Counter,
+                "The number of state changes",
+            )
+            for state, count in state_changes:
+                state_change.labels(**self._labels(state)).inc(count)
+
+    def _is_included(self, entity_id):
+        """Return if the entity passes the filter, caching the result."""
+        included = self._filter_results.get(entity_id)
+        if included is None:
+            included = self._filter_results[entity_id] = self._filter(entity_id)
+        return included
+
+    def _domain_handler(self, domain):
+        """Return the handler of a domain, caching the lookup."""
+        try:
+            return self._domain_handlers[domain]
+        except KeyError:
+            handler = self._domain_handlers[domain] = getattr(
+                self, f"_handle_{domain}", None
+            )
+            return handler
+
+    def _handle_state(self, state):
+        """Update the metrics of a state."""
+        handler = self._domain_handler(state.domain)
+
+        if handler is not None and state.state != STATE_UNAVAILABLE:
+            handler(state)
+
+        labels = self._labels(state)
 
         entity_available = self._metric(
             "entity_available",
@@ -479,15 +560,31 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
-        """Initialize Prometheus view."""
+    def __init__(self, prometheus_cli, metrics=None):
+        """Initialize Prometheus view.
+
+        The metrics are collected from the states on each request if passed.
+        """
         self.prometheus_cli = prometheus_cli
+        self.metrics = metrics
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
-        return web.Response(
-            body=self.prometheus_cli.generate_latest(),
-            content_type=CONTENT_TYPE_TEXT_PLAIN,
-        )
+        if self.metrics is None:
+            body = self.prometheus_cli.generate_latest()
+        else:
+            hass = request.app["hass"]
+            body = await hass.async_add_executor_job(
+                self._collect,
+                hass.states.async_all(),
+                self.metrics.async_pop_state_changes(),
+            )
+
+        return web.Response(body=body, content_type=CONTENT_TYPE_TEXT_PLAIN)
+
+    def _collect(self, states, state_changes):
+        """Collect the metrics of the states and generate the response body."""
+        self.metrics.collect(states, state_changes)
+        return self.prometheus_cli.generate_latest()
@@ -2,7 +2,7 @@
 import asyncio
 from collections import namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import threading
@@ -24,13 +24,14 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -200,6 +201,14 @@ class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask:
+    """An object to insert into the recorder queue to commit the event session."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to send a keep alive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -237,12 +246,11 @@ class Recorder(threading.Thread):
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
-        self._timechanges_seen = 0
-        self._keepalive_count = 0
         self._old_states = {}
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
+        self._periodic_listeners: List[CALLBACK_TYPE] = []
 
     @callback
     def async_initialize(self):
@@ -311,12 +319,14 @@ class Recorder(threading.Thread):
             self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
 
             if self.hass.state == CoreState.running:
+                self._async_setup_periodic_tasks()
                 hass_started.set_result(None)
             else:
 
                 @callback
                 def notify_hass_started(event):
                     """Notify that hass has started."""
+                    self._async_setup_periodic_tasks()
                     hass_started.set_result(None)
 
                 self.hass.bus.async_listen_once(
@@ -345,8 +355,8 @@ class Recorder(threading.Thread):
 
         self.event_session = self.get_session()
         # Use a session for the event read loop
-        # with a commit every time the event time
-        # has changed. This reduces the disk io.
+        # with a commit every commit interval.
+        # This reduces the disk io.
         while True:
             event = self.queue.get()
             if event is None:
@@ -361,16 +371,11 @@ class Recorder(threading.Thread):
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
                 continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self._keepalive_count += 1
-                if self._keepalive_count >= KEEPALIVE_TIME:
-                    self._keepalive_count = 0
-                    self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
+            if isinstance(event, KeepAliveTask):
+                self._send_keep_alive()
+                continue
+            if isinstance(event, CommitTask):
+                self._commit_event_session_or_retry()
                 continue
             if event.event_type in self.exclude_t:
                 continue
@@ -417,6 +422,44 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    @callback
+    def _async_setup_periodic_tasks(self):
+        """Queue keep alives and commits at their intervals."""
+
+        @callback
+        def async_keep_alive(now):
+            """Queue a keep alive."""
+            self.queue.put(KeepAliveTask())
+
+        self._periodic_listeners.append(
+            async_track_time_interval(
+                self.hass, async_keep_alive, timedelta(seconds=KEEPALIVE_TIME)
+            )
+        )
+
+        if self.commit_interval:
+
+            @callback
+            def async_commit(now):
+                """Queue a commit of the event session."""
+                self.queue.put(CommitTask())
+
+            self._periodic_listeners.append(
+                async_track_time_interval(
+                    self.hass, async_commit, timedelta(seconds=self.commit_interval)
+                )
+            )
+
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_periodic_tasks
+        )
+
+    @callback
+    def _async_stop_periodic_tasks(self, event):
+        """Stop queueing keep alives and commits."""
+        while self._periodic_listeners:
+            self._periodic_listeners.pop()()
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -497,6 +540,8 @@ class Recorder(threading.Thread):
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return
         self.queue.put(event)
 
     def block_till_done(self):
@@ -1,19 +1,44 @@
 """The SSDP integration."""
 import asyncio
+from collections import defaultdict
+from contextlib import suppress
 from datetime import timedelta
 import logging
+import socket
 
 import aiohttp
 from defusedxml import ElementTree
 from netdisco import ssdp, util
+from zeroconf import get_all_addresses
 
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_ssdp
 
 DOMAIN = "ssdp"
+# How often to check if the network interfaces changed
 SCAN_INTERVAL = timedelta(seconds=60)
 
+SSDP_MULTICAST_ADDR = "239.255.255.250"
+SSDP_PORT = 1900
+SSDP_TARGET = (SSDP_MULTICAST_ADDR, SSDP_PORT)
+SSDP_MULTICAST_TTL = 2
+
+# M-SEARCH requests are sent this many times, as packets can get lost
+SEARCH_REPEAT = 3
+SEARCH_REPEAT_DELAY = 1
+SEARCH_REQUESTS = (
+    ssdp.ssdp_request(ssdp.ST_ALL),
+    ssdp.ssdp_request(ssdp.ST_ROOTDEVICE),
+)
+
+# Seconds a fetched device description is reused
+DESCRIPTION_CACHE_TTL = 300
+
+NTS_ALIVE = "ssdp:alive"
+NTS_UPDATE = "ssdp:update"
+
 # Attributes for accessing info from SSDP response
 ATTR_SSDP_LOCATION = "ssdp_location"
 ATTR_SSDP_ST = "ssdp_st"
@@ -42,75 +67,252 @@ async def async_setup(hass, config):
 
     async def initialize(_):
         scanner = Scanner(hass, await async_get_ssdp(hass))
-        await scanner.async_scan(None)
-        async_track_time_interval(hass, scanner.async_scan, SCAN_INTERVAL)
+        await scanner.async_start()
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, initialize)
 
     return True
 
 
+class IntegrationMatchers:
+    """Find the integrations that match discovery info.
+
+    All items of a matcher have to match, so a matcher is indexed by one of
+    its items and only the matchers indexed by an item of the discovery info
+    are checked.
+    """
+
+    def __init__(self, integration_matchers):
+        """Initialize the index."""
+        self._match_all = set()
+        self._index = defaultdict(list)
+
+        for domain, matchers in integration_matchers.items():
+            for matcher in matchers:
+                if not matcher:
+                    self._match_all.add(domain)
+                    continue
+                self._index[next(iter(matcher.items()))].append((domain, matcher))
+
+    def matching_domains(self, info):
+        """Return the domains with a matcher that matches the info."""
+        domains = set(self._match_all)
+
+        for item in info.items():
+            try:
+                candidates = self._index.get(item)
+            except TypeError:
+                # Unhashable values like service lists are never indexed
+                continue
+
+            if candidates is None:
+                continue
+
+            for domain, matcher in candidates:
+                if domain not in domains and all(
+                    info.get(key) == value for key, value in matcher.items()
+                ):
+                    domains.add(domain)
+
+        return domains
+
+
+class SsdpProtocol(asyncio.DatagramProtocol):
+    """Pass the datagrams received on a socket to the scanner."""
+
+    def __init__(self, scanner):
+        """Initialize the protocol."""
+        self._scanner = scanner
+
+    def datagram_received(self, data, addr):
+        """Handle a datagram."""
+        self._scanner.async_datagram_received(data, addr)
+
+    def error_received(self, exc):
+        """Handle an error on the socket."""
+        _LOGGER.debug("Error on SSDP socket: %s", exc)
+
+
+def _create_listen_socket(addresses):
+    """Create a socket that receives the announcements on the network."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    with suppress(AttributeError, OSError):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    try:
+        sock.bind(("", SSDP_PORT))
+    except OSError:
+        sock.close()
+        raise
+
+    group = socket.inet_aton(SSDP_MULTICAST_ADDR)
+    for address in addresses:
+        try:
+            sock.setsockopt(
+                socket.IPPROTO_IP,
+                socket.IP_ADD_MEMBERSHIP,
+                group + socket.inet_aton(address),
+            )
+        except OSError as err:
+            _LOGGER.debug("Unable to join SSDP group on %s: %s", address, err)
+
+    return sock
+
+
+def _create_search_socket(address):
+    """Create a socket to send searches from an interface."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, SSDP_MULTICAST_TTL)
+        sock.bind((address, 0))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
 class Scanner:
-    """Class to manage SSDP scanning."""
+    """Class to manage SSDP discovery.
+
+    Devices announce themselves with NOTIFY messages, which are received as
+    long as the scanner runs. Searches are only sent at start and when the
+    network interfaces change, to find the devices that do not announce
+    themselves often.
+    """
 
     def __init__(self, hass, integration_matchers):
         """Initialize class."""
         self.hass = hass
         self.seen = set()
-        self._integration_matchers = integration_matchers
+        self._integration_matchers = IntegrationMatchers(integration_matchers)
         self._description_cache = {}
+        self._addresses = None
+        self._listen_transport = None
+        self._search_transports = []
+        self._search_handles = []
+        self._unsub_check_network = None
+
+    async def async_start(self):
+        """Start listening and search the network."""
+        await self._async_check_network(None)
+        self._unsub_check_network = async_track_time_interval(
+            self.hass, self._async_check_network, SCAN_INTERVAL
+        )
+        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_stop)
+
+    async def async_stop(self, *_):
+        """Stop listening."""
+        if self._unsub_check_network is not None:
+            self._unsub_check_network()
+            self._unsub_check_network = None
+        self._async_close_transports()
+
+    async def _async_check_network(self, _):
+        """Recreate the sockets and search when the network changed."""
+        addresses = await self.hass.async_add_executor_job(get_all_addresses)
+        if addresses == self._addresses:
+            return
 
-    async def async_scan(self, _):
-        """Scan for new entries."""
-        _LOGGER.debug("Scanning")
-        # Run 3 times as packets can get lost
-        for _ in range(3):
-            entries = await self.hass.async_add_executor_job(ssdp.scan)
-            await self._process_entries(entries)
-
-        # We clear the cache after each run. We track discovered entries
-        # so will never need a description twice.
-        self._description_cache.clear()
-
-    async def _process_entries(self, entries):
-        """Process SSDP entries."""
-        tasks = []
+        _LOGGER.debug("Network addresses changed to %s", addresses)
+        self._addresses = addresses
+        self._async_close_transports()
+        await self._async_create_transports(addresses)
+        await self.async_scan(None)
 
-        for entry in entries:
-            key = (entry.st, entry.location)
+    async def _async_create_transports(self, addresses):
+        """Create the sockets to listen for announcements and search."""
+        loop = self.hass.loop
 
-            if key in self.seen:
+        try:
+            sock = await self.hass.async_add_executor_job(
+                _create_listen_socket, addresses
+            )
+        except OSError as err:
+            _LOGGER.warning("Unable to listen for SSDP announcements: %s", err)
+        else:
+            self._listen_transport, _ = await loop.create_datagram_endpoint(
+                lambda: SsdpProtocol(self), sock=sock
+            )
+
+        for address in addresses:
+            try:
+                sock = await self.hass.async_add_executor_job(
+                    _create_search_socket, address
+                )
+            except OSError as err:
+                _LOGGER.debug("Unable to search on %s: %s", address, err)
                 continue
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: SsdpProtocol(self), sock=sock
+            )
+            self._search_transports.append(transport)
+
+    @callback
+    def _async_cancel_searches(self):
+        """Cancel the searches that still have to be sent."""
+        for handle in self._search_handles:
+            handle.cancel()
+        self._search_handles = []
+
+    @callback
+    def _async_close_transports(self):
+        """Close all sockets."""
+        self._async_cancel_searches()
+        if self._listen_transport is not None:
+            self._listen_transport.close()
+            self._listen_transport = None
+        for transport in self._search_transports:
+            transport.close()
+        self._search_transports = []
 
-            self.seen.add(key)
-
-            tasks.append(self._process_entry(entry))
-
-        if not tasks:
+    async def async_scan(self, _):
+        """Search the network for devices."""
+        _LOGGER.debug("Scanning")
+        self._async_cancel_searches()
+        self._search_handles = [
+            self.hass.loop.call_later(
+                repeat * SEARCH_REPEAT_DELAY, self._async_send_search
+            )
+            for repeat in range(1, SEARCH_REPEAT)
+        ]
+        self._async_send_search()
+
+    @callback
+    def _async_send_search(self):
+        """Send the searches from all interfaces."""
+        for transport in self._search_transports:
+            for request in SEARCH_REQUESTS:
+                transport.sendto(request, SSDP_TARGET)
+
+    @callback
+    def async_datagram_received(self, data, addr):
+        """Handle a search response or an announcement."""
+        try:
+            response = data.decode("utf-8")
+        except UnicodeDecodeError:
+            _LOGGER.debug("Ignoring invalid unicode response from %s", addr)
             return
 
-        to_load = [
-            result for result in await asyncio.gather(*tasks) if result is not None
-        ]
+        entry = ssdp.UPNPEntry.from_response(response)
 
-        if not to_load:
+        if response.startswith("NOTIFY"):
+            # Devices leaving the network do not need to be processed
+            if entry.values.get("nts") not in (NTS_ALIVE, NTS_UPDATE):
+                return
+            entry.values["st"] = entry.values.get("nt")
+        elif not response.startswith("HTTP/"):
+            # Searches from other control points
             return
 
-        tasks = []
-
-        for entry, info, domains in to_load:
-            for domain in domains:
-                _LOGGER.debug("Discovered %s at %s", domain, entry.location)
-                tasks.append(
-                    self.hass.config_entries.flow.async_init(
-                        domain, context={"source": DOMAIN}, data=info
-                    )
-                )
+        key = (entry.st, entry.location)
+        if key in self.seen:
+            return
+        self.seen.add(key)
 
-        await asyncio.wait(tasks)
+        self.hass.async_create_task(self._process_entry(entry))
 
     async def _process_entry(self, entry):
-        """Process a single entry."""
+        """Process a single entry and start the flows of matching integrations."""
 
         info = {"st": entry.st}
         for key in "usn", "ext", "server":
@@ -118,28 +320,46 @@ class Scanner:
                 info[key] = entry.values[key]
 
         if entry.location:
+            info.update(await self._async_get_description(entry.location))
 
-            # Multiple entries usually share same location. Make sure
-            # we fetch it only once.
-            info_req = self._description_cache.get(entry.location)
-
-            if info_req is None:
-                info_req = self._description_cache[
-                    entry.location
-                ] = self.hass.async_create_task(self._fetch_description(entry.location))
-
-            info.update(await info_req)
+        domains = self._integration_matchers.matching_domains(info)
+        if not domains:
+            return
 
-        domains = set()
-        for domain, matchers in self._integration_matchers.items():
-            for matcher in matchers:
-                if all(info.get(k) == v for (k, v) in matcher.items()):
-                    domains.add(domain)
+        data = info_from_entry(entry, info)
+        tasks = []
+        for domain in domains:
+            _LOGGER.debug("Discovered %s at %s", domain, entry.location)
+            tasks.append(
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        domain, context={"source": DOMAIN}, data=data
+                    )
+                )
+            )
 
-        if domains:
-            return (entry, info_from_entry(entry, info), domains)
+        await asyncio.wait(tasks)
 
-        return None
+    @callback
+    def _async_get_description(self, location):
+        """Return a task fetching the description at a location.
+
+        Multiple entries usually share the same location, so a description is
+        fetched once and reused for a while.
+        """
+        now = self.hass.loop.time()
+        cached = self._description_cache.get(location)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        self._description_cache = {
+            cached_location: value
+            for cached_location, value in self._description_cache.items()
+            if value[0] > now
+        }
+        task = self.hass.async_create_task(self._fetch_description(location))
+        self._description_cache[location] = (now + DESCRIPTION_CACHE_TTL, task)
+        return task
 
     async def _fetch_description(self, xml_location):
         """Fetch an XML description."""
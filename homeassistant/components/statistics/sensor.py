@@ -1,7 +1,5 @@
 """Support for statistics for sensor values."""
-from collections import deque
 import logging
-import statistics
 
 import voluptuous as vol
 
@@ -25,6 +23,7 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.util import dt as dt_util
+from homeassistant.util.rolling_statistics import RollingStatistics
 
 from . import DOMAIN, PLATFORMS
 
@@ -97,8 +96,11 @@ class StatisticsSensor(Entity):
         self._max_age = max_age
         self._precision = precision
         self._unit_of_measurement = None
-        self.states = deque(maxlen=self._sampling_size)
-        self.ages = deque(maxlen=self._sampling_size)
+        self._stats = RollingStatistics(
+            self._sampling_size, self._max_age, numeric=not self.is_binary
+        )
+        self.states = self._stats.values
+        self.ages = self._stats.timestamps
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -151,17 +153,18 @@ class StatisticsSensor(Entity):
 
         try:
             if self.is_binary:
-                self.states.append(new_state.state)
+                value = new_state.state
             else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
+                value = float(new_state.state)
         except ValueError:
             _LOGGER.error(
                 "%s: parsing error, expected number and received %s",
                 self.entity_id,
                 new_state.state,
             )
+            return
+
+        self._stats.add(value, new_state.last_updated)
 
     @property
     def name(self):
@@ -220,24 +223,11 @@ class StatisticsSensor(Entity):
             self._max_age,
         )
 
-        while self.ages and (now - self.ages[0]) > self._max_age:
-            _LOGGER.debug(
-                "%s: purging record with datetime %s(%s)",
-                self.entity_id,
-                dt_util.as_local(self.ages[0]),
-                (now - self.ages[0]),
-            )
-            self.ages.popleft()
-            self.states.popleft()
+        self._stats.purge(now)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
-        if self.ages and self._max_age:
-            # Take the oldest entry from the ages list and add the configured max_age.
-            # If executed after purging old states, the result is the next timestamp
-            # in the future when the oldest state will expire.
-            return self.ages[0] + self._max_age
-        return None
+        return self._stats.next_expiry()
 
     async def async_update(self):
         """Get the latest data and updates the states."""
@@ -248,24 +238,25 @@ class StatisticsSensor(Entity):
         self.count = len(self.states)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            stats = self._stats
+            if stats.count:  # require only one data point
+                self.mean = round(stats.mean, self._precision)
+                self.median = round(stats.median, self._precision)
+            else:
+                _LOGGER.debug("%s: no data points available", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if stats.count > 1:  # require at least two data points
+                self.stdev = round(stats.stdev, self._precision)
+                self.variance = round(stats.variance, self._precision)
+            else:
+                _LOGGER.debug("%s: at least two data points required", self.entity_id)
                 self.stdev = self.variance = STATE_UNKNOWN
 
-            if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+            if stats.count:
+                self.total = round(stats.total, self._precision)
+                self.min = round(stats.min, self._precision)
+                self.max = round(stats.max, self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -274,8 +265,8 @@ class StatisticsSensor(Entity):
                 self.average_change = self.change
                 self.change_rate = 0
 
-                if len(self.states) > 1:
-                    self.average_change /= len(self.states) - 1
+                if stats.count > 1:
+                    self.average_change /= stats.count - 1
 
                     time_diff = (self.max_age - self.min_age).total_seconds()
                     if time_diff > 0:
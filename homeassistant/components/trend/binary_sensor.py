@@ -1,5 +1,4 @@
 """A sensor that monitors trends in other components."""
-from collections import deque
 import logging
 import math
 
@@ -129,7 +128,7 @@ class SensorTrend(BinarySensorEntity):
         self._min_gradient = min_gradient
         self._gradient = None
         self._state = None
-        self.samples = deque(maxlen=max_samples)
+        self.samples = TrendSamples(max_samples)
 
     @property
     def name(self):
@@ -179,8 +178,9 @@ class SensorTrend(BinarySensorEntity):
                 else:
                     state = new_state.state
                 if state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-                    sample = (new_state.last_updated.timestamp(), float(state))
-                    self.samples.append(sample)
+                    self.samples.append(
+                        new_state.last_updated.timestamp(), float(state)
+                    )
                     self.async_schedule_update_ha_state(True)
             except (ValueError, TypeError) as ex:
                 _LOGGER.error(ex)
@@ -195,15 +195,13 @@ class SensorTrend(BinarySensorEntity):
         """Get the latest data and update the states."""
         # Remove outdated samples
         if self._sample_duration > 0:
-            cutoff = utcnow().timestamp() - self._sample_duration
-            while self.samples and self.samples[0][0] < cutoff:
-                self.samples.popleft()
+            self.samples.purge(utcnow().timestamp() - self._sample_duration)
 
-        if len(self.samples) < 2:
+        gradient = self.samples.gradient()
+        if gradient is None:
             return
 
-        # Calculate gradient of linear trend
-        await self.hass.async_add_job(self._calculate_gradient)
+        self._gradient = gradient
 
         # Update state
         self._state = (
@@ -214,12 +212,109 @@ class SensorTrend(BinarySensorEntity):
         if self._invert:
             self._state = not self._state
 
-    def _calculate_gradient(self):
-        """Compute the linear trend gradient of the current samples.
 
-        This need run inside executor.
+class TrendSamples:
+    """Window of samples with a streaming least squares fit.
+
+    Samples are kept in preallocated NumPy ring buffers. The linear fit is
+    derived from running sums that are updated when samples enter or leave
+    the window, so it does not need to revisit the samples. Timestamps are
+    summed relative to an origin close to the window to keep the sums
+    precise. The sums are recomputed against a new origin once every sample
+    in the window has been replaced, which also discards accumulated
+    rounding errors.
+    """
+
+    def __init__(self, max_samples):
+        """Initialize the window."""
+        self._timestamps = np.empty(max_samples)
+        self._values = np.empty(max_samples)
+        self._start = 0
+        self._count = 0
+        self._evictions = 0
+        self._origin = 0.0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    def __len__(self):
+        """Return the number of samples in the window."""
+        return self._count
+
+    def append(self, timestamp, value):
+        """Add a sample, evicting the oldest one if the window is full."""
+        if not len(self._timestamps):
+            # A window of zero samples keeps nothing
+            return
+
+        if self._count == len(self._timestamps):
+            self._evict()
+
+        if not self._count:
+            self._origin = timestamp
+
+        index = (self._start + self._count) % len(self._timestamps)
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        self._count += 1
+
+        t = timestamp - self._origin
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+    def purge(self, cutoff):
+        """Evict the samples older than the cutoff timestamp."""
+        while self._count and self._timestamps[self._start] < cutoff:
+            self._evict()
+
+    def _evict(self):
+        """Remove the oldest sample."""
+        t = self._timestamps[self._start] - self._origin
+        value = self._values[self._start]
+        self._start = (self._start + 1) % len(self._timestamps)
+        self._count -= 1
+        self._evictions += 1
+
+        if self._evictions >= self._count:
+            self._rebuild()
+            return
+
+        self._sum_t -= t
+        self._sum_v -= value
+        self._sum_tt -= t * t
+        self._sum_tv -= t * value
+
+    def _rebuild(self):
+        """Recompute the running sums relative to the oldest sample."""
+        self._evictions = 0
+        timestamps, values = self.arrays()
+        if not self._count:
+            self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+            return
+
+        self._origin = timestamps[0]
+        timestamps = timestamps - self._origin
+        self._sum_t = float(timestamps.sum())
+        self._sum_v = float(values.sum())
+        self._sum_tt = float(np.dot(timestamps, timestamps))
+        self._sum_tv = float(np.dot(timestamps, values))
+
+    def arrays(self):
+        """Return arrays of the timestamps and values, oldest first."""
+        indexes = (self._start + np.arange(self._count)) % len(self._timestamps)
+        return self._timestamps[indexes], self._values[indexes]
+
+    def gradient(self):
+        """Return the gradient of the linear trend of the samples.
+
+        Returns None if there are not enough distinct timestamps.
         """
-        timestamps = np.array([t for t, _ in self.samples])
-        values = np.array([s for _, s in self.samples])
-        coeffs = np.polyfit(timestamps, values, 1)
-        self._gradient = coeffs[0]
+        count = self._count
+        if count < 2:
+            return None
+
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+
+        return (count * self._sum_tv - self._sum_t * self._sum_v) / denominator
@@ -14,7 +14,7 @@ from homeassistant.exceptions import (
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity
+from homeassistant.helpers import config_validation as cv, entity, startup_trace
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
@@ -43,6 +43,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_startup_trace)
 
 
 def pong_message(iden):
@@ -184,7 +185,15 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    # States cache their JSON, so join them instead of serializing the list
+    try:
+        states_json = f'[{", ".join(state.as_json() for state in states)}]'
+    except (ValueError, TypeError):
+        # Let the writer report which data could not be serialized
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(messages.result_message_json(msg["id"], states_json))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -405,3 +414,17 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "startup_trace"})
+@decorators.require_admin
+def handle_startup_trace(hass, connection, msg):
+    """Handle download startup trace command."""
+    trace = startup_trace.async_get_trace(hass)
+
+    if trace is None:
+        connection.send_error(msg["id"], ERR_NOT_FOUND, "No startup trace recorded")
+        return
+
+    connection.send_result(msg["id"], trace.as_dict())
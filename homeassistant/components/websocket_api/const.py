@@ -1,12 +1,10 @@
 """Websocket constants."""
 import asyncio
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Callable
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa
@@ -45,4 +43,4 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP = json_dumps
@@ -33,6 +33,14 @@ def result_message(iden: int, result: Any = None) -> Dict:
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def result_message_json(iden: int, result_json: str) -> str:
+    """Return a success result message with an already JSON encoded result."""
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", '
+        f'"success": true, "result": {result_json}}}'
+    )
+
+
 def error_message(iden: int, code: str, message: str) -> Dict:
     """Return an error result message."""
     return {
@@ -1,9 +1,12 @@
 """Support for exposing Home Assistant via Zeroconf."""
+from collections import deque
 import fnmatch
 from functools import partial
 import ipaddress
 import logging
+import re
 import socket
+from time import monotonic
 
 import voluptuous as vol
 from zeroconf import (
@@ -27,6 +30,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
     __version__,
 )
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.network import NoURLAvailableError, get_url
 from homeassistant.helpers.singleton import singleton
@@ -37,6 +41,7 @@ from .usage import install_multiple_zeroconf_catcher
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "zeroconf"
+DATA_DISCOVERY = "zeroconf_discovery"
 
 ATTR_HOST = "host"
 ATTR_PORT = "port"
@@ -63,6 +68,12 @@ MAX_PROPERTY_VALUE_LEN = 230
 # Dns label max length
 MAX_NAME_LEN = 63
 
+# Number of services resolved at the same time
+RESOLVE_WORKERS = 4
+
+# Seconds an unchanged service is not discovered again
+DISCOVERY_COOLDOWN = 300
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -232,37 +243,161 @@ async def _async_start_zeroconf_browser(hass, zeroconf):
     if HOMEKIT_TYPE not in zeroconf_types:
         types.append(HOMEKIT_TYPE)
 
-    def service_update(zeroconf, service_type, name, state_change):
-        """Service state changed."""
-        nonlocal zeroconf_types
-        nonlocal homekit_models
+    discovery = hass.data[DATA_DISCOVERY] = ZeroconfDiscovery(
+        hass, zeroconf, zeroconf_types, homekit_models
+    )
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, discovery.async_stop)
+
+    _LOGGER.debug("Starting Zeroconf browser")
+    HaServiceBrowser(zeroconf, types, handlers=[discovery.service_update])
+
+
+def _compile_matcher(entry):
+    """Compile the patterns of a zeroconf matcher."""
+    name = entry.get("name")
+    macaddress = entry.get("macaddress")
+    return (
+        entry["domain"],
+        name and re.compile(fnmatch.translate(name)).match,
+        macaddress and re.compile(fnmatch.translate(macaddress)).match,
+    )
+
+
+class ZeroconfDiscovery:
+    """Resolve the services found by the browser and start discovery flows.
+
+    The browser thread only queues the services that were added. They are
+    resolved in the executor by a few workers and matched against the
+    precompiled patterns of the integrations. A service that is found again
+    with the same properties is skipped for a while.
+    """
 
+    def __init__(self, hass, zeroconf, zeroconf_types, homekit_models):
+        """Initialize the discovery."""
+        self.hass = hass
+        self.zeroconf = zeroconf
+        self.homekit_models = homekit_models
+        self._matchers = {
+            service_type: [_compile_matcher(entry) for entry in entries]
+            for service_type, entries in zeroconf_types.items()
+        }
+        self._queue = deque()
+        self._queued = set()
+        self._workers = 0
+        self._stopped = False
+        self._handled = {}
+        self._resolved = 0
+        self._resolve_time = 0.0
+        self._resolve_time_max = 0.0
+        self._queue_depth_max = 0
+        self._duplicates = 0
+
+    @property
+    def stats(self):
+        """Return statistics of the discovery."""
+        return {
+            "queue_depth": len(self._queue),
+            "queue_depth_max": self._queue_depth_max,
+            "resolved": self._resolved,
+            "resolve_time_avg": self._resolve_time / self._resolved
+            if self._resolved
+            else 0.0,
+            "resolve_time_max": self._resolve_time_max,
+            "duplicates": self._duplicates,
+        }
+
+    def service_update(self, zeroconf, service_type, name, state_change):
+        """Service state changed, called from the browser thread."""
         if state_change != ServiceStateChange.Added:
             return
 
+        self.hass.loop.call_soon_threadsafe(self.async_queue, service_type, name)
+
+    @callback
+    def async_queue(self, service_type, name):
+        """Queue a service to be resolved."""
+        key = (service_type, name)
+        if self._stopped or key in self._queued:
+            return
+
+        self._queued.add(key)
+        self._queue.append(key)
+        self._queue_depth_max = max(self._queue_depth_max, len(self._queue))
+
+        if self._workers < RESOLVE_WORKERS:
+            self._workers += 1
+            self.hass.async_create_task(self._async_worker())
+
+    @callback
+    def async_stop(self, _event=None):
+        """Stop resolving services."""
+        self._stopped = True
+        self._queue.clear()
+        self._queued.clear()
+
+    async def _async_worker(self):
+        """Resolve the queued services until the queue is empty."""
+        try:
+            while self._queue:
+                key = self._queue.popleft()
+                try:
+                    await self._async_resolve(*key)
+                finally:
+                    self._queued.discard(key)
+        finally:
+            self._workers -= 1
+
+    async def _async_resolve(self, service_type, name):
+        """Resolve a service and start the flows of matching integrations."""
+        start = monotonic()
         try:
-            service_info = zeroconf.get_service_info(service_type, name)
+            service_info = await self.hass.async_add_executor_job(
+                self.zeroconf.get_service_info, service_type, name
+            )
         except ZeroconfError:
             _LOGGER.exception("Failed to get info for device %s", name)
             return
+        finally:
+            resolve_time = monotonic() - start
+            self._resolved += 1
+            self._resolve_time += resolve_time
+            self._resolve_time_max = max(self._resolve_time_max, resolve_time)
 
         if not service_info:
-            # Prevent the browser thread from collapsing as
-            # service_info can be None
             _LOGGER.debug("Failed to get info for device %s", name)
             return
 
         info = info_from_service(service_info)
         if not info:
-            # Prevent the browser thread from collapsing
             _LOGGER.debug("Failed to get addresses for device %s", name)
             return
 
+        service_hash = hash(
+            (
+                info[ATTR_HOST],
+                info[ATTR_PORT],
+                frozenset(info[ATTR_PROPERTIES]["_raw"].items()),
+            )
+        )
+        now = monotonic()
+        handled = self._handled.get((service_type, name))
+        if (
+            handled is not None
+            and handled[0] == service_hash
+            and now - handled[1] < DISCOVERY_COOLDOWN
+        ):
+            self._duplicates += 1
+            _LOGGER.debug("Ignoring unchanged device %s", name)
+            return
+        self._handled[(service_type, name)] = (service_hash, now)
+
         _LOGGER.debug("Discovered new device %s %s", name, info)
 
         # If we can handle it as a HomeKit discovery, we do that here.
         if service_type == HOMEKIT_TYPE:
-            discovery_was_forwarded = handle_homekit(hass, homekit_models, info)
+            discovery_was_forwarded = handle_homekit(
+                self.hass, self.homekit_models, info
+            )
             # Continue on here as homekit_controller
             # still needs to get updates on devices
             # so it can see when the 'c#' field is updated.
@@ -284,33 +419,24 @@ async def _async_start_zeroconf_browser(hass, zeroconf):
                     # likely bad homekit data
                     return
 
-        for entry in zeroconf_types[service_type]:
-            if len(entry) > 1:
-                if "macaddress" in entry:
-                    if "properties" not in info:
-                        continue
-                    if "macaddress" not in info["properties"]:
-                        continue
-                    if not fnmatch.fnmatch(
-                        info["properties"]["macaddress"], entry["macaddress"]
-                    ):
-                        continue
-                if "name" in entry:
-                    if "name" not in info:
-                        continue
-                    if not fnmatch.fnmatch(info["name"], entry["name"]):
-                        continue
-
-            hass.add_job(
-                hass.config_entries.flow.async_init(
-                    entry["domain"], context={"source": DOMAIN}, data=info
+        for domain, name_match, macaddress_match in self._matchers.get(
+            service_type, ()
+        ):
+            if macaddress_match:
+                macaddress = info[ATTR_PROPERTIES].get("macaddress")
+                if macaddress is None or not macaddress_match(macaddress):
+                    continue
+            if name_match and not name_match(info[ATTR_NAME]):
+                continue
+
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    domain, context={"source": DOMAIN}, data=info
                 )
             )
 
-    _LOGGER.debug("Starting Zeroconf browser")
-    HaServiceBrowser(zeroconf, types, handlers=[service_update])
-
 
+@callback
 def handle_homekit(hass, homekit_models, info) -> bool:
     """Handle a HomeKit discovery.
 
@@ -335,7 +461,7 @@ def handle_homekit(hass, homekit_models, info) -> bool:
         ):
             continue
 
-        hass.add_job(
+        hass.async_create_task(
             hass.config_entries.flow.async_init(
                 homekit_models[test_model], context={"source": "homekit"}, data=info
             )
@@ -1,6 +1,8 @@
 """Support for the definition of zones."""
+from collections import defaultdict
 import logging
-from typing import Any, Dict, Optional, cast
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 import voluptuous as vol
 
@@ -16,6 +18,7 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_RADIUS,
     EVENT_CORE_CONFIG_UPDATE,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_UNAVAILABLE,
 )
@@ -87,28 +90,220 @@ RELOAD_SERVICE_SCHEMA = vol.Schema({})
 STORAGE_KEY = DOMAIN
 STORAGE_VERSION = 1
 
+DATA_ZONE_INDEX = "zone_index"
+
+# Size of the cells of the zone index, about 11 km of latitude
+GRID_CELL_DEGREES = 0.1
+# Circles covering more cells are not looked up in the grid
+MAX_GRID_CELLS = 64
+# Lower bound of the length of a degree of latitude or longitude at the equator
+METERS_PER_DEGREE = 110000
+# Mean radius of the earth, used by the haversine prefilter
+EARTH_RADIUS = 6371008.8
+# The haversine distance is within 0.6% of the distance on the ellipsoid
+HAVERSINE_TOLERANCE = 0.01
+
+GridCell = Tuple[int, int]
+
+
+def _grid_cells(
+    latitude: float, longitude: float, radius: float
+) -> Optional[List[GridCell]]:
+    """Return the cells of the zone index a circle overlaps.
+
+    Returns None if the circle covers too many cells, crosses the
+    antimeridian or is too close to a pole.
+    """
+    lat_span = radius / METERS_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_span, 90)))
+    if cos_lat < 0.01:
+        return None
+    lon_span = lat_span / cos_lat
+
+    if longitude - lon_span < -180 or longitude + lon_span > 180:
+        return None
+
+    lat_min = math.floor((latitude - lat_span) / GRID_CELL_DEGREES)
+    lat_max = math.floor((latitude + lat_span) / GRID_CELL_DEGREES)
+    lon_min = math.floor((longitude - lon_span) / GRID_CELL_DEGREES)
+    lon_max = math.floor((longitude + lon_span) / GRID_CELL_DEGREES)
+
+    if (lat_max - lat_min + 1) * (lon_max - lon_min + 1) > MAX_GRID_CELLS:
+        return None
+
+    return [
+        (lat_cell, lon_cell)
+        for lat_cell in range(lat_min, lat_max + 1)
+        for lon_cell in range(lon_min, lon_max + 1)
+    ]
+
+
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the distance in meters between two points on a sphere."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    hav = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(min(1, math.sqrt(hav)))
+
+
+class ZoneIndex:
+    """States of the zones and a grid of the active ones.
+
+    An active zone is added to the cells its circle overlaps. Zones that
+    cover too many cells or have invalid attributes are checked on every
+    lookup.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self.states: Dict[str, State] = {}
+        self._cells: Dict[str, Optional[List[GridCell]]] = {}
+        self._grid: Dict[GridCell, Set[str]] = defaultdict(set)
+        self.unindexed: Set[str] = set()
+
+    @callback
+    def async_update(self, entity_id: str, state: Optional[State]) -> None:
+        """Update the index with the new state of a zone."""
+        self._async_remove(entity_id)
+
+        if state is None:
+            return
+
+        self.states[entity_id] = state
+        if state.state == STATE_UNAVAILABLE or state.attributes.get(ATTR_PASSIVE):
+            return
+
+        try:
+            cells = _grid_cells(
+                float(state.attributes[ATTR_LATITUDE]),
+                float(state.attributes[ATTR_LONGITUDE]),
+                float(state.attributes[ATTR_RADIUS]),
+            )
+        except (KeyError, TypeError, ValueError):
+            cells = None
+
+        self._cells[entity_id] = cells
+        if cells is None:
+            self.unindexed.add(entity_id)
+            return
+        for cell in cells:
+            self._grid[cell].add(entity_id)
+
+    @callback
+    def _async_remove(self, entity_id: str) -> None:
+        """Remove a zone from the index."""
+        self.states.pop(entity_id, None)
+        if entity_id not in self._cells:
+            return
+
+        cells = self._cells.pop(entity_id)
+        if cells is None:
+            self.unindexed.discard(entity_id)
+            return
+        for cell in cells:
+            zones = self._grid[cell]
+            zones.discard(entity_id)
+            if not zones:
+                del self._grid[cell]
+
+    @callback
+    def async_candidates(
+        self, latitude: float, longitude: float, radius: float
+    ) -> Set[str]:
+        """Return the zones a location with an accuracy radius could be in."""
+        cells = _grid_cells(latitude, longitude, radius)
+        if cells is None:
+            return set(self._cells)
+
+        candidates = set(self.unindexed)
+        for cell in cells:
+            candidates.update(self._grid.get(cell, ()))
+        return candidates
+
+    @callback
+    def async_refresh(self, states: List[State]) -> None:
+        """Update the index with the states of all zones."""
+        removed = set(self.states)
+        for state in states:
+            removed.discard(state.entity_id)
+            if state is not self.states.get(state.entity_id):
+                self.async_update(state.entity_id, state)
+        for entity_id in removed:
+            self.async_update(entity_id, None)
+
+
+@callback
+def _async_get_zone_index(hass: HomeAssistant) -> ZoneIndex:
+    """Return the zone index, kept up to date with the zone states."""
+    index: Optional[ZoneIndex] = hass.data.get(DATA_ZONE_INDEX)
+    if index is not None:
+        return index
+
+    index = hass.data[DATA_ZONE_INDEX] = ZoneIndex()
+    index.async_refresh(hass.states.async_all(DOMAIN))
+
+    zone_prefix = f"{DOMAIN}."
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        """Update the index when a zone changes."""
+        entity_id = event.data["entity_id"]
+        if entity_id.startswith(zone_prefix):
+            cast(ZoneIndex, index).async_update(entity_id, event.data.get("new_state"))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+    return index
+
 
 @bind_hass
 def async_active_zone(
-    hass: HomeAssistant, latitude: float, longitude: float, radius: int = 0
+    hass: HomeAssistant,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    radius: int = 0,
 ) -> Optional[State]:
     """Find the active zone for given latitude, longitude.
 
     This method must be run in the event loop.
     """
-    # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (
-        cast(State, hass.states.get(entity_id))
-        for entity_id in sorted(hass.states.async_entity_ids(DOMAIN))
-    )
+    if latitude is None or longitude is None:
+        return None
+
+    index = _async_get_zone_index(hass)
+    if len(index.states) != hass.states.async_entity_ids_count(DOMAIN):
+        # Zones were added or removed and the index has not seen it yet
+        index.async_refresh(hass.states.async_all(DOMAIN))
 
     min_dist = None
     closest = None
 
-    for zone in zones:
+    # Sort entity IDs so that we are deterministic if equal distance to 2 zones
+    for entity_id in sorted(index.async_candidates(latitude, longitude, radius)):
+        zone = hass.states.get(entity_id)
+        if zone is None:
+            continue
+        if zone is not index.states.get(entity_id):
+            # Changed since the index was updated
+            index.async_update(entity_id, zone)
+
         if zone.state == STATE_UNAVAILABLE or zone.attributes.get(ATTR_PASSIVE):
             continue
 
+        if entity_id not in index.unindexed and (
+            _haversine(
+                latitude,
+                longitude,
+                zone.attributes[ATTR_LATITUDE],
+                zone.attributes[ATTR_LONGITUDE],
+            )
+            * (1 - HAVERSINE_TOLERANCE)
+            - radius
+            >= zone.attributes[ATTR_RADIUS]
+        ):
+            continue
+
         zone_dist = distance(
             latitude,
             longitude,
@@ -57,7 +57,7 @@ from homeassistant.requirements import (
 )
 from homeassistant.util.package import is_docker_env
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
-from homeassistant.util.yaml import SECRET_YAML, load_yaml
+from homeassistant.util.yaml import SECRET_YAML, load_yaml, load_yaml_cached
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,6 +65,7 @@ DATA_PERSISTENT_ERRORS = "bootstrap_persistent_errors"
 RE_YAML_ERROR = re.compile(r"homeassistant\.util\.yaml")
 RE_ASCII = re.compile(r"\033\[[^m]*m")
 YAML_CONFIG_FILE = "configuration.yaml"
+YAML_CACHE_FILE = os.path.join(".storage", "core.yaml_cache")
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
@@ -310,21 +311,32 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
     """
     # Not using async_add_executor_job because this is an internal method.
     config = await hass.loop.run_in_executor(
-        None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE)
+        None,
+        load_yaml_config_file,
+        hass.config.path(YAML_CONFIG_FILE),
+        hass.config.path(YAML_CACHE_FILE),
     )
     core_config = config.get(CONF_CORE, {})
     await merge_packages_config(hass, config, core_config.get(CONF_PACKAGES, {}))
     return config
 
 
-def load_yaml_config_file(config_path: str) -> Dict[Any, Any]:
+def load_yaml_config_file(
+    config_path: str, cache_file: Optional[str] = None
+) -> Dict[Any, Any]:
     """Parse a YAML configuration file.
 
+    When a cache file is passed, the parsed configuration is stored in it
+    and parsing is skipped while the configuration files are unchanged.
+
     Raises FileNotFoundError or HomeAssistantError.
 
     This method needs to run in an executor.
     """
-    conf_dict = load_yaml(config_path)
+    if cache_file is None:
+        conf_dict = load_yaml(config_path)
+    else:
+        conf_dict = load_yaml_cached(config_path, cache_file)
 
     if not isinstance(conf_dict, dict):
         msg = (
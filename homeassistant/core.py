@@ -69,9 +69,11 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.thread import fix_threading_exception_logging
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
@@ -602,6 +604,16 @@ class EventBus:
         """
         return {key: len(self._listeners[key]) for key in self._listeners}
 
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners for an event type.
+
+        Listeners for all events are not taken into account.
+
+        This method must be run in the event loop.
+        """
+        return bool(self._listeners.get(event_type))
+
     @property
     def listeners(self) -> Dict[str, int]:
         """Return dictionary with events and the number of listeners."""
@@ -771,6 +783,8 @@ class State:
         "context",
         "domain",
         "object_id",
+        "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -805,6 +819,8 @@ class State:
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
+        self._as_dict: Optional[ReadOnlyDict] = None
+        self._as_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -820,15 +836,34 @@ class State:
 
         To be used for JSON serialization.
         Ensures: state == State.from_dict(state.as_dict())
+
+        States are immutable once created, so the dict is built once
+        and shared by all callers. It can not be modified.
         """
-        return {
-            "entity_id": self.entity_id,
-            "state": self.state,
-            "attributes": dict(self.attributes),
-            "last_changed": self.last_changed,
-            "last_updated": self.last_updated,
-            "context": self.context.as_dict(),
-        }
+        if self._as_dict is None:
+            self._as_dict = ReadOnlyDict(
+                {
+                    "entity_id": self.entity_id,
+                    "state": self.state,
+                    "attributes": ReadOnlyDict(self.attributes),
+                    "last_changed": self.last_changed,
+                    "last_updated": self.last_updated,
+                    "context": ReadOnlyDict(self.context.as_dict()),
+                }
+            )
+        return self._as_dict
+
+    def as_json(self) -> str:
+        """Return the State encoded as a JSON string.
+
+        Async friendly.
+
+        The encoded string is cached so it can be embedded in
+        responses without serializing the same state again.
+        """
+        if self._as_json is None:
+            self._as_json = json_dumps(self.as_dict())
+        return self._as_json
 
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
@@ -1643,7 +1678,12 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now}, context=timer_context)
+        # Listeners for all events do not need the time, only fire the
+        # event if something explicitly listens for it
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED, {ATTR_NOW: now}, context=timer_context
+            )
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
@@ -3,6 +3,7 @@ import asyncio
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
+from time import monotonic
 from types import ModuleType
 from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
 
@@ -16,7 +17,7 @@ from homeassistant.core import (
     valid_entity_id,
 )
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
-from homeassistant.helpers import config_validation as cv, service
+from homeassistant.helpers import config_validation as cv, service, startup_trace
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
 
@@ -177,6 +178,7 @@ class EntityPlatform:
         full_name = f"{self.domain}.{self.platform_name}"
 
         logger.info("Setting up %s", full_name)
+        start = monotonic()
         warn_task = hass.loop.call_later(
             SLOW_SETUP_WARNING,
             logger.warning,
@@ -237,6 +239,7 @@ class EntityPlatform:
             return False
         finally:
             warn_task.cancel()
+            startup_trace.async_trace_platform(hass, full_name, start)
 
     def _schedule_add_entities(
         self, new_entities: Iterable["Entity"], update_before_add: bool = False
@@ -3,6 +3,7 @@ import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+from heapq import heapify, heappop, heappush
 import logging
 import time
 from typing import (
@@ -61,6 +62,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TIMER_WHEEL = "track_timer_wheel"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -68,6 +71,97 @@ _ENTITIES_LISTENER = "entities"
 _LOGGER = logging.getLogger(__name__)
 
 
+class _IndexedCallbacks:
+    """Callbacks registered for one key of an indexed listener table.
+
+    Callbacks are stored by a token per registration, so removing one is
+    O(1) and an action may be registered more than once. Dispatching
+    iterates a snapshot that is only rebuilt after the callbacks changed,
+    callbacks removed while dispatching are skipped.
+    """
+
+    __slots__ = ("_callbacks", "_snapshot", "events", "calls")
+
+    def __init__(self) -> None:
+        """Initialize the callbacks."""
+        self._callbacks: Dict[object, Callable] = {}
+        self._snapshot: Optional[Tuple[Tuple[object, Callable], ...]] = None
+        self.events = 0
+        self.calls = 0
+
+    def __len__(self) -> int:
+        """Return the number of registered callbacks."""
+        return len(self._callbacks)
+
+    @callback
+    def async_dispatch(
+        self, hass: HomeAssistant, event: Event, message: str, *args: Any
+    ) -> None:
+        """Run the registered callbacks for an event."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self._callbacks.items())
+
+        callbacks = self._callbacks
+        self.events += 1
+
+        for token, action in snapshot:
+            if token not in callbacks:
+                continue
+            self.calls += 1
+            try:
+                hass.async_run_job(action, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(message, *args)
+
+    def add(self, action: Callable) -> object:
+        """Register a callback and return the token to remove it."""
+        token = object()
+        self._callbacks[token] = action
+        self._snapshot = None
+        return token
+
+    def remove(self, token: object) -> None:
+        """Remove a callback by its token."""
+        del self._callbacks[token]
+        self._snapshot = None
+
+
+@callback
+def _async_add_indexed_listener(
+    callbacks: Dict[str, _IndexedCallbacks],
+    storage_keys: Iterable[str],
+    action: Callable[[Event], Any],
+) -> List[Tuple[str, object]]:
+    """Add a listener to an indexed listener table."""
+    tokens = []
+    for storage_key in storage_keys:
+        indexed = callbacks.get(storage_key)
+        if indexed is None:
+            indexed = callbacks[storage_key] = _IndexedCallbacks()
+        tokens.append((storage_key, indexed.add(action)))
+    return tokens
+
+
+@callback
+def async_state_change_dispatch_stats(hass: HomeAssistant) -> Dict[str, Dict[str, int]]:
+    """Return the state change dispatch metrics per tracked entity.
+
+    For each entity tracked with async_track_state_change_event this returns
+    the number of listeners, state changes dispatched and listener calls.
+    """
+    return {
+        entity_id: {
+            "listeners": len(indexed),
+            "events": indexed.events,
+            "calls": indexed.calls,
+        }
+        for entity_id, indexed in hass.data.get(
+            TRACK_STATE_CHANGE_CALLBACKS, {}
+        ).items()
+    }
+
+
 @dataclass
 class TrackStates:
     """Class for keeping track of states being tracked.
@@ -242,17 +336,17 @@ def async_track_state_change_event(
         def _async_state_change_dispatcher(event: Event) -> None:
             """Dispatch state changes by entity_id."""
             entity_id = event.data.get("entity_id")
+            indexed = entity_callbacks.get(entity_id)
 
-            if entity_id not in entity_callbacks:
+            if indexed is None:
                 return
 
-            for action in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_job(action, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state changed for %s", entity_id
-                    )
+            indexed.async_dispatch(
+                hass,
+                event,
+                "Error while processing state changed for %s",
+                entity_id,
+            )
 
         hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
             EVENT_STATE_CHANGED, _async_state_change_dispatcher
@@ -260,8 +354,7 @@ def async_track_state_change_event(
 
     entity_ids = _async_string_to_lower_list(entity_ids)
 
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(action)
+    tokens = _async_add_indexed_listener(entity_callbacks, entity_ids, action)
 
     @callback
     def remove_listener() -> None:
@@ -270,8 +363,7 @@ def async_track_state_change_event(
             hass,
             TRACK_STATE_CHANGE_CALLBACKS,
             TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            action,
+            tokens,
         )
 
     return remove_listener
@@ -282,16 +374,15 @@ def _async_remove_indexed_listeners(
     hass: HomeAssistant,
     data_key: str,
     listener_key: str,
-    storage_keys: Iterable[str],
-    action: Callable[[Event], Any],
+    tokens: Iterable[Tuple[str, object]],
 ) -> None:
     """Remove a listener."""
 
     callbacks = hass.data[data_key]
 
-    for storage_key in storage_keys:
-        callbacks[storage_key].remove(action)
-        if len(callbacks[storage_key]) == 0:
+    for storage_key, token in tokens:
+        callbacks[storage_key].remove(token)
+        if not callbacks[storage_key]:
             del callbacks[storage_key]
 
     if not callbacks:
@@ -318,18 +409,17 @@ def async_track_entity_registry_updated_event(
         def _async_entity_registry_updated_dispatcher(event: Event) -> None:
             """Dispatch entity registry updates by entity_id."""
             entity_id = event.data.get("old_entity_id", event.data["entity_id"])
+            indexed = entity_callbacks.get(entity_id)
 
-            if entity_id not in entity_callbacks:
+            if indexed is None:
                 return
 
-            for action in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_job(action, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing entity registry update for %s",
-                        entity_id,
-                    )
+            indexed.async_dispatch(
+                hass,
+                event,
+                "Error while processing entity registry update for %s",
+                entity_id,
+            )
 
         hass.data[TRACK_ENTITY_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
             EVENT_ENTITY_REGISTRY_UPDATED, _async_entity_registry_updated_dispatcher
@@ -337,8 +427,7 @@ def async_track_entity_registry_updated_event(
 
     entity_ids = _async_string_to_lower_list(entity_ids)
 
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(action)
+    tokens = _async_add_indexed_listener(entity_callbacks, entity_ids, action)
 
     @callback
     def remove_listener() -> None:
@@ -347,8 +436,7 @@ def async_track_entity_registry_updated_event(
             hass,
             TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS,
             TRACK_ENTITY_REGISTRY_UPDATED_LISTENER,
-            entity_ids,
-            action,
+            tokens,
         )
 
     return remove_listener
@@ -356,21 +444,19 @@ def async_track_entity_registry_updated_event(
 
 @callback
 def _async_dispatch_domain_event(
-    hass: HomeAssistant, event: Event, callbacks: Dict[str, List]
+    hass: HomeAssistant, event: Event, callbacks: Dict[str, _IndexedCallbacks]
 ) -> None:
     domain = split_entity_id(event.data["entity_id"])[0]
 
-    if domain not in callbacks and MATCH_ALL not in callbacks:
-        return
-
-    listeners = callbacks.get(domain, []) + callbacks.get(MATCH_ALL, [])
-
-    for action in listeners:
-        try:
-            hass.async_run_job(action, event)
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception(
-                "Error while processing event %s for domain %s", event, domain
+    for key in (domain, MATCH_ALL):
+        indexed = callbacks.get(key)
+        if indexed is not None:
+            indexed.async_dispatch(
+                hass,
+                event,
+                "Error while processing event %s for domain %s",
+                event,
+                domain,
             )
 
 
@@ -400,8 +486,7 @@ def async_track_state_added_domain(
 
     domains = _async_string_to_lower_list(domains)
 
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(action)
+    tokens = _async_add_indexed_listener(domain_callbacks, domains, action)
 
     @callback
     def remove_listener() -> None:
@@ -410,8 +495,7 @@ def async_track_state_added_domain(
             hass,
             TRACK_STATE_ADDED_DOMAIN_CALLBACKS,
             TRACK_STATE_ADDED_DOMAIN_LISTENER,
-            domains,
-            action,
+            tokens,
         )
 
     return remove_listener
@@ -443,8 +527,7 @@ def async_track_state_removed_domain(
 
     domains = _async_string_to_lower_list(domains)
 
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(action)
+    tokens = _async_add_indexed_listener(domain_callbacks, domains, action)
 
     @callback
     def remove_listener() -> None:
@@ -453,8 +536,7 @@ def async_track_state_removed_domain(
             hass,
             TRACK_STATE_REMOVED_DOMAIN_CALLBACKS,
             TRACK_STATE_REMOVED_DOMAIN_LISTENER,
-            domains,
-            action,
+            tokens,
         )
 
     return remove_listener
@@ -991,6 +1073,157 @@ def async_track_same_state(
 track_same_state = threaded_listener_factory(async_track_same_state)
 
 
+class _TimerWheel:
+    """Run the time tracking timers from a single loop timer.
+
+    Timers are grouped in buckets per second of their due time and a heap
+    holds the seconds that have timers, so adding or cancelling a timer does
+    not touch the heap unless it is the first timer of its second. The loop
+    timer is only scheduled for the earliest due timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self._buckets: Dict[int, Dict[object, Tuple[float, Callable, Tuple]]] = {}
+        self._seconds: List[int] = []
+        self._due: Dict[object, Tuple[float, Callable, Tuple]] = {}
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._wake_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Return the number of scheduled timers."""
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    @callback
+    def async_add(self, when: float, job: Callable, *args: Any) -> CALLBACK_TYPE:
+        """Run a job with args at a UTC timestamp."""
+        second = int(when // 1)
+        bucket = self._buckets.get(second)
+        if bucket is None:
+            bucket = self._buckets[second] = {}
+            heappush(self._seconds, second)
+
+        token = object()
+        bucket[token] = (when, job, args)
+
+        if self._wake_at is None or when < self._wake_at:
+            self._async_schedule(when)
+
+        @callback
+        def cancel_timer() -> None:
+            """Cancel the timer."""
+            bucket = self._buckets.get(second)
+            if bucket is None or bucket.pop(token, None) is None:
+                # The timer may be due in the batch that is being run
+                self._due.pop(token, None)
+                return
+            if bucket:
+                return
+
+            del self._buckets[second]
+            self._async_compact()
+            if not self._buckets and self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+                self._wake_at = None
+
+        return cancel_timer
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop the seconds of cancelled buckets from the heap.
+
+        The heap is rebuilt in place once most of its seconds have no bucket
+        anymore, so timers cancelled long before they are due do not pile up.
+        """
+        seconds = self._seconds
+        if len(seconds) > 2 * len(self._buckets):
+            seconds[:] = self._buckets
+            heapify(seconds)
+
+    @callback
+    def _async_schedule(self, when: float) -> None:
+        """Schedule the loop timer to wake at a UTC timestamp."""
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._wake_at = when
+        self._handle = self.hass.loop.call_at(
+            self.hass.loop.time() + when - time.time(), self._async_run
+        )
+
+    @callback
+    def _async_run(self) -> None:
+        """Run the timers that are due."""
+        # The loop timer is monotonic, timers it was scheduled for are due
+        # even if the clock was rolled back since.
+        now = max(pattern_utc_now().timestamp(), self._wake_at or 0)
+        self._handle = None
+        self._wake_at = None
+        buckets = self._buckets
+        seconds = self._seconds
+        due = self._due
+
+        while seconds:
+            second = seconds[0]
+            bucket = buckets.get(second)
+            if bucket is None:
+                heappop(seconds)
+                continue
+            if second > now:
+                break
+
+            for token, timer in list(bucket.items()):
+                if timer[0] <= now:
+                    due[token] = timer
+                    del bucket[token]
+
+            if bucket:
+                break
+
+            del buckets[second]
+            heappop(seconds)
+
+        # Timers cancelled by a job that runs earlier in the batch are
+        # removed from the due timers and skipped.
+        for token in sorted(due, key=lambda token: due[token][0]):
+            if token not in due:
+                continue
+            _, job, args = due.pop(token)
+            try:
+                self.hass.async_run_job(job, *args)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer %s", job)
+
+        self._async_schedule_next()
+
+    @callback
+    def _async_schedule_next(self) -> None:
+        """Schedule the loop timer for the earliest timer that is left."""
+        buckets = self._buckets
+        seconds = self._seconds
+
+        while seconds and seconds[0] not in buckets:
+            heappop(seconds)
+
+        if not seconds:
+            return
+
+        when = min(timer[0] for timer in buckets[seconds[0]].values())
+        if self._wake_at is None or when < self._wake_at:
+            self._async_schedule(when)
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel of time tracking helpers."""
+    wheel = hass.data.get(TRACK_TIMER_WHEEL)
+    if wheel is None:
+        wheel = hass.data[TRACK_TIMER_WHEEL] = _TimerWheel(hass)
+    return wheel
+
+
 @callback
 @bind_hass
 def async_track_point_in_time(
@@ -1018,20 +1251,10 @@ def async_track_point_in_utc_time(
     # Ensure point_in_time is UTC
     utc_point_in_time = dt_util.as_utc(point_in_time)
 
-    cancel_callback = hass.loop.call_at(
-        hass.loop.time() + point_in_time.timestamp() - time.time(),
-        hass.async_run_job,
-        action,
-        utc_point_in_time,
+    return _async_get_timer_wheel(hass).async_add(
+        point_in_time.timestamp(), action, utc_point_in_time
     )
 
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
-
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
 
@@ -1213,8 +1436,9 @@ def async_track_utc_time_change(
 
     # Make sure rolling back the clock doesn't prevent the timer from
     # triggering.
-    cancel_callback: Optional[asyncio.TimerHandle] = None
+    cancel_callback: Optional[CALLBACK_TYPE] = None
     calculate_next(next_time)
+    timer_wheel = _async_get_timer_wheel(hass)
 
     @callback
     def pattern_time_change_listener() -> None:
@@ -1226,40 +1450,26 @@ def async_track_utc_time_change(
 
         calculate_next(now + timedelta(seconds=1))
 
-        cancel_callback = hass.loop.call_at(
-            -time.time()
-            + hass.loop.time()
-            + next_time.timestamp()
-            + MAX_TIME_TRACKING_ERROR,
+        cancel_callback = timer_wheel.async_add(
+            next_time.timestamp() + MAX_TIME_TRACKING_ERROR,
             pattern_time_change_listener,
         )
 
-    # We always get time.time() first to avoid time.time()
-    # ticking forward after fetching hass.loop.time()
-    # and callback being scheduled a few microseconds early.
-    #
-    # Since we loose additional time calling `hass.loop.time()`
-    # we add MAX_TIME_TRACKING_ERROR to ensure
-    # we always schedule the call within the time window between
-    # second and the next second.
+    # We add MAX_TIME_TRACKING_ERROR to ensure we always schedule the
+    # call within the time window between second and the next second.
     #
     # For example:
-    # If the clock ticks forward 30 microseconds when fectching
-    # `hass.loop.time()` and we want the event to fire at exactly
-    # 03:00:00.000000, the event would actually fire around
-    # 02:59:59.999970. To ensure we always fire sometime between
-    # 03:00:00.000000 and 03:00:00.999999 we add
-    # MAX_TIME_TRACKING_ERROR to make up for the time
-    # lost fetching the time. This ensures we do not fire the
-    # event before the next time pattern match which would result
-    # in the event being fired again since we would otherwise
+    # If the clock ticks forward 30 microseconds when scheduling the loop
+    # timer and we want the event to fire at exactly 03:00:00.000000, the
+    # event would actually fire around 02:59:59.999970. To ensure we always
+    # fire sometime between 03:00:00.000000 and 03:00:00.999999 we add
+    # MAX_TIME_TRACKING_ERROR to make up for the time lost. This ensures we
+    # do not fire the event before the next time pattern match which would
+    # result in the event being fired again since we would otherwise
     # potentially fire early.
     #
-    cancel_callback = hass.loop.call_at(
-        -time.time()
-        + hass.loop.time()
-        + next_time.timestamp()
-        + MAX_TIME_TRACKING_ERROR,
+    cancel_callback = timer_wheel.async_add(
+        next_time.timestamp() + MAX_TIME_TRACKING_ERROR,
         pattern_time_change_listener,
     )
 
@@ -1268,7 +1478,7 @@ def async_track_utc_time_change(
         """Cancel the call_later."""
         nonlocal cancel_callback
         assert cancel_callback is not None
-        cancel_callback.cancel()
+        cancel_callback()
 
     return unsub_pattern_time_change_listener
 
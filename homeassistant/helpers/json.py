@@ -1,25 +1,133 @@
-"""Helpers to help with encoding Home Assistant objects in JSON."""
+"""Helpers to help with encoding Home Assistant objects in JSON.
+
+All JSON produced by Home Assistant should go through json_dumps or
+json_bytes. They use orjson when it is installed and fall back to the
+standard library encoder otherwise.
+"""
 from datetime import datetime
+import importlib
 import json
 import logging
-from typing import Any
+import math
+from types import ModuleType
+from typing import Any, Optional, Type
+
+orjson: Optional[ModuleType]
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
 
+# Types that never hold a float
+_FINITE_TYPES = frozenset((str, int, bool, type(None), datetime))
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Used as the default hook of both JSON backends.
+    Raises TypeError for other objects.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, tuple):
+        # Named tuples are not handled natively by orjson
+        return list(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
 
     def default(self, o: Any) -> Any:
-        """Convert Home Assistant objects.
-
-        Hand other objects to the original method.
-        """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        """Convert Home Assistant objects."""
+        return json_encoder_default(o)
+
+
+def json_backend() -> str:
+    """Return the name of the JSON backend in use."""
+    return "json" if orjson is None else "orjson"
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return if data holds NaN or infinity."""
+    obj_type = type(obj)
+    if obj_type in _FINITE_TYPES:
+        return False
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, (list, tuple, set)):
+        return any(map(_has_non_finite, obj))
+    if hasattr(obj, "as_dict"):
+        return _has_non_finite(obj.as_dict())
+    return False
+
+
+def _orjson_dumps(data: Any, indent: Optional[int], sort_keys: bool) -> Optional[bytes]:
+    """Serialize data with orjson if it handles it like the standard library.
+
+    orjson always indents with two spaces and encodes NaN and infinity as
+    null. Returns None when the standard library has to be used instead.
+    """
+    if orjson is None or indent not in (None, 2):
+        return None
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+
+    try:
+        dumped: bytes = orjson.dumps(data, default=json_encoder_default, option=option)
+    except TypeError:
+        return None
+
+    # Only look for non-finite floats when they could have been encoded
+    if b"null" in dumped and _has_non_finite(data):
+        return None
+
+    return dumped
+
+
+def json_dumps(
+    data: Any,
+    *,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    allow_nan: bool = False,
+    encoder: Type[json.JSONEncoder] = JSONEncoder,
+) -> str:
+    """Serialize data to a JSON string.
+
+    The orjson backend is only used for the Home Assistant encoder, when
+    it accepts and formats the data like the standard library encoder.
+    Anything else, including data orjson can not encode, is handed to the
+    standard library so errors are reported the same way by both backends.
+    """
+    if encoder is JSONEncoder:
+        dumped = _orjson_dumps(data, indent, sort_keys)
+        if dumped is not None:
+            return dumped.decode("utf-8")
+
+    return json.dumps(
+        data, cls=encoder, indent=indent, sort_keys=sort_keys, allow_nan=allow_nan
+    )
+
+
+def json_bytes(data: Any) -> bytes:
+    """Serialize data to UTF-8 encoded JSON."""
+    dumped = _orjson_dumps(data, None, False)
+    if dumped is not None:
+        return dumped
+
+    return json.dumps(data, cls=JSONEncoder, allow_nan=False).encode("utf-8")
@@ -0,0 +1,250 @@
+"""Trace where the time goes while setting up integrations at startup."""
+import asyncio
+from contextlib import contextmanager
+from time import monotonic
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+DATA_STARTUP_TRACE = "startup_trace"
+
+PHASE_DEPENDENCIES = "dependencies"
+PHASE_REQUIREMENTS = "requirements"
+PHASE_IMPORT = "import"
+PHASE_CONFIG = "config"
+PHASE_SETUP = "setup"
+PHASE_CONFIG_ENTRIES = "config_entries"
+
+STAGE_WRAP_UP = "wrap_up"
+
+
+class IntegrationTrace:
+    """Time spent setting up a single integration."""
+
+    def __init__(self) -> None:
+        """Initialize the integration trace."""
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.dependencies: List[str] = []
+        self.phases: Dict[str, float] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace as a dictionary."""
+        return {
+            "start": _round(self.start),
+            "end": _round(self.end),
+            "dependencies": self.dependencies,
+            "phases": {phase: _round(value) for phase, value in self.phases.items()},
+        }
+
+
+class StartupTrace:
+    """Trace the stages of startup and the integrations set up in them.
+
+    Times are stored as seconds since the trace was started.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.started = dt_util.utcnow()
+        self.finished = False
+        self._start = monotonic()
+        self._end: Optional[float] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.integrations: Dict[str, IntegrationTrace] = {}
+        self.platforms: Dict[str, List[float]] = {}
+
+    def now(self) -> float:
+        """Return the time since the trace was started."""
+        return monotonic() - self._start
+
+    def relative(self, timestamp: float) -> float:
+        """Return a monotonic timestamp relative to the start of the trace."""
+        return timestamp - self._start
+
+    def integration(self, domain: str) -> IntegrationTrace:
+        """Return the trace of an integration."""
+        itg_trace = self.integrations.get(domain)
+        if itg_trace is None:
+            itg_trace = self.integrations[domain] = IntegrationTrace()
+        return itg_trace
+
+    @contextmanager
+    def async_stage(self, name: str, domains: Iterable[str] = ()) -> Iterator[None]:
+        """Record the time spent in a stage of startup."""
+        stage = self.stages[name] = {
+            "start": self.now(),
+            "end": None,
+            "domains": sorted(domains),
+        }
+        try:
+            yield
+        finally:
+            stage["end"] = self.now()
+
+    @callback
+    def async_finish(self) -> None:
+        """Stop tracing."""
+        self.finished = True
+        self._end = self.now()
+
+    def critical_path(self, name: str) -> List[str]:
+        """Return the chain of setups that determined the length of a stage.
+
+        It starts with the setup that finished last in the stage, and adds
+        the dependency it waited for the longest until a setup did not have
+        to wait for anything. Wrap up consists of platform setups.
+        """
+        stage = self.stages.get(name)
+        if stage is None or stage["end"] is None:
+            return []
+
+        if name == STAGE_WRAP_UP:
+            platforms = [
+                full_name
+                for full_name, (_, end) in self.platforms.items()
+                if stage["start"] <= end <= stage["end"]
+            ]
+            if not platforms:
+                return []
+            return [max(platforms, key=lambda full_name: self.platforms[full_name][1])]
+
+        ends: Dict[str, float] = {
+            domain: itg_trace.end
+            for domain, itg_trace in self.integrations.items()
+            if itg_trace.end is not None
+        }
+        finished = [domain for domain in stage["domains"] if domain in ends]
+        if not finished:
+            return []
+
+        domain = max(finished, key=ends.__getitem__)
+        path = [domain]
+        while True:
+            start = self.integrations[domain].start
+            if start is None:
+                break
+            waited_for = [
+                dep
+                for dep in self.integrations[domain].dependencies
+                if dep not in path and dep in ends and ends[dep] > start
+            ]
+            if not waited_for:
+                break
+            domain = max(waited_for, key=ends.__getitem__)
+            path.append(domain)
+
+        path.reverse()
+        return path
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace as a dictionary."""
+        return {
+            "started": self.started.isoformat(),
+            "duration": _round(self._end),
+            "stages": {
+                name: {
+                    "start": _round(stage["start"]),
+                    "end": _round(stage["end"]),
+                    "domains": stage["domains"],
+                    "critical_path": self.critical_path(name),
+                }
+                for name, stage in self.stages.items()
+            },
+            "integrations": {
+                domain: itg_trace.as_dict()
+                for domain, itg_trace in self.integrations.items()
+            },
+            "platforms": {
+                full_name: {"start": _round(start), "end": _round(end)}
+                for full_name, (start, end) in self.platforms.items()
+            },
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """Round a time for the trace output."""
+    return None if value is None else round(value, 3)
+
+
+@callback
+def async_start_trace(hass: HomeAssistant) -> StartupTrace:
+    """Start a new startup trace."""
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    return trace
+
+
+@callback
+def async_get_trace(hass: HomeAssistant) -> Optional[StartupTrace]:
+    """Return the startup trace."""
+    return hass.data.get(DATA_STARTUP_TRACE)
+
+
+@callback
+def _async_get_active_trace(hass: HomeAssistant) -> Optional[StartupTrace]:
+    """Return the startup trace if it is still recording."""
+    trace: Optional[StartupTrace] = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None or trace.finished:
+        return None
+    return trace
+
+
+@callback
+def async_trace_setup(hass: HomeAssistant, domain: str, task: asyncio.Future) -> None:
+    """Record when the setup task of an integration starts and finishes."""
+    trace = _async_get_active_trace(hass)
+    if trace is None:
+        return
+
+    now = trace.now
+    itg_trace = trace.integration(domain)
+    itg_trace.start = now()
+
+    @callback
+    def async_setup_done(_: asyncio.Future) -> None:
+        """Record the end of the setup."""
+        itg_trace.end = now()
+
+    task.add_done_callback(async_setup_done)
+
+
+@callback
+def async_trace_dependencies(
+    hass: HomeAssistant, domain: str, dependencies: Iterable[str]
+) -> None:
+    """Record the integrations an integration waits for."""
+    trace = _async_get_active_trace(hass)
+    if trace is not None:
+        trace.integration(domain).dependencies.extend(dependencies)
+
+
+@callback
+def async_add_phase_time(
+    hass: HomeAssistant, domain: str, phase: str, seconds: float
+) -> None:
+    """Add time spent in a phase of setting up an integration."""
+    trace = _async_get_active_trace(hass)
+    if trace is None:
+        return
+
+    phases = trace.integration(domain).phases
+    phases[phase] = phases.get(phase, 0) + seconds
+
+
+@contextmanager
+def async_trace_phase(hass: HomeAssistant, domain: str, phase: str) -> Iterator[None]:
+    """Record the time spent in a phase of setting up an integration."""
+    start = monotonic()
+    try:
+        yield
+    finally:
+        async_add_phase_time(hass, domain, phase, monotonic() - start)
+
+
+@callback
+def async_trace_platform(hass: HomeAssistant, full_name: str, start: float) -> None:
+    """Record the setup of a platform that started at a monotonic time."""
+    trace = _async_get_active_trace(hass)
+    if trace is not None:
+        trace.platforms[full_name] = [trace.relative(start), trace.now()]
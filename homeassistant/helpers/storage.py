@@ -1,9 +1,10 @@
 """Helper to help store data."""
 import asyncio
+from contextlib import AsyncExitStack
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
@@ -15,9 +16,90 @@ from homeassistant.util import json as json_util
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+DATA_STORAGE_STATS = "storage_stats"
+DATA_STORAGE_WRITER = "storage_writer"
 _LOGGER = logging.getLogger(__name__)
 
 
+@callback
+def async_get_write_stats(hass: HomeAssistant) -> Dict[str, Dict[str, int]]:
+    """Return the number of writes and bytes written per storage key."""
+    return {
+        key: dict(stats) for key, stats in hass.data.get(DATA_STORAGE_STATS, {}).items()
+    }
+
+
+class _StoreWriter:
+    """Coalesce pending writes of all stores into batched executor jobs.
+
+    Delayed and final writes that become due while a batch is being
+    written, or in the same event loop iteration, are written together
+    in a single executor job instead of one job per store.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self._pending: Dict["Store", None] = {}
+        self._batch: Optional[asyncio.Future] = None
+        self._batch_lock = asyncio.Lock()
+
+    async def async_write(self, store: "Store") -> None:
+        """Write the pending data of a store in the next batch."""
+        self._pending[store] = None
+
+        if self._batch is None:
+            self._batch = self.hass.async_create_task(self._async_write_batch())
+
+        await asyncio.shield(self._batch)
+
+    async def _async_write_batch(self) -> None:
+        """Write all pending stores in one executor job."""
+        async with self._batch_lock:
+            # Give other writes that became due at the same time a chance to join
+            await asyncio.sleep(0)
+            stores = sorted(self._pending, key=id)
+            self._pending = {}
+            self._batch = None
+
+            # pylint: disable=protected-access
+            async with AsyncExitStack() as stack:
+                for store in stores:
+                    await stack.enter_async_context(store._write_lock)
+
+                writes = []
+                for store in stores:
+                    try:
+                        data = store._async_pop_data()
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error generating data for %s", store.key)
+                        continue
+                    if data is not None:
+                        writes.append((store, data))
+
+                if not writes:
+                    return
+
+                written = await self.hass.async_add_executor_job(_write_stores, writes)
+                for store, size in written:
+                    store._async_record_write(size)
+
+
+def _write_stores(
+    writes: List[Tuple["Store", Dict]]
+) -> List[Tuple["Store", Optional[int]]]:
+    """Write the data of multiple stores and return the bytes written."""
+    written = []
+    for store, data in writes:
+        try:
+            size = store._write_data_safe(data)  # pylint: disable=protected-access
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error writing config for %s", store.key)
+            size = None
+        written.append((store, size))
+    return written
+
+
 @bind_hass
 async def async_migrator(
     hass,
@@ -72,8 +154,13 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        Compact stores are written without indentation. This is meant for
+        large stores that are rewritten often and not read by humans.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -84,6 +171,7 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
 
     @property
     def path(self):
@@ -194,43 +282,84 @@ class Store:
             return
         self._unsub_delay_listener = None
         self._async_cleanup_final_write_listener()
-        await self._async_handle_write_data()
+        await self._async_get_writer().async_write(self)
 
     async def _async_callback_final_write(self, _event):
         """Handle a write because Home Assistant is in final write state."""
         self._unsub_final_write_listener = None
         self._async_cleanup_delay_listener()
-        await self._async_handle_write_data()
+        await self._async_get_writer().async_write(self)
+
+    @callback
+    def _async_get_writer(self) -> _StoreWriter:
+        """Return the writer that batches writes of all stores."""
+        writer = self.hass.data.get(DATA_STORAGE_WRITER)
+        if writer is None:
+            writer = self.hass.data[DATA_STORAGE_WRITER] = _StoreWriter(self.hass)
+        return writer
+
+    @callback
+    def _async_pop_data(self) -> Optional[Dict]:
+        """Take the pending data to write, generating it if needed.
+
+        The data function runs in the event loop because it reads state that
+        is only safe to access from the loop, like the entity registry. The
+        data it returns is the snapshot that is encoded in the executor.
+        """
+        if self._data is None:
+            # Another write already consumed the data
+            return None
+
+        data = self._data
+
+        if "data_func" in data:
+            data["data"] = data.pop("data_func")()
+
+        self._data = None
+        return data
 
     async def _async_handle_write_data(self, *_args):
         """Handle writing the config."""
 
         async with self._write_lock:
-            if self._data is None:
-                # Another write already consumed the data
+            data = self._async_pop_data()
+
+            if data is None:
                 return
 
-            data = self._data
+            size = await self.hass.async_add_executor_job(self._write_data_safe, data)
+            self._async_record_write(size)
 
-            if "data_func" in data:
-                data["data"] = data.pop("data_func")()
+    @callback
+    def _async_record_write(self, size: Optional[int]) -> None:
+        """Update the write statistics of the store."""
+        if size is None:
+            return
 
-            self._data = None
+        stats = self.hass.data.setdefault(DATA_STORAGE_STATS, {}).setdefault(
+            self.key, {"writes": 0, "bytes_written": 0}
+        )
+        stats["writes"] += 1
+        stats["bytes_written"] += size
 
-            try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
-                )
-            except (json_util.SerializationError, json_util.WriteError) as err:
-                _LOGGER.error("Error writing config for %s: %s", self.key, err)
+    def _write_data_safe(self, data: Dict) -> Optional[int]:
+        """Write the data, log errors and return the bytes written."""
+        try:
+            return self._write_data(self.path, data)
+        except (json_util.SerializationError, json_util.WriteError) as err:
+            _LOGGER.error("Error writing config for %s: %s", self.key, err)
+            return None
 
-    def _write_data(self, path: str, data: Dict) -> None:
+    def _write_data(self, path: str, data: Dict) -> int:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s", self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.save_json(
+            path, data, self._private, encoder=self._encoder, compact=self._compact
+        )
+        return os.path.getsize(path)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
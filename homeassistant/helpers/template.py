@@ -2,6 +2,7 @@
 import asyncio
 import base64
 import collections.abc
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import wraps
 import json
@@ -10,12 +11,26 @@ import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Generator, Iterable, List, Optional, Union
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
 import jinja2
-from jinja2 import contextfilter, contextfunction
+from jinja2 import contextfilter, contextfunction, nodes
+from jinja2.compiler import CodeGenerator
+from jinja2.exceptions import TemplateRuntimeError
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace  # type: ignore
 import voluptuous as vol
@@ -25,6 +40,7 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STOP,
     LENGTH_METERS,
     MATCH_ALL,
     STATE_UNKNOWN,
@@ -37,7 +53,6 @@ from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
-from homeassistant.util.thread import ThreadWithException
 
 # mypy: allow-untyped-calls, allow-untyped-defs
 # mypy: no-check-untyped-defs, no-warn-return-any
@@ -48,6 +63,13 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
+_BUDGETED_ENVIRONMENT = "template.budgeted_environment"
+_RENDER_POOL = "template.render_pool"
+
+RENDER_POOL_WORKERS = 2
+MAX_RENDER_LOOP_ITERATIONS = 10 ** 6
+# Only look at the clock every this many loop iterations
+_BUDGET_CHECK_INTERVAL = 64
 
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
@@ -74,6 +96,14 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
 
 DEFAULT_RATE_LIMIT = timedelta(seconds=1)
 
+_FAST_PATH_ROOTS = {"value", "value_json"}
+_FAST_PATH_FILTER_MARKERS = (
+    "contextfilter",
+    "evalcontextfilter",
+    "environmentfilter",
+    "jinja_pass_arg",
+)
+
 
 @bind_hass
 def attach(hass: HomeAssistantType, obj: Any) -> None:
@@ -104,6 +134,35 @@ def render_complex(value: Any, variables: TemplateVarsType = None) -> Any:
     return value
 
 
+@callback
+def _async_get_render_pool(hass: HomeAssistantType) -> ThreadPoolExecutor:
+    """Return the worker pool used for budgeted template renders."""
+    pool = hass.data.get(_RENDER_POOL)
+    if pool is not None:
+        return pool
+
+    pool = hass.data[_RENDER_POOL] = ThreadPoolExecutor(
+        max_workers=RENDER_POOL_WORKERS, thread_name_prefix="TemplateRender"
+    )
+
+    @callback
+    def _async_shutdown_pool(event):
+        """Shut down the render pool."""
+        hass.data.pop(_RENDER_POOL).shutdown(wait=False)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown_pool)
+    return pool
+
+
+@callback
+def _async_get_budgeted_env(hass: HomeAssistantType) -> "BudgetedTemplateEnvironment":
+    """Return the environment used for budgeted template renders."""
+    env = hass.data.get(_BUDGETED_ENVIRONMENT)
+    if env is None:
+        env = hass.data[_BUDGETED_ENVIRONMENT] = BudgetedTemplateEnvironment(hass)
+    return cast(BudgetedTemplateEnvironment, env)
+
+
 def is_complex(value: Any) -> bool:
     """Test if data structure is a complex template."""
     if isinstance(value, Template):
@@ -183,6 +242,127 @@ def _false(arg: Any) -> bool:
     return False
 
 
+class _FastPathFallback(Exception):
+    """Raised when the fast path cannot reproduce what Jinja would render."""
+
+
+def _fast_getattr(env: "TemplateEnvironment", attr: str) -> Callable[[Any], Any]:
+    """Return an accessor mirroring the sandboxed Jinja attribute lookup."""
+    shadows_dict_attr = hasattr(dict, attr)
+
+    def _getattr(obj: Any) -> Any:
+        if not shadows_dict_attr and type(obj) is dict and attr in obj:
+            return obj[attr]
+        result = env.getattr(obj, attr)
+        if isinstance(result, jinja2.Undefined):
+            raise _FastPathFallback
+        return result
+
+    return _getattr
+
+
+def _fast_getitem(env: "TemplateEnvironment", key: Any) -> Callable[[Any], Any]:
+    """Return an accessor mirroring the sandboxed Jinja item lookup."""
+
+    def _getitem(obj: Any) -> Any:
+        if type(obj) in (dict, list):
+            try:
+                return obj[key]
+            except (LookupError, TypeError):
+                pass
+        result = env.getitem(obj, key)
+        if isinstance(result, jinja2.Undefined):
+            raise _FastPathFallback
+        return result
+
+    return _getitem
+
+
+def _fast_filter(func: Callable, args: List[Any]) -> Callable[[Any], Any]:
+    """Return a step applying a plain filter with constant arguments."""
+    return lambda obj: func(obj, *args)
+
+
+def _fast_path_steps(
+    env: "TemplateEnvironment", node: nodes.Node
+) -> Tuple[str, List[Callable[[Any], Any]]]:
+    """Translate an expression node into a root name and accessor steps."""
+    if isinstance(node, nodes.Name):
+        if node.ctx != "load" or node.name not in _FAST_PATH_ROOTS:
+            raise _FastPathFallback
+        return node.name, []
+
+    if isinstance(node, nodes.Getattr):
+        root, steps = _fast_path_steps(env, node.node)
+        steps.append(_fast_getattr(env, node.attr))
+        return root, steps
+
+    if isinstance(node, nodes.Getitem):
+        if not isinstance(node.arg, nodes.Const):
+            raise _FastPathFallback
+        root, steps = _fast_path_steps(env, node.node)
+        steps.append(_fast_getitem(env, node.arg.value))
+        return root, steps
+
+    if isinstance(node, nodes.Filter):
+        func = env.filters.get(node.name)
+        if (
+            node.node is None
+            or func is None
+            or node.kwargs
+            or node.dyn_args is not None
+            or node.dyn_kwargs is not None
+            or not all(isinstance(arg, nodes.Const) for arg in node.args)
+            or any(getattr(func, attr, False) for attr in _FAST_PATH_FILTER_MARKERS)
+        ):
+            raise _FastPathFallback
+        root, steps = _fast_path_steps(env, node.node)
+        steps.append(
+            _fast_filter(func, [cast(nodes.Const, arg).value for arg in node.args])
+        )
+        return root, steps
+
+    raise _FastPathFallback
+
+
+def _compile_fast_path(
+    env: "TemplateEnvironment", source: str
+) -> Optional[Tuple[str, Callable[[Any], str]]]:
+    """Compile a trivial value/value_json template into a Python callable.
+
+    Only templates consisting of a single expression made of attribute and
+    constant item lookups on value or value_json, followed by plain filters
+    with constant arguments, are supported. Returns None for anything else.
+    """
+    try:
+        parsed = env.parse(source)
+    except jinja2.TemplateError:
+        return None
+
+    if len(parsed.body) != 1 or not isinstance(parsed.body[0], nodes.Output):
+        return None
+
+    exprs = [
+        node
+        for node in parsed.body[0].nodes
+        if not (isinstance(node, nodes.TemplateData) and not node.data.strip())
+    ]
+    if len(exprs) != 1:
+        return None
+
+    try:
+        root, steps = _fast_path_steps(env, exprs[0])
+    except _FastPathFallback:
+        return None
+
+    def _render(obj: Any) -> str:
+        for step in steps:
+            obj = step(obj)
+        return str(obj).strip()
+
+    return root, _render
+
+
 class RenderInfo:
     """Holds information about a template render."""
 
@@ -271,6 +451,8 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._compiled_budgeted = None
+        self._fast_path = _SENTINEL
         self.hass = hass
         self.is_static = not is_template_string(template)
 
@@ -340,8 +522,12 @@ class Template:
 
         This is intended to check for expensive templates
         that will make the system unstable.  The template
-        is rendered in the executor to ensure it does not
-        tie up the event loop.
+        is rendered in a shared worker pool to ensure it does
+        not tie up the event loop. The render is compiled for
+        a separate template environment that stops it once it
+        exceeds its time or loop iteration budget. A render that
+        does not get a free worker within the timeout is reported
+        as timing out.
 
         This function is not a security control and is only
         intended to be used as a safety check when testing
@@ -354,32 +540,56 @@ class Template:
         if self.is_static:
             return False
 
-        compiled = self._compiled or self._ensure_compiled()
+        self.ensure_valid()
 
         if variables is not None:
             kwargs.update(variables)
 
-        finish_event = asyncio.Event()
-
-        def _render_template():
+        env = _async_get_budgeted_env(self.hass)
+        compiled = self._compiled_budgeted
+        if compiled is None:
+            compiled = self._compiled_budgeted = jinja2.Template.from_code(
+                env, env.compile(self.template), env.globals, None
+            )
+        loop = self.hass.loop
+        started = loop.create_future()
+        abandoned = False
+
+        @callback
+        def _async_started() -> None:
+            if not started.done():
+                started.set_result(None)
+
+        def _render_template() -> bool:
+            if abandoned:
+                return True
+            loop.call_soon_threadsafe(_async_started)
             try:
-                compiled.render(kwargs)
-            except TimeoutError:
-                pass
-            finally:
-                run_callback_threadsafe(self.hass.loop, finish_event.set)
+                env.render_with_budget(
+                    compiled, kwargs, timeout, MAX_RENDER_LOOP_ITERATIONS
+                )
+            except RenderBudgetExceeded:
+                return True
+            except Exception:  # pylint: disable=broad-except
+                return False
+            return False
+
+        render = loop.run_in_executor(
+            _async_get_render_pool(self.hass), _render_template
+        )
+        await asyncio.wait(
+            [started, render], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not started.done() and not render.done():
+            # All workers are busy, possibly with renders that cannot be stopped
+            abandoned = True
+            render.cancel()
+            return True
 
         try:
-            template_render_thread = ThreadWithException(target=_render_template)
-            template_render_thread.start()
-            await asyncio.wait_for(finish_event.wait(), timeout=timeout)
+            return await asyncio.wait_for(render, timeout=timeout)
         except asyncio.TimeoutError:
-            template_render_thread.raise_exc(TimeoutError)
             return True
-        finally:
-            template_render_thread.join()
-
-        return False
 
     @callback
     def async_render_to_info(
@@ -438,6 +648,17 @@ class Template:
         if self._compiled is None:
             self._ensure_compiled()
 
+        if self._fast_path is _SENTINEL:
+            self._fast_path = _compile_fast_path(self._env, self.template)
+
+        if self._fast_path is not None:
+            root, render = self._fast_path
+            try:
+                return render(value if root == "value" else json.loads(value))
+            except Exception:  # pylint: disable=broad-except
+                # Let Jinja produce the result or the error handling below
+                pass
+
         variables = dict(variables or {})
         variables["value"] = value
 
@@ -1224,6 +1445,54 @@ def urlencode(value):
     return urllib_urlencode(value).encode("utf-8")
 
 
+class RenderBudgetExceeded(TemplateRuntimeError):
+    """Raised when a budgeted render exceeds its limits."""
+
+
+class _RenderBudget:
+    """Time and loop iteration limits for a single render."""
+
+    def __init__(self, timeout: float, max_iterations: int):
+        """Initialize the budget."""
+        self.deadline = time.monotonic() + timeout
+        self.max_iterations = max_iterations
+        self.iterations = 0
+
+    def check(self) -> None:
+        """Raise if the render used up its time."""
+        if time.monotonic() > self.deadline:
+            raise RenderBudgetExceeded("Exceeded maximum render time")
+
+    def iterate(self, iterable: Iterable) -> Generator:
+        """Iterate while counting loop iterations against the budget."""
+        for item in iterable:
+            self.iterations += 1
+            if self.iterations > self.max_iterations:
+                raise RenderBudgetExceeded("Exceeded maximum loop iterations")
+            if not self.iterations % _BUDGET_CHECK_INTERVAL:
+                self.check()
+            yield item
+
+
+class TemplateCodeGenerator(CodeGenerator):
+    """Code generator that routes loop iterables through the environment."""
+
+    def visit_For(self, node, frame):  # pylint: disable=invalid-name
+        """Visit a for loop."""
+        if not isinstance(node.iter, nodes.Call) or not isinstance(
+            node.iter.node, nodes.EnvironmentAttribute
+        ):
+            node.iter = nodes.Call(
+                nodes.EnvironmentAttribute("guard_iter"),
+                [node.iter],
+                [],
+                None,
+                None,
+                lineno=node.lineno,
+            )
+        super().visit_For(node, frame)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1347,4 +1616,45 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         return cached
 
 
+class BudgetedTemplateEnvironment(TemplateEnvironment):
+    """Template environment limiting renders in worker threads."""
+
+    code_generator_class = TemplateCodeGenerator
+
+    def __init__(self, hass):
+        """Initialise template environment."""
+        super().__init__(hass)
+        self._render_budget = threading.local()
+
+    def render_with_budget(
+        self,
+        compiled: jinja2.Template,
+        variables: dict,
+        timeout: float,
+        max_iterations: int,
+    ) -> str:
+        """Render a template in this thread within a time and loop budget."""
+        self._render_budget.budget = _RenderBudget(timeout, max_iterations)
+        try:
+            return compiled.render(variables)
+        finally:
+            self._render_budget.budget = None
+
+    def guard_iter(self, iterable):
+        """Count loop iterations when rendering within a budget."""
+        budget = getattr(self._render_budget, "budget", None)
+        if budget is None:
+            return iterable
+        return budget.iterate(iterable)
+
+    def call(
+        __self, __context, __obj, *args, **kwargs
+    ):  # pylint: disable=no-self-argument
+        """Call an object from sandboxed code."""
+        budget = getattr(__self._render_budget, "budget", None)
+        if budget is not None:
+            budget.check()
+        return super().call(__context, __obj, *args, **kwargs)
+
+
 _NO_HASS_ENV = TemplateEnvironment(None)
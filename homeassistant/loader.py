@@ -20,11 +20,13 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
 )
 
+from homeassistant.const import __version__
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 
@@ -39,6 +41,10 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_INTEGRATION_INDEX = "integration_index"
+INDEX_STORAGE_KEY = "core.integration_index"
+INDEX_STORAGE_VERSION = 1
+INDEX_SAVE_DELAY = 10
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -87,13 +93,9 @@ async def _async_get_custom_components(
         get_sub_directories, custom_components.__path__
     )
 
+    index = await async_get_integration_index(hass)
     integrations = await asyncio.gather(
-        *(
-            hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
-            )
-            for comp in dirs
-        )
+        *(index.async_resolve(custom_components, comp.name) for comp in dirs)
     )
 
     return {
@@ -202,6 +204,134 @@ async def async_get_ssdp(hass: "HomeAssistant") -> Dict[str, List]:
     return ssdp
 
 
+class IntegrationIndex:
+    """Index of the integrations resolved on previous runs.
+
+    For each integration the manifest, the location and the platforms it
+    contains are stored. An entry is only used when the modification times
+    of its manifest.json and of its directory are unchanged, so resolving
+    integrations at startup does not need to read and parse every manifest.
+    """
+
+    def __init__(self, hass: "HomeAssistant") -> None:
+        """Initialize the integration index."""
+        self.hass = hass
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._store = hass.helpers.storage.Store(
+            INDEX_STORAGE_VERSION, INDEX_STORAGE_KEY, private=True
+        )
+
+    async def async_load(self) -> None:
+        """Load the index and drop the entries that are out of date."""
+        data = await self._store.async_load()
+
+        if data is None or data["ha_version"] != __version__:
+            return
+
+        self._entries = await self.hass.async_add_executor_job(
+            _valid_index_entries, data["integrations"]
+        )
+
+    async def async_resolve(
+        self, root_module: ModuleType, domain: str
+    ) -> "Optional[Integration]":
+        """Resolve an integration from a root module, using the index if possible."""
+        pkg_path = f"{root_module.__name__}.{domain}"
+        entry = self._entries.get(pkg_path)
+
+        if entry is None:
+            integration, entry = await self.hass.async_add_executor_job(
+                _resolve_and_index, self.hass, root_module, domain
+            )
+            if integration is None or entry is None:
+                return None
+            self._entries[pkg_path] = entry
+            self._store.async_delay_save(self._data_to_save, INDEX_SAVE_DELAY)
+            return integration
+
+        return Integration(
+            self.hass,
+            pkg_path,
+            pathlib.Path(entry["path"]),
+            dict(entry["manifest"]),
+            set(entry["platforms"]),
+        )
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {"ha_version": __version__, "integrations": dict(self._entries)}
+
+
+def _valid_index_entries(entries: Dict[str, Dict[str, Any]]) -> Dict[str, Dict]:
+    """Return the index entries whose manifest has not changed."""
+    valid = {}
+    for pkg_path, entry in entries.items():
+        path = pathlib.Path(entry["path"])
+        try:
+            mtime = (path / "manifest.json").stat().st_mtime_ns
+            # Platforms added or removed change the mtime of the directory
+            dir_mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        if mtime == entry["mtime"] and dir_mtime == entry.get("dir_mtime"):
+            valid[pkg_path] = entry
+    return valid
+
+
+def _resolve_and_index(
+    hass: "HomeAssistant", root_module: ModuleType, domain: str
+) -> "Tuple[Optional[Integration], Optional[Dict[str, Any]]]":
+    """Resolve an integration and return the index entry for it."""
+    integration = Integration.resolve_from_root(hass, root_module, domain)
+
+    if integration is None:
+        return None, None
+
+    platforms = {
+        entry.stem
+        for entry in integration.file_path.iterdir()
+        if (entry.suffix == ".py" and entry.stem != "__init__")
+        or (entry / "__init__.py").exists()
+    }
+    integration.platforms = platforms
+
+    return (
+        integration,
+        {
+            "path": str(integration.file_path),
+            "mtime": (integration.file_path / "manifest.json").stat().st_mtime_ns,
+            "dir_mtime": integration.file_path.stat().st_mtime_ns,
+            "manifest": integration.manifest,
+            "platforms": sorted(platforms),
+        },
+    )
+
+
+async def async_get_integration_index(hass: "HomeAssistant") -> IntegrationIndex:
+    """Return the loaded integration index."""
+    index_or_evt = hass.data.get(DATA_INTEGRATION_INDEX)
+
+    if index_or_evt is None:
+        evt = hass.data[DATA_INTEGRATION_INDEX] = asyncio.Event()
+
+        index = IntegrationIndex(hass)
+        try:
+            await index.async_load()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error loading the integration index")
+        finally:
+            # Integrations are resolved without the entries if loading failed
+            hass.data[DATA_INTEGRATION_INDEX] = index
+            evt.set()
+        return index
+
+    if isinstance(index_or_evt, asyncio.Event):
+        await index_or_evt.wait()
+        return cast(IntegrationIndex, hass.data[DATA_INTEGRATION_INDEX])
+
+    return cast(IntegrationIndex, index_or_evt)
+
+
 class Integration:
     """An integration in Home Assistant."""
 
@@ -256,12 +386,15 @@ class Integration:
         pkg_path: str,
         file_path: pathlib.Path,
         manifest: Dict[str, Any],
+        platforms: Optional[Set[str]] = None,
     ):
         """Initialize an integration."""
         self.hass = hass
         self.pkg_path = pkg_path
         self.file_path = file_path
         self.manifest = manifest
+        # Names of the platforms of the integration, if known
+        self.platforms = platforms
         manifest["is_built_in"] = self.is_built_in
 
         if self.dependencies:
@@ -444,9 +577,8 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
-    integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
-    )
+    index = await async_get_integration_index(hass)
+    integration = await index.async_resolve(components, domain)
 
     if integration is not None:
         cache[domain] = integration
@@ -1,18 +1,27 @@
 """Module to handle installing requirements."""
 import asyncio
+import hashlib
 import logging
 import os
+import sys
 from typing import Any, Dict, Iterable, List, Optional, Set, Union, cast
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.singleton import singleton
 from homeassistant.loader import Integration, IntegrationNotFound, async_get_integration
 import homeassistant.util.package as pkg_util
 
 DATA_PIP_LOCK = "pip_lock"
 DATA_PKG_CACHE = "pkg_cache"
 DATA_INTEGRATIONS_WITH_REQS = "integrations_with_reqs"
+DATA_REQUIREMENTS_CACHE = "requirements_cache"
 CONSTRAINT_FILE = "package_constraints.txt"
+STORAGE_KEY = "core.requirements"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+# Names of the directories of sys.path that packages are installed in
+PACKAGE_DIRS = ("site-packages", "dist-packages")
 _LOGGER = logging.getLogger(__name__)
 DISCOVERY_INTEGRATIONS: Dict[str, Iterable[str]] = {
     "ssdp": ("ssdp",),
@@ -31,6 +40,82 @@ class RequirementsNotFound(HomeAssistantError):
         self.requirements = requirements
 
 
+class RequirementsCache:
+    """Remember the requirements that are satisfied by the installed packages.
+
+    The cache is stored together with a fingerprint of the directories
+    packages are installed in. When packages are installed, upgraded or
+    removed the fingerprint changes and all requirements are checked again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the requirements cache."""
+        self.hass = hass
+        self.fingerprint: Optional[str] = None
+        self.satisfied: Set[str] = set()
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, private=True
+        )
+
+    async def async_load(self) -> None:
+        """Load the requirements that were satisfied on the last run."""
+        data, self.fingerprint = await asyncio.gather(
+            self._store.async_load(),
+            self.hass.async_add_executor_job(_packages_fingerprint),
+        )
+
+        if data is not None and data["fingerprint"] == self.fingerprint:
+            self.satisfied = set(data["satisfied"])
+
+    @callback
+    def async_add(self, requirements: Iterable[str]) -> None:
+        """Add requirements that are satisfied."""
+        self.satisfied.update(requirements)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_installed(self, requirement: str) -> None:
+        """Add a requirement that was installed.
+
+        Installing a package can change the packages other requirements
+        were satisfied with, so those are checked again.
+        """
+        self.fingerprint = await self.hass.async_add_executor_job(_packages_fingerprint)
+        self.satisfied.clear()
+        self.async_add([requirement])
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {"fingerprint": self.fingerprint, "satisfied": sorted(self.satisfied)}
+
+
+def _packages_fingerprint() -> str:
+    """Return a fingerprint of the directories packages are installed in.
+
+    Installing or removing a package adds or removes entries in these
+    directories, which changes their modification time. Other entries of
+    sys.path, like the config dir, change on every run and are skipped.
+    """
+    fingerprint = hashlib.sha1()
+    for path in sys.path:
+        if os.path.basename(os.path.normpath(path)) not in PACKAGE_DIRS:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        fingerprint.update(f"{path}:{mtime}\n".encode())
+    return fingerprint.hexdigest()
+
+
+@singleton(DATA_REQUIREMENTS_CACHE)
+async def _async_get_requirements_cache(hass: HomeAssistant) -> RequirementsCache:
+    """Return the requirements cache."""
+    cache = RequirementsCache(hass)
+    await cache.async_load()
+    return cache
+
+
 async def async_get_integration_with_requirements(
     hass: HomeAssistant, domain: str, done: Optional[Set[str]] = None
 ) -> Integration:
@@ -71,6 +156,23 @@ async def async_get_integration_with_requirements(
 
     event = cache[domain] = asyncio.Event()
 
+    try:
+        await _async_process_integration(hass, integration, done)
+    except BaseException:
+        # Do not cache the failure, a later call processes it again
+        del cache[domain]
+        event.set()
+        raise
+
+    cache[domain] = integration
+    event.set()
+    return integration
+
+
+async def _async_process_integration(
+    hass: HomeAssistant, integration: Integration, done: Set[str]
+) -> None:
+    """Process the requirements of an integration and its dependencies."""
     if integration.requirements:
         await async_process_requirements(
             hass, integration.domain, integration.requirements
@@ -98,10 +200,6 @@ async def async_get_integration_with_requirements(
             ]
         )
 
-    cache[domain] = integration
-    event.set()
-    return integration
-
 
 async def async_process_requirements(
     hass: HomeAssistant, name: str, requirements: List[str]
@@ -111,6 +209,25 @@ async def async_process_requirements(
     This method is a coroutine. It will raise RequirementsNotFound
     if an requirement can't be satisfied.
     """
+    req_cache = await _async_get_requirements_cache(hass)
+    to_check = [req for req in requirements if req not in req_cache.satisfied]
+
+    if not to_check:
+        return
+
+    installed = await asyncio.gather(
+        *(hass.async_add_executor_job(pkg_util.is_installed, req) for req in to_check)
+    )
+    req_cache.async_add(
+        req for req, is_installed in zip(to_check, installed) if is_installed
+    )
+    missing = [
+        req for req, is_installed in zip(to_check, installed) if not is_installed
+    ]
+
+    if not missing:
+        return
+
     pip_lock = hass.data.get(DATA_PIP_LOCK)
     if pip_lock is None:
         pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock()
@@ -118,8 +235,11 @@ async def async_process_requirements(
     kwargs = pip_kwargs(hass.config.config_dir)
 
     async with pip_lock:
-        for req in requirements:
-            if pkg_util.is_installed(req):
+        for req in missing:
+            # Installed while we were waiting for the lock, possibly as a
+            # dependency of another requirement
+            if await hass.async_add_executor_job(pkg_util.is_installed, req):
+                req_cache.async_add([req])
                 continue
 
             def _install(req: str, kwargs: Dict) -> bool:
@@ -131,6 +251,8 @@ async def async_process_requirements(
             if not ret:
                 raise RequirementsNotFound(name, [req])
 
+            await req_cache.async_installed(req)
+
 
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
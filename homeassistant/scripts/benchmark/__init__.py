@@ -3,18 +3,32 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 import json
 import logging
+import os
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
-from homeassistant import core
+from homeassistant import core, loader
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.components.websocket_api.messages import (
+    result_message,
+    result_message_json,
+)
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_backend, json_dumps
+from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_util
+from homeassistant.util.yaml import load_yaml, loader as yaml_loader
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -113,6 +127,38 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def time_tracking_helper(hass):
+    """Run a million timers spread over 1000 seconds through time tracking."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle timer."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 6:
+            event.set()
+
+    now = dt_util.utcnow()
+    start = timer()
+
+    # Timers due in the past run right away, the others are cancelled
+    for idx in range(10 ** 6):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now - timedelta(seconds=idx % 1000)
+        )
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now + timedelta(seconds=idx % 1000 + 3600)
+        )()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -185,6 +231,46 @@ async def state_changed_event_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_event_helper_popular_entity(hass):
+    """Run 10k events through 500 listeners of one entity, removing them after."""
+    count = 0
+    entity_id = "sun.sun"
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 5 * 10 ** 6:
+            event.set()
+
+    unsubs = [
+        hass.helpers.event.async_track_state_change_event(entity_id, listener)
+        for _ in range(500)
+    ]
+
+    event_data = {
+        "entity_id": entity_id,
+        "old_state": core.State(entity_id, "above_horizon"),
+        "new_state": core.State(entity_id, "below_horizon"),
+    }
+
+    for _ in range(10 ** 4):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    for unsub in unsubs:
+        unsub()
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -323,6 +409,278 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def render_value_templates(hass):
+    """Render 100k typical MQTT sensor payloads through value templates."""
+    payloads = [
+        ("{{ value }}", "21.5"),
+        ("{{ value | float | round(1) }}", "21.46"),
+        ("{{ value_json.temperature }}", '{"temperature": 21.5, "humidity": 48}'),
+        (
+            "{{ value_json.ENERGY.Power | int }}",
+            '{"Time": "2020-10-01T12:00:00", "ENERGY": {"Power": 512, "Voltage": 230}}',
+        ),
+    ]
+    templates = [(Template(tpl, hass), payload) for tpl, payload in payloads]
+    size = len(templates)
+
+    start = timer()
+
+    for i in range(10 ** 5):
+        tpl, payload = templates[i % size]
+        tpl.async_render_with_possible_json_value(payload)
+
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_states_repeated(hass):
+    """Serialize the same 10k states 100 times like repeated get_states calls."""
+    states = [
+        core.State(f"light.kitchen_{idx}", "on", {"friendly_name": "Kitchen Lights"})
+        for idx in range(10 ** 4)
+    ]
+
+    start = timer()
+    for idx in range(100):
+        result_message_json(idx, f'[{", ".join(state.as_json() for state in states)}]')
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_get_states(hass):
+    """Serialize a 5k states get_states payload 100 times with orjson."""
+    if json_backend() != "orjson":
+        raise RuntimeError("orjson is not installed")
+    return await _json_serialize_get_states(hass, json_dumps)
+
+
+@benchmark
+async def json_serialize_get_states_stdlib(hass):
+    """Serialize a 5k states get_states payload 100 times with json."""
+    return await _json_serialize_get_states(
+        hass, partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+    )
+
+
+async def _json_serialize_get_states(hass, dumps):
+    now = dt_util.utcnow()
+    states = [
+        core.State(
+            f"sensor.power_meter_{idx}",
+            "512.3",
+            {
+                "friendly_name": f"Power meter {idx}",
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "last_reset": now,
+                "supported_features": 0,
+                "options": ["low", "medium", "high"],
+            },
+        )
+        for idx in range(5000)
+    ]
+
+    start = timer()
+    for idx in range(100):
+        dumps(result_message(idx, states))
+    return timer() - start
+
+
+@benchmark
+async def trend_gradient(hass):
+    """Update a 1000 samples trend gradient with 100k samples."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.trend.binary_sensor import TrendSamples
+
+    samples = TrendSamples(1000)
+    timestamp = dt_util.utcnow().timestamp()
+
+    start = timer()
+    for idx in range(10 ** 5):
+        samples.append(timestamp + idx, float(idx % 100))
+        samples.gradient()
+    return timer() - start
+
+
+@benchmark
+async def resolve_integrations(hass):
+    """Resolve 150 integrations 100 times using the integration index."""
+    return await _resolve_integrations(hass, True)
+
+
+@benchmark
+async def resolve_integrations_no_index(hass):
+    """Resolve 150 integrations 100 times reading their manifests."""
+    return await _resolve_integrations(hass, False)
+
+
+async def _resolve_integrations(hass, use_index):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.generated.config_flows import FLOWS
+
+    domains = FLOWS[:150]
+
+    async def resolve():
+        await asyncio.gather(
+            *(loader.async_get_integration(hass, domain) for domain in domains)
+        )
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await resolve()
+
+        if use_index:
+            index = hass.data[loader.DATA_INTEGRATION_INDEX]
+            await index._store.async_save(index._data_to_save())
+
+        start = timer()
+        for _ in range(100):
+            hass.data.pop(loader.DATA_INTEGRATIONS)
+            hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+            await resolve()
+        elapsed = timer() - start
+
+        # Write the delayed index saves before the config dir is removed
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+        return elapsed
+
+
+@benchmark
+async def load_yaml_split_config(hass):
+    """Load a configuration split over 100 files 10 times."""
+    return await hass.async_add_executor_job(_load_yaml_split_config)
+
+
+def _load_yaml_split_config():
+    automation = (
+        "- id: '{idx}'\n"
+        "  alias: Automation {idx}\n"
+        "  trigger:\n"
+        "    - platform: state\n"
+        "      entity_id: binary_sensor.motion_{idx}\n"
+        "      to: 'on'\n"
+        "  condition:\n"
+        "    - condition: template\n"
+        '      value_template: \'{{{{ is_state("sun.sun", "below_horizon") }}}}\'\n'
+        "  action:\n"
+        "    - service: light.turn_on\n"
+        "      data:\n"
+        "        entity_id: [light.hall_{idx}, light.stairs_{idx}]\n"
+        "        brightness: 120\n"
+    )
+    sensor = (
+        "sensor_{idx}:\n"
+        "  friendly_name: Sensor {idx}\n"
+        "  unit_of_measurement: W\n"
+        "  value_template: '{{{{ states(\"sensor.power_{idx}\") | float }}}}'\n"
+    )
+
+    with TemporaryDirectory() as config_dir:
+        for name, template in (("automations", automation), ("sensors", sensor)):
+            os.mkdir(os.path.join(config_dir, name))
+            for file_idx in range(50):
+                with open(
+                    os.path.join(config_dir, name, f"{file_idx}.yaml"), "w"
+                ) as fil:
+                    for idx in range(20):
+                        fil.write(template.format(idx=file_idx * 20 + idx))
+
+        with open(os.path.join(config_dir, "secrets.yaml"), "w") as fil:
+            fil.write("latitude: 32.87\n")
+        with open(os.path.join(config_dir, "configuration.yaml"), "w") as fil:
+            fil.write(
+                "homeassistant:\n"
+                "  latitude: !secret latitude\n"
+                "automation: !include_dir_merge_list automations\n"
+                "sensor:\n"
+                "  - platform: template\n"
+                "    sensors: !include_dir_merge_named sensors\n"
+            )
+
+        config_file = os.path.join(config_dir, "configuration.yaml")
+        start = timer()
+        for _ in range(10):
+            yaml_loader.clear_secret_cache()
+            load_yaml(config_file)
+        return timer() - start
+
+
+@benchmark
+async def active_zone(hass):
+    """Find the active zone of 10000 locations among 250 zones."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.zone import async_active_zone
+
+    for idx in range(250):
+        hass.states.async_set(
+            f"zone.zone_{idx}",
+            "zoning",
+            {
+                "latitude": 52 + (idx % 25) * 0.02,
+                "longitude": 5 + (idx // 25) * 0.02,
+                "radius": 200,
+            },
+        )
+    for idx in range(2000):
+        hass.states.async_set(f"sensor.sensor_{idx}", "on")
+    await hass.async_block_till_done()
+
+    start = timer()
+    for idx in range(10000):
+        async_active_zone(hass, 52 + (idx % 100) * 0.005, 5 + (idx // 100) * 0.002, 50)
+    return timer() - start
+
+
+@benchmark
+async def group_state_changed(hass):
+    """Toggle 5000 times the only light that can be on in a group of 1000."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.group import REG_KEY, Group, GroupIntegrationRegistry
+
+    registry = hass.data[REG_KEY] = GroupIntegrationRegistry()
+    registry.on_states_by_domain = {"light": {"on"}}
+    entity_ids = [f"light.light_{idx}" for idx in range(1000)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "off")
+    group = Group(hass, "lights", entity_ids=entity_ids)
+    group.entity_id = "group.lights"
+    hass.state = core.CoreState.running
+    await group.async_added_to_hass()
+    await hass.async_block_till_done()
+
+    start = timer()
+    for idx in range(5000):
+        hass.states.async_set(entity_ids[-1], "on" if idx % 2 else "off")
+    await hass.async_block_till_done()
+    return timer() - start
+
+
+@benchmark
+async def expand_group_entity_ids(hass):
+    """Expand 10000 times a group of 10 nested groups of 100 lights."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.group import expand_entity_ids
+
+    for group_idx in range(10):
+        hass.states.async_set(
+            f"group.group_{group_idx}",
+            "off",
+            {"entity_id": [f"light.light_{group_idx}_{idx}" for idx in range(100)]},
+        )
+    hass.states.async_set(
+        "group.all_lights",
+        "off",
+        {"entity_id": [f"group.group_{group_idx}" for group_idx in range(10)]},
+    )
+
+    start = timer()
+    for _ in range(10000):
+        expand_entity_ids(hass, ["group.all_lights"])
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -198,6 +198,7 @@ def check(config_dir, secrets=False):
     if secrets:
         # Ensure !secrets point to the patched function
         yaml_loader.yaml.SafeLoader.add_constructor("!secret", yaml_loader.secret_yaml)
+        yaml_loader.FastSafeLoader.add_constructor("!secret", yaml_loader.secret_yaml)
 
     try:
         res["components"] = asyncio.run(async_check_config(config_dir))
@@ -220,6 +221,9 @@ def check(config_dir, secrets=False):
             yaml_loader.yaml.SafeLoader.add_constructor(
                 "!secret", yaml_loader.secret_yaml
             )
+            yaml_loader.FastSafeLoader.add_constructor(
+                "!secret", yaml_loader.secret_yaml
+            )
         bootstrap.clear_secret_cache()
 
     return res
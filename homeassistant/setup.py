@@ -9,6 +9,7 @@ from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -59,6 +60,7 @@ async def async_setup_component(
     task = setup_tasks[domain] = hass.async_create_task(
         _async_setup_component(hass, domain, config)
     )
+    startup_trace.async_trace_setup(hass, domain, task)
 
     try:
         return await task  # type: ignore
@@ -92,6 +94,12 @@ async def _async_process_dependencies(
     if not dependencies_tasks and not after_dependencies_tasks:
         return True
 
+    startup_trace.async_trace_dependencies(
+        hass,
+        integration.domain,
+        [*dependencies_tasks, *after_dependencies_tasks],
+    )
+
     if dependencies_tasks:
         _LOGGER.debug(
             "Dependency %s will wait for dependencies %s",
@@ -163,7 +171,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with startup_trace.async_trace_phase(hass, domain, startup_trace.PHASE_IMPORT):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -171,9 +180,10 @@ async def _async_setup_component(
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with startup_trace.async_trace_phase(hass, domain, startup_trace.PHASE_CONFIG):
+        processed_config = await conf_util.async_process_component_config(
+            hass, config, integration
+        )
 
     if processed_config is None:
         log_error("Invalid config.", integration.documentation)
@@ -227,6 +237,9 @@ async def _async_setup_component(
         return False
     finally:
         end = timer()
+        startup_trace.async_add_phase_time(
+            hass, domain, startup_trace.PHASE_SETUP, end - start
+        )
         if warn_task:
             warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
@@ -247,12 +260,15 @@ async def _async_setup_component(
     await asyncio.sleep(0)
     await hass.config_entries.flow.async_wait_init_flow_finish(domain)
 
-    await asyncio.gather(
-        *[
-            entry.async_setup(hass, integration=integration)
-            for entry in hass.config_entries.async_entries(domain)
-        ]
-    )
+    with startup_trace.async_trace_phase(
+        hass, domain, startup_trace.PHASE_CONFIG_ENTRIES
+    ):
+        await asyncio.gather(
+            *[
+                entry.async_setup(hass, integration=integration)
+                for entry in hass.config_entries.async_entries(domain)
+            ]
+        )
 
     hass.config.components.add(domain)
     hass.data[DATA_SETUP_STARTED].pop(domain)
@@ -335,14 +351,20 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if not await _async_process_dependencies(hass, config, integration):
-        raise HomeAssistantError("Could not set up all dependencies.")
+    with startup_trace.async_trace_phase(
+        hass, integration.domain, startup_trace.PHASE_DEPENDENCIES
+    ):
+        if not await _async_process_dependencies(hass, config, integration):
+            raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        async with hass.timeout.async_freeze(integration.domain):
-            await requirements.async_get_integration_with_requirements(
-                hass, integration.domain
-            )
+        with startup_trace.async_trace_phase(
+            hass, integration.domain, startup_trace.PHASE_REQUIREMENTS
+        ):
+            async with hass.timeout.async_freeze(integration.domain):
+                await requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
 
     processed.add(integration.domain)
 
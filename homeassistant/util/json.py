@@ -1,5 +1,6 @@
 """JSON utility functions."""
 from collections import deque
+from functools import partial
 import json
 import logging
 import os
@@ -8,6 +9,7 @@ from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_dumps
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -48,15 +50,28 @@ def save_json(
     private: bool = False,
     *,
     encoder: Optional[Type[json.JSONEncoder]] = None,
+    compact: bool = False,
 ) -> None:
     """Save JSON data to a file.
 
+    Compact files are written without indentation.
+
+    Data is serialized with the Home Assistant JSON backend, which falls
+    back to the standard library for custom encoders.
+
     Returns True on success.
     """
+    dump = partial(
+        json_dumps,
+        indent=None if compact else 4,
+        allow_nan=True,
+        encoder=encoder or json.JSONEncoder,
+    )
+
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        json_data = dump(data)
     except TypeError as error:
-        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
+        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data, dump=dump))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
@@ -0,0 +1,311 @@
+"""Incrementally maintained statistics over a sliding window of samples.
+
+Adding or evicting a sample updates the statistics in constant time, except
+for the median which is kept in two heaps and is updated in logarithmic
+time. Samples are evicted once the window holds more than ``max_count``
+samples or when they are older than ``max_age``.
+"""
+from collections import deque
+from datetime import datetime, timedelta
+import heapq
+import math
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class _SlidingMedian:
+    """Median of a sliding window kept in two heaps.
+
+    The lower half of the samples is kept in a max heap and the upper half
+    in a min heap. Evicted samples are removed lazily once they reach the
+    top of a heap, or when they make up most of a heap.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the heaps."""
+        # Max heap of (-value, sequence number)
+        self._low: List[Tuple[float, int]] = []
+        # Min heap of (value, sequence number)
+        self._high: List[Tuple[float, int]] = []
+        self._low_count = 0
+        self._high_count = 0
+        # Sequence numbers of the samples in the window and if they are low
+        self._in_low: Dict[int, bool] = {}
+        # Samples with a lower sequence number have been evicted
+        self._first_seq = 0
+
+    def add(self, seq: int, value: float) -> None:
+        """Add a sample."""
+        if self._low_count and value > -self._low[0][0]:
+            heapq.heappush(self._high, (value, seq))
+            self._in_low[seq] = False
+            self._high_count += 1
+        else:
+            heapq.heappush(self._low, (-value, seq))
+            self._in_low[seq] = True
+            self._low_count += 1
+        self._rebalance()
+
+    def evict(self, seq: int) -> None:
+        """Evict the oldest sample, which has the given sequence number."""
+        self._first_seq = seq + 1
+        if self._in_low.pop(seq):
+            self._low_count -= 1
+            self._low = self._prune(self._low, self._low_count)
+        else:
+            self._high_count -= 1
+            self._high = self._prune(self._high, self._high_count)
+        self._rebalance()
+
+    def clear(self, first_seq: int) -> None:
+        """Remove all samples."""
+        self._first_seq = first_seq
+        self._low.clear()
+        self._high.clear()
+        self._in_low.clear()
+        self._low_count = self._high_count = 0
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median of the samples."""
+        if not self._low_count:
+            return None
+        if self._low_count > self._high_count:
+            return -self._low[0][0]
+        return (self._high[0][0] - self._low[0][0]) / 2
+
+    def _prune(
+        self, heap: List[Tuple[float, int]], count: int
+    ) -> List[Tuple[float, int]]:
+        """Remove evicted samples from the top of a heap.
+
+        The heap is rebuilt without evicted samples when they make up most
+        of it, so samples that never reach the top do not accumulate.
+        """
+        if len(heap) > 2 * count + 16:
+            heap = [item for item in heap if item[1] >= self._first_seq]
+            heapq.heapify(heap)
+        while heap and heap[0][1] < self._first_seq:
+            heapq.heappop(heap)
+        return heap
+
+    def _move(self, from_low: bool) -> None:
+        """Move the top sample from one heap to the other."""
+        if from_low:
+            value, seq = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-value, seq))
+            self._low_count -= 1
+            self._high_count += 1
+            self._low = self._prune(self._low, self._low_count)
+        else:
+            value, seq = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, seq))
+            self._high_count -= 1
+            self._low_count += 1
+            self._high = self._prune(self._high, self._high_count)
+        self._in_low[seq] = not from_low
+
+    def _rebalance(self) -> None:
+        """Keep the low heap equal to or one sample larger than the high heap."""
+        if self._low_count > self._high_count + 1:
+            self._move(True)
+        elif self._high_count > self._low_count:
+            self._move(False)
+
+
+class RollingStatistics:
+    """Statistics over a window of timestamped samples."""
+
+    def __init__(
+        self,
+        max_count: Optional[int] = None,
+        max_age: Optional[timedelta] = None,
+        numeric: bool = True,
+    ) -> None:
+        """Initialize the window.
+
+        Non numeric windows only keep track of the samples and their age.
+        """
+        self.max_count = max_count
+        self.max_age = max_age
+        self.numeric = numeric
+        self.values: Deque[Any] = deque()
+        self.timestamps: Deque[datetime] = deque()
+        # Sequence number of the oldest sample in the window
+        self._first_seq = 0
+        self._median = _SlidingMedian()
+        # Monotonic deques of (sequence number, value)
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        """Reset the running sums."""
+        self._total = 0.0
+        self._total_compensation = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+
+    def _rebuild_sums(self) -> None:
+        """Recompute the running sums from the samples in the window.
+
+        Removing samples from the running mean and variance accumulates
+        rounding errors, the sums are recomputed once every sample in the
+        window has been replaced.
+        """
+        count = len(self.values)
+        self._total = math.fsum(self.values)
+        self._total_compensation = 0.0
+        self._mean = self._total / count
+        self._m2 = math.fsum((value - self._mean) ** 2 for value in self.values)
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self.values)
+
+    def add(self, value: Any, timestamp: datetime) -> None:
+        """Add a sample, evicting the oldest one if the window is full."""
+        seq = self._first_seq + len(self.values)
+        self.values.append(value)
+        self.timestamps.append(timestamp)
+
+        if self.numeric:
+            self._add_total(value)
+
+            # Welford's online algorithm
+            delta = value - self._mean
+            self._mean += delta / len(self.values)
+            self._m2 += delta * (value - self._mean)
+
+            self._median.add(seq, value)
+
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((seq, value))
+
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((seq, value))
+
+        if self.max_count is not None:
+            while len(self.values) > self.max_count:
+                self._evict()
+
+    def purge(self, now: datetime) -> None:
+        """Evict all samples that are older than the maximum age."""
+        if self.max_age is None:
+            return
+
+        while self.timestamps and now - self.timestamps[0] > self.max_age:
+            self._evict()
+
+    def next_expiry(self) -> Optional[datetime]:
+        """Return when the oldest sample expires, if samples expire at all."""
+        if self.max_age is None or not self.timestamps:
+            return None
+        return self.timestamps[0] + self.max_age
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self._first_seq += len(self.values)
+        self.values.clear()
+        self.timestamps.clear()
+        self._median.clear(self._first_seq)
+        self._min.clear()
+        self._max.clear()
+        self._reset_sums()
+
+    def _add_total(self, value: float) -> None:
+        """Add to the running total with Neumaier compensation."""
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._total_compensation += (self._total - total) + value
+        else:
+            self._total_compensation += (value - total) + self._total
+        self._total = total
+
+    def _evict(self) -> None:
+        """Remove the oldest sample."""
+        seq = self._first_seq
+        self._first_seq += 1
+        value = self.values.popleft()
+        self.timestamps.popleft()
+
+        if not self.numeric:
+            return
+
+        count = len(self.values)
+        if not count:
+            self._reset_sums()
+            self._median.clear(self._first_seq)
+            self._min.clear()
+            self._max.clear()
+            return
+
+        self._evictions += 1
+        if self._evictions >= count:
+            self._rebuild_sums()
+        else:
+            self._add_total(-value)
+
+            mean = self._mean
+            self._mean = (mean * (count + 1) - value) / count
+            self._m2 = max(self._m2 - (value - mean) * (value - self._mean), 0.0)
+
+        self._median.evict(seq)
+
+        if self._min[0][0] == seq:
+            self._min.popleft()
+        if self._max[0][0] == seq:
+            self._max.popleft()
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self.values)
+
+    @property
+    def total(self) -> Optional[float]:
+        """Return the sum of the samples."""
+        if not self._min:
+            return None
+        return self._total + self._total_compensation
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the arithmetic mean of the samples."""
+        if not self._min:
+            return None
+        return self._mean
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median of the samples."""
+        return self._median.median
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance, this requires two samples."""
+        count = len(self.values) if self.numeric else 0
+        if count < 2:
+            return None
+        return self._m2 / (count - 1)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Return the sample standard deviation, this requires two samples."""
+        variance = self.variance
+        if variance is None:
+            return None
+        return math.sqrt(variance)
+
+    @property
+    def min(self) -> Optional[float]:
+        """Return the smallest sample."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Return the largest sample."""
+        return self._max[0][1] if self._max else None
@@ -1,7 +1,7 @@
 """YAML utility functions."""
 from .const import _SECRET_NAMESPACE, SECRET_YAML
 from .dumper import dump, save_yaml
-from .loader import clear_secret_cache, load_yaml, secret_yaml
+from .loader import clear_secret_cache, load_yaml, load_yaml_cached, secret_yaml
 
 __all__ = [
     "SECRET_YAML",
@@ -10,5 +10,6 @@ __all__ = [
     "save_yaml",
     "clear_secret_cache",
     "load_yaml",
+    "load_yaml_cached",
     "secret_yaml",
 ]
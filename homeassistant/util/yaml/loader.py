@@ -1,10 +1,28 @@
 """Custom loader."""
 from collections import OrderedDict
+from contextvars import ContextVar
 import fnmatch
+import hashlib
+from io import StringIO
 import logging
 import os
+from pathlib import Path
+import pickle
 import sys
-from typing import Dict, Iterator, List, TypeVar, Union, overload
+import tempfile
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 import yaml
 
@@ -23,6 +41,15 @@ try:
 except ImportError:
     credstash = None
 
+try:
+    from yaml import CSafeLoader as FastestAvailableSafeLoader
+
+    HAS_C_LOADER = True
+except ImportError:
+    from yaml import SafeLoader as FastestAvailableSafeLoader  # type: ignore
+
+    HAS_C_LOADER = False
+
 
 # mypy: allow-untyped-calls, no-warn-return-any
 
@@ -32,6 +59,239 @@ DICT_T = TypeVar("DICT_T", bound=Dict)  # pylint: disable=invalid-name
 _LOGGER = logging.getLogger(__name__)
 __SECRET_CACHE: Dict[str, JSON_TYPE] = {}
 
+CACHE_VERSION = 3
+
+FILE_SIGNATURE = Optional[Tuple[int, int, str]]  # pylint: disable=invalid-name
+
+
+class _Dependencies:
+    """Files, directories and environment variables a YAML load depends on."""
+
+    def __init__(self) -> None:
+        """Initialize the dependencies."""
+        self.files: Dict[str, FILE_SIGNATURE] = {}
+        self.dirs: Dict[str, Optional[int]] = {}
+        self.env: Dict[str, Optional[str]] = {}
+        self.cacheable = True
+        self.references = False
+
+
+class _SecretReference:
+    """A secret used by a cached load, resolved after the load."""
+
+    __slots__ = ("secret_path", "name")
+
+    def __init__(self, secret_path: str, name: str) -> None:
+        """Initialize the secret reference."""
+        self.secret_path = secret_path
+        self.name = name
+
+    def __getstate__(self) -> Tuple[str, str]:
+        """Return the state to pickle."""
+        return self.secret_path, self.name
+
+    def __setstate__(self, state: Tuple[str, str]) -> None:
+        """Restore the pickled state."""
+        self.secret_path, self.name = state
+
+    def resolve(self) -> JSON_TYPE:
+        """Return the secret."""
+        return _load_secret(self.secret_path, self.name)
+
+
+class _EnvReference:
+    """An environment variable used by a cached load, resolved after the load."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str) -> None:
+        """Initialize the environment variable reference."""
+        self.value = value
+
+    def __getstate__(self) -> str:
+        """Return the state to pickle."""
+        return self.value
+
+    def __setstate__(self, state: str) -> None:
+        """Restore the pickled state."""
+        self.value = state
+
+    def resolve(self) -> str:
+        """Return the value of the environment variable."""
+        return _env_var(self.value)
+
+
+_REFERENCES = (_SecretReference, _EnvReference)
+
+
+_DEPENDENCIES: ContextVar[Optional[_Dependencies]] = ContextVar(
+    "yaml_dependencies", default=None
+)
+
+
+def _digest(content: str) -> str:
+    """Return the hash of the content of a file."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _file_signature(fname: str) -> FILE_SIGNATURE:
+    """Return the modification time, size and hash of a file."""
+    try:
+        stat = os.stat(fname)
+        digest = _digest(Path(fname).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, digest
+
+
+def _track_file(deps: _Dependencies, fname: str, content: str) -> None:
+    """Track a file the load depends on with the content that was read."""
+    try:
+        # The content was read after this stat, a change in between is
+        # detected by the modification time on the next load.
+        stat = os.stat(fname)
+    except FileNotFoundError:
+        # File was read but is not on disk
+        deps.cacheable = False
+        return
+    deps.files[fname] = (stat.st_mtime_ns, stat.st_size, _digest(content))
+
+
+def _track_dir(directory: str) -> None:
+    """Track a directory the load depends on the contents of."""
+    deps = _DEPENDENCIES.get()
+    if deps is None:
+        return
+    try:
+        deps.dirs[directory] = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        deps.dirs[directory] = None
+
+
+def _env_signature(name: str) -> Optional[str]:
+    """Return the hash of the value of an environment variable."""
+    value = os.environ.get(name)
+    return None if value is None else _digest(value)
+
+
+def _resolve_references(obj: Any) -> Any:
+    """Replace the references in a loaded object with their values."""
+    if isinstance(obj, _REFERENCES):
+        return obj.resolve()
+
+    if isinstance(obj, dict):
+        if any(isinstance(key, _REFERENCES) for key in obj):
+            items = list(obj.items())
+            obj.clear()
+            for key, value in items:
+                obj[_resolve_references(key)] = value
+        for key, value in obj.items():
+            if isinstance(value, (dict, list, *_REFERENCES)):
+                obj[key] = _resolve_references(value)
+
+    elif isinstance(obj, list):
+        for idx, value in enumerate(obj):
+            if isinstance(value, (dict, list, *_REFERENCES)):
+                obj[idx] = _resolve_references(value)
+
+    return obj
+
+
+def _cache_valid(cache: Dict[str, Any], fname: str) -> bool:
+    """Return if the files and environment of a cached load are unchanged."""
+    if cache.get("version") != CACHE_VERSION or cache.get("fname") != fname:
+        return False
+
+    for name, signature in cache["env"].items():
+        if _env_signature(name) != signature:
+            return False
+
+    for directory, mtime in cache["dirs"].items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime:
+                return False
+        except FileNotFoundError:
+            if mtime is not None:
+                return False
+
+    for path, signature in cache["files"].items():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if signature is None:
+                continue
+            return False
+        if signature is None or stat.st_size != signature[1]:
+            return False
+        # Only hash files that were touched
+        if stat.st_mtime_ns != signature[0] and _file_signature(path) != (
+            stat.st_mtime_ns,
+            *signature[1:],
+        ):
+            return False
+
+    return True
+
+
+def load_yaml_cached(fname: str, cache_file: str) -> JSON_TYPE:
+    """Load a YAML file and what it includes, using a cache of the result.
+
+    The cache holds the loaded objects including the line annotations. It
+    is only used if the files, directories and environment variables the
+    load depends on are unchanged. Secrets and environment variables are
+    not stored in the cache, the cache refers to them and they are looked
+    up on every load.
+    """
+    try:
+        cache = pickle.loads(Path(cache_file).read_bytes())
+        if _cache_valid(cache, fname):
+            _LOGGER.debug("Loaded %s from cache", fname)
+            if cache["references"]:
+                return _resolve_references(cache["result"])
+            return cache["result"]
+    except FileNotFoundError:
+        pass
+    except HomeAssistantError:
+        raise
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Unable to read YAML cache %s: %s", cache_file, err)
+
+    deps = _Dependencies()
+    token = _DEPENDENCIES.set(deps)
+    try:
+        result = load_yaml(fname)
+    finally:
+        _DEPENDENCIES.reset(token)
+
+    if not deps.cacheable:
+        return _resolve_references(result) if deps.references else result
+
+    cache = {
+        "version": CACHE_VERSION,
+        "fname": fname,
+        "files": deps.files,
+        "dirs": deps.dirs,
+        "env": deps.env,
+        "references": deps.references,
+        "result": result,
+    }
+    tmp_filename = ""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(cache_file), delete=False
+        ) as fil:
+            tmp_filename = fil.name
+            pickle.dump(cache, fil, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filename, cache_file)
+    except (OSError, pickle.PicklingError) as err:
+        _LOGGER.warning("Unable to write YAML cache %s: %s", cache_file, err)
+        if tmp_filename and os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+    # The cache has a copy of the result now, which callers are free to change
+    return _resolve_references(result) if deps.references else result
+
 
 def clear_secret_cache() -> None:
     """Clear the secret cache.
@@ -52,13 +312,37 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+class FastSafeLoader(FastestAvailableSafeLoader):
+    """Loader class based on libyaml if it is available.
+
+    The nodes built by libyaml have marks with the line they start at, which
+    is all the constructors need to annotate the loaded objects.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the loader."""
+        super().__init__(stream)
+        # The C parser does not expose these, the constructors need them
+        self.name = getattr(stream, "name", "<file>")
+        self.stream = stream
+
+
+LoaderType = Union[SafeLineLoader, FastSafeLoader]  # pylint: disable=invalid-name
+
+
 def load_yaml(fname: str) -> JSON_TYPE:
     """Load a YAML file."""
     try:
         with open(fname, encoding="utf-8") as conf_file:
-            # If configuration file is empty YAML returns None
-            # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+            deps = _DEPENDENCIES.get()
+            if deps is None:
+                return _parse_yaml(conf_file)
+            # Hash the content that is parsed instead of reading it again
+            content = conf_file.read()
+            _track_file(deps, fname, content)
+        stream = StringIO(content)
+        stream.name = fname
+        return _parse_yaml(stream)
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc) from exc
@@ -67,28 +351,40 @@ def load_yaml(fname: str) -> JSON_TYPE:
         raise HomeAssistantError(exc) from exc
 
 
+def _parse_yaml(stream: TextIO) -> JSON_TYPE:
+    """Parse a YAML stream with the fastest loader available."""
+    try:
+        # If configuration file is empty YAML returns None
+        # We convert that to an empty dict
+        return yaml.load(stream, Loader=FastSafeLoader) or OrderedDict()
+    except yaml.YAMLError:
+        if not HAS_C_LOADER:
+            raise
+    # Parse again to report the error the same way as without libyaml
+    stream.seek(0)
+    return yaml.load(stream, Loader=SafeLineLoader) or OrderedDict()
+
+
 @overload
 def _add_reference(
-    obj: Union[list, NodeListClass], loader: yaml.SafeLoader, node: yaml.nodes.Node
+    obj: Union[list, NodeListClass], loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeListClass:
     ...
 
 
 @overload
 def _add_reference(
-    obj: Union[str, NodeStrClass], loader: yaml.SafeLoader, node: yaml.nodes.Node
+    obj: Union[str, NodeStrClass], loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeStrClass:
     ...
 
 
 @overload
-def _add_reference(
-    obj: DICT_T, loader: yaml.SafeLoader, node: yaml.nodes.Node
-) -> DICT_T:
+def _add_reference(obj: DICT_T, loader: LoaderType, node: yaml.nodes.Node) -> DICT_T:
     ...
 
 
-def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type: ignore
+def _add_reference(obj, loader: LoaderType, node: yaml.nodes.Node):  # type: ignore
     """Add file reference information to an object."""
     if isinstance(obj, list):
         obj = NodeListClass(obj)
@@ -99,7 +395,7 @@ def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type:
     return obj
 
 
-def _include_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load another YAML file and embeds it using the !include tag.
 
     Example:
@@ -122,7 +418,10 @@ def _is_file_valid(name: str) -> bool:
 
 def _find_files(directory: str, pattern: str) -> Iterator[str]:
     """Recursively load files in a directory."""
+    if not os.path.isdir(directory):
+        _track_dir(directory)
     for root, dirs, files in os.walk(directory, topdown=True):
+        _track_dir(root)
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in sorted(files):
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -130,9 +429,7 @@ def _find_files(directory: str, pattern: str) -> Iterator[str]:
                 yield filename
 
 
-def _include_dir_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
-) -> OrderedDict:
+def _include_dir_named_yaml(loader: LoaderType, node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
     mapping: OrderedDict = OrderedDict()
     loc = os.path.join(os.path.dirname(loader.name), node.value)
@@ -145,7 +442,7 @@ def _include_dir_named_yaml(
 
 
 def _include_dir_merge_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> OrderedDict:
     """Load multiple files from directory as a merged dictionary."""
     mapping: OrderedDict = OrderedDict()
@@ -160,7 +457,7 @@ def _include_dir_merge_named_yaml(
 
 
 def _include_dir_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> List[JSON_TYPE]:
     """Load multiple files from directory as a list."""
     loc = os.path.join(os.path.dirname(loader.name), node.value)
@@ -172,7 +469,7 @@ def _include_dir_list_yaml(
 
 
 def _include_dir_merge_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> JSON_TYPE:
     """Load multiple files from directory as a merged list."""
     loc: str = os.path.join(os.path.dirname(loader.name), node.value)
@@ -186,7 +483,7 @@ def _include_dir_merge_list_yaml(
     return _add_reference(merged_list, loader, node)
 
 
-def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> OrderedDict:
+def _ordered_dict(loader: LoaderType, node: yaml.nodes.MappingNode) -> OrderedDict:
     """Load YAML mappings into an ordered dictionary to preserve key order."""
     loader.flatten_mapping(node)
     nodes = loader.construct_pairs(node)
@@ -218,23 +515,35 @@ def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> Order
     return _add_reference(OrderedDict(nodes), loader, node)
 
 
-def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _construct_seq(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Add line number and file name to Load YAML sequence."""
     (obj,) = loader.construct_yaml_seq(node)
     return _add_reference(obj, loader, node)
 
 
-def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
+def _env_var_yaml(loader: LoaderType, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
-    args = node.value.split()
+    deps = _DEPENDENCIES.get()
+    if deps is not None:
+        # Keep the values out of the cache, they are resolved after the load
+        name = node.value.split()[0]
+        deps.env[name] = _env_signature(name)
+        deps.references = True
+        return _EnvReference(node.value)  # type: ignore
+    return _env_var(node.value)
+
+
+def _env_var(value: str) -> str:
+    """Return the value of an environment variable or the default."""
+    args = value.split()
 
     # Check for a default value
     if len(args) > 1:
         return os.getenv(args[0], " ".join(args[1:]))
     if args[0] in os.environ:
         return os.environ[args[0]]
-    _LOGGER.error("Environment variable %s not defined", node.value)
-    raise HomeAssistantError(node.value)
+    _LOGGER.error("Environment variable %s not defined", value)
+    raise HomeAssistantError(value)
 
 
 def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
@@ -264,19 +573,30 @@ def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
     return secrets
 
 
-def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def secret_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load secrets and embed it into the configuration YAML."""
-    secret_path = os.path.dirname(loader.name)
+    deps = _DEPENDENCIES.get()
+    if deps is not None:
+        # Keep secrets out of the cache, they are resolved after the load
+        deps.references = True
+        return _SecretReference(  # type: ignore
+            os.path.dirname(loader.name), node.value
+        )
+    return _load_secret(os.path.dirname(loader.name), node.value)
+
+
+def _load_secret(secret_path: str, name: str) -> JSON_TYPE:
+    """Load a secret from the secrets.yaml files, keyring or credstash."""
     while True:
-        secrets = _load_secret_yaml(secret_path)
+        secrets = cast(Dict[str, JSON_TYPE], _load_secret_yaml(secret_path))
 
-        if node.value in secrets:
+        if name in secrets:
             _LOGGER.debug(
                 "Secret %s retrieved from secrets.yaml in folder %s",
-                node.value,
+                name,
                 secret_path,
             )
-            return secrets[node.value]
+            return secrets[name]
 
         if secret_path == os.path.dirname(sys.path[0]):
             break  # sys.path[0] set to config/deps folder by bootstrap
@@ -287,9 +607,9 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
 
     if keyring:
         # do some keyring stuff
-        pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
+        pwd = keyring.get_password(_SECRET_NAMESPACE, name)
         if pwd:
-            _LOGGER.debug("Secret %s retrieved from keyring", node.value)
+            _LOGGER.debug("Secret %s retrieved from keyring", name)
             return pwd
 
     global credstash  # pylint: disable=invalid-name, global-statement
@@ -297,9 +617,9 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
     if credstash:
         # pylint: disable=no-member
         try:
-            pwd = credstash.getSecret(node.value, table=_SECRET_NAMESPACE)
+            pwd = credstash.getSecret(name, table=_SECRET_NAMESPACE)
             if pwd:
-                _LOGGER.debug("Secret %s retrieved from credstash", node.value)
+                _LOGGER.debug("Secret %s retrieved from credstash", name)
                 return pwd
         except credstash.ItemNotFound:
             pass
@@ -307,21 +627,20 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
             # Catch if package installed and no config
             credstash = None
 
-    raise HomeAssistantError(f"Secret {node.value} not defined")
-
-
-yaml.SafeLoader.add_constructor("!include", _include_yaml)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
-)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
-)
-yaml.SafeLoader.add_constructor("!env_var", _env_var_yaml)
-yaml.SafeLoader.add_constructor("!secret", secret_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_list", _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor("!include_dir_named", _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor(
-    "!include_dir_merge_named", _include_dir_merge_named_yaml
-)
+    raise HomeAssistantError(f"Secret {name} not defined")
+
+
+for _loader in (yaml.SafeLoader, FastSafeLoader):
+    _loader.add_constructor("!include", _include_yaml)
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
+    )
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
+    )
+    _loader.add_constructor("!env_var", _env_var_yaml)
+    _loader.add_constructor("!secret", secret_yaml)
+    _loader.add_constructor("!include_dir_list", _include_dir_list_yaml)
+    _loader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
+    _loader.add_constructor("!include_dir_named", _include_dir_named_yaml)
+    _loader.add_constructor("!include_dir_merge_named", _include_dir_merge_named_yaml)
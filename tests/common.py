@@ -117,6 +117,10 @@ def get_test_home_assistant():
     asyncio.set_event_loop(loop)
     hass = loop.run_until_complete(async_test_home_assistant(loop))
 
+    # Keep the stores of the instance out of the test config dir
+    storage = mock_storage()
+    storage.__enter__()
+
     stop_event = threading.Event()
 
     def run_loop():
@@ -137,6 +141,7 @@ def get_test_home_assistant():
         orig_stop()
         stop_event.wait()
         loop.close()
+        storage.__exit__(None, None, None)
 
     hass.start = start_hass
     hass.stop = stop_hass
@@ -807,7 +812,7 @@ def mock_restore_cache(hass, states):
 
     last_states = {}
     for state in states:
-        restored_state = state.as_dict()
+        restored_state = dict(state.as_dict())
         restored_state["attributes"] = json.loads(
             json.dumps(restored_state["attributes"], cls=JSONEncoder)
         )
@@ -1,8 +1,13 @@
 """Test report state."""
+import asyncio
+
 from homeassistant.components.alexa import state_report
 
 from . import DEFAULT_CONFIG, TEST_URL
 
+from tests.async_mock import patch
+from tests.test_util.aiohttp import AiohttpClientMockResponse
+
 
 async def test_report_state(hass, aioclient_mock):
     """Test proactive state reports."""
@@ -171,3 +176,162 @@ async def test_doorbell_event(hass, aioclient_mock):
     assert call_json["event"]["header"]["name"] == "DoorbellPress"
     assert call_json["event"]["payload"]["cause"]["type"] == "PHYSICAL_INTERACTION"
     assert call_json["event"]["endpoint"]["endpointId"] == "binary_sensor#test_doorbell"
+
+
+async def test_report_state_coalesced(hass, aioclient_mock):
+    """Test change reports are deduplicated per entity."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    for idx in range(3):
+        hass.states.async_set(
+            f"binary_sensor.test_contact_{idx}",
+            "on",
+            {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+        )
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+    for state in ("off", "on", "off"):
+        for idx in range(3):
+            hass.states.async_set(
+                f"binary_sensor.test_contact_{idx}",
+                state,
+                {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+            )
+
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 3
+    assert sorted(
+        call[2]["event"]["endpoint"]["endpointId"] for call in aioclient_mock.mock_calls
+    ) == [f"binary_sensor#test_contact_{idx}" for idx in range(3)]
+    for call in aioclient_mock.mock_calls:
+        assert (
+            call[2]["event"]["payload"]["change"]["properties"][0]["value"]
+            == "NOT_DETECTED"
+        )
+
+    # Changes that do not change the reported properties are not reported
+    hass.states.async_set(
+        "binary_sensor.test_contact_0",
+        "off",
+        {"friendly_name": "Renamed Contact Sensor", "device_class": "door"},
+    )
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 3
+
+
+async def test_report_state_concurrency(hass, aioclient_mock):
+    """Test the number of change reports sent at the same time is limited."""
+    release = asyncio.Event()
+    active = 0
+    max_active = 0
+
+    async def slow_endpoint(method, url, data):
+        """Respond after the test releases the requests."""
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await release.wait()
+        active -= 1
+        return AiohttpClientMockResponse(method, url, status=202, text="")
+
+    aioclient_mock.post(TEST_URL, side_effect=slow_endpoint)
+
+    for idx in range(5):
+        hass.states.async_set(
+            f"binary_sensor.test_contact_{idx}",
+            "on",
+            {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+        )
+
+    with patch.object(state_report, "MAX_CONCURRENT_REPORTS", 2):
+        await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+        for idx in range(5):
+            hass.states.async_set(
+                f"binary_sensor.test_contact_{idx}",
+                "off",
+                {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+            )
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert active == 2
+
+        release.set()
+        await hass.async_block_till_done()
+
+    assert max_active == 2
+    assert len(aioclient_mock.mock_calls) == 5
+
+
+async def test_report_state_failed(hass, aioclient_mock):
+    """Test properties are only remembered once Alexa accepted the report."""
+    aioclient_mock.post(
+        TEST_URL,
+        json={"payload": {"code": "INTERNAL_ERROR", "description": "Failed"}},
+        status=500,
+    )
+
+    hass.states.async_set(
+        "binary_sensor.test_contact",
+        "on",
+        {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+    )
+
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+    hass.states.async_set(
+        "binary_sensor.test_contact",
+        "off",
+        {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+    )
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 1
+
+    hass.states.async_set(
+        "binary_sensor.test_contact",
+        "off",
+        {"friendly_name": "Renamed Contact Sensor", "device_class": "door"},
+    )
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 2
+
+
+async def test_report_state_worker_error(hass, aioclient_mock):
+    """Test an error sending a report does not leave reports queued."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    for idx in range(2):
+        hass.states.async_set(
+            f"binary_sensor.test_contact_{idx}",
+            "on",
+            {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+        )
+
+    with patch.object(state_report, "MAX_CONCURRENT_REPORTS", 1):
+        await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+        with patch.object(
+            DEFAULT_CONFIG,
+            "async_get_access_token",
+            side_effect=[Exception("Boom"), "thisisnotanacesstoken"],
+        ):
+            for idx in range(2):
+                hass.states.async_set(
+                    f"binary_sensor.test_contact_{idx}",
+                    "off",
+                    {"friendly_name": "Test Contact Sensor", "device_class": "door"},
+                )
+            await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 1
+    assert (
+        aioclient_mock.mock_calls[0][2]["event"]["endpoint"]["endpointId"]
+        == "binary_sensor#test_contact_1"
+    )
@@ -3,7 +3,10 @@ import pytest
 
 from homeassistant.components.cloud import GACTIONS_SCHEMA
 from homeassistant.components.cloud.google_config import CloudGoogleConfig
-from homeassistant.components.google_assistant import helpers as ga_helpers
+from homeassistant.components.google_assistant import (
+    helpers as ga_helpers,
+    report_state as ga_report_state,
+)
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, HTTP_NOT_FOUND
 from homeassistant.core import CoreState, State
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
@@ -191,3 +194,15 @@ async def test_google_config_expose_entity_prefs(mock_conf, cloud_prefs):
         google_default_expose=["sensor"],
     )
     assert not mock_conf.should_expose(state)
+
+
+async def test_google_report_state_payload_stats(mock_conf, hass):
+    """Test the size of the accepted state reports is recorded."""
+    message = {"devices": {"states": {"light.kitchen": {"on": True}}}}
+    mock_conf._cloud.google_report_state.async_send_message = AsyncMock()
+
+    assert await mock_conf.async_report_state(message, "mock-user-id")
+
+    stats = ga_report_state.async_get_report_state_stats(hass).as_dict()
+    assert stats["payload_bytes"] > 0
+    assert stats["max_payload_bytes"] == stats["payload_bytes"]
@@ -9,7 +9,7 @@ from tests.async_mock import patch
 @pytest.fixture(autouse=True)
 def mock_ssdp():
     """Mock ssdp."""
-    with patch("homeassistant.components.ssdp.Scanner.async_scan"):
+    with patch("homeassistant.components.ssdp.Scanner.async_start"):
         yield
 
 
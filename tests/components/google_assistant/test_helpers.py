@@ -220,7 +220,7 @@ async def test_report_state_all(agents):
     """Test a disconnect message."""
     config = MockConfig(agent_user_ids=agents)
     data = {}
-    with patch.object(config, "async_report_state") as mock:
+    with patch.object(config, "async_report_state", return_value=True) as mock:
         await config.async_report_state_all(data)
         assert sorted(mock.mock_calls) == sorted(
             [call(data, agent) for agent in agents]
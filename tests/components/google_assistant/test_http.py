@@ -1,5 +1,6 @@
 """Test Google http services."""
 from datetime import datetime, timedelta, timezone
+import json
 
 from homeassistant.components.google_assistant import GOOGLE_ASSISTANT_SCHEMA
 from homeassistant.components.google_assistant.const import (
@@ -11,6 +12,10 @@ from homeassistant.components.google_assistant.http import (
     _get_homegraph_jwt,
     _get_homegraph_token,
 )
+from homeassistant.components.google_assistant.report_state import (
+    async_get_report_state_stats,
+)
+from homeassistant.const import HTTP_INTERNAL_SERVER_ERROR, HTTP_OK
 
 from tests.async_mock import ANY, patch
 
@@ -154,9 +159,23 @@ async def test_report_state(hass, aioclient_mock, hass_storage):
     await config.async_connect_agent_user(agent_user_id)
     message = {"devices": {}}
 
-    with patch.object(config, "async_call_homegraph_api") as mock_call:
-        await config.async_report_state(message, agent_user_id)
-        mock_call.assert_called_once_with(
-            REPORT_STATE_BASE_URL,
-            {"requestId": ANY, "agentUserId": agent_user_id, "payload": message},
-        )
+    with patch.object(
+        config, "async_call_homegraph_api", return_value=HTTP_OK
+    ) as mock_call:
+        assert await config.async_report_state(message, agent_user_id)
+        mock_call.assert_called_once_with(REPORT_STATE_BASE_URL, ANY)
+
+    body = mock_call.mock_calls[0][1][1]
+    assert json.loads(body) == {
+        "requestId": ANY,
+        "agentUserId": agent_user_id,
+        "payload": message,
+    }
+    stats = async_get_report_state_stats(hass).as_dict()
+    assert stats["max_payload_bytes"] == stats["average_payload_bytes"] == len(body)
+
+    with patch.object(
+        config, "async_call_homegraph_api", return_value=HTTP_INTERNAL_SERVER_ERROR
+    ):
+        assert not await config.async_report_state(message, agent_user_id)
+    assert async_get_report_state_stats(hass).payloads == 1
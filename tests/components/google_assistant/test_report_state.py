@@ -1,11 +1,13 @@
 """Test Google report state."""
+from datetime import timedelta
+
 from homeassistant.components.google_assistant import error, report_state
 from homeassistant.util.dt import utcnow
 
 from . import BASIC_CONFIG
 
 from tests.async_mock import AsyncMock, patch
-from tests.common import async_fire_time_changed
+from tests.common import async_fire_time_changed, get_system_health_info
 
 
 async def test_report_state(hass, caplog, legacy_patchable_time):
@@ -14,7 +16,7 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     hass.states.async_set("switch.ac", "on")
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
     ) as mock_report, patch.object(report_state, "INITIAL_REPORT_DELAY", 0):
         unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
 
@@ -33,10 +35,14 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     }
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
     ) as mock_report:
         hass.states.async_set("light.kitchen", "on")
         await hass.async_block_till_done()
+        assert len(mock_report.mock_calls) == 0
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 1
     assert mock_report.mock_calls[0][1][0] == {
@@ -46,23 +52,25 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     # Test that state changes that change something that Google doesn't care about
     # do not trigger a state report.
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
     ) as mock_report:
         hass.states.async_set(
             "light.kitchen", "on", {"irrelevant": "should_be_ignored"}
         )
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
         await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 0
 
     # Test that entities that we can't query don't report a state
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
     ) as mock_report, patch(
         "homeassistant.components.google_assistant.report_state.GoogleEntity.query_serialize",
         side_effect=error.SmartHomeError("mock-error", "mock-msg"),
     ):
         hass.states.async_set("light.kitchen", "off")
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
         await hass.async_block_till_done()
 
     assert "Not reporting state for light.kitchen: mock-error"
@@ -71,9 +79,120 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     unsub()
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
     ) as mock_report:
         hass.states.async_set("light.kitchen", "on")
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
         await hass.async_block_till_done()
 
     assert len(mock_report.mock_calls) == 0
+
+
+async def test_report_state_batched(hass, legacy_patchable_time):
+    """Test state changes are coalesced into one report."""
+    hass.states.async_set("light.ceiling", "off")
+    hass.states.async_set("switch.ac", "on")
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
+    ) as mock_report, patch.object(report_state, "INITIAL_REPORT_DELAY", 0):
+        unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
+
+        async_fire_time_changed(hass, utcnow())
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 1
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
+    ) as mock_report:
+        hass.states.async_set("light.ceiling", "on")
+        hass.states.async_set("switch.ac", "off")
+        hass.states.async_set("light.ceiling", "off")
+        hass.states.async_set("light.ceiling", "on")
+        await hass.async_block_till_done()
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+        # Changing back to the reported state does not report again
+        hass.states.async_set("switch.ac", "on")
+        hass.states.async_set("switch.ac", "off")
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 1
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {
+            "states": {
+                "light.ceiling": {"on": True, "online": True},
+                "switch.ac": {"on": False, "online": True},
+            }
+        }
+    }
+
+    stats = report_state.async_get_report_state_stats(hass).as_dict()
+    assert stats["reports"] == 2
+    assert stats["reports_per_minute"] == 2
+    assert stats["entities_reported"] == 4
+
+    info = await get_system_health_info(hass, "google_assistant")
+    assert info == stats
+
+    unsub()
+
+
+async def test_report_state_failed(hass, legacy_patchable_time):
+    """Test states are reported again when a report was not accepted."""
+    hass.states.async_set("light.ceiling", "off")
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=False)
+    ) as mock_report, patch.object(report_state, "INITIAL_REPORT_DELAY", 0):
+        unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
+        async_fire_time_changed(hass, utcnow())
+        await hass.async_block_till_done()
+
+        hass.states.async_set("light.ceiling", "on")
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 2
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value=True)
+    ) as mock_report:
+        # Changing back to the state that failed to report is reported
+        hass.states.async_set("light.ceiling", "off")
+        hass.states.async_set("light.ceiling", "on")
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+    assert len(mock_report.mock_calls) == 1
+    assert mock_report.mock_calls[0][1][0] == {
+        "devices": {"states": {"light.ceiling": {"on": True, "online": True}}}
+    }
+    assert report_state.async_get_report_state_stats(hass).reports == 1
+
+    unsub()
+
+
+async def test_report_state_stats_prune():
+    """Test reports outside the rate period are forgotten when recording."""
+    stats = report_state.ReportStateStats()
+    message = {"devices": {"states": {"light.ceiling": {"on": True}}}}
+
+    with patch("time.monotonic", return_value=0):
+        for _ in range(5):
+            stats.async_record(message)
+
+    assert len(stats._report_times) == 5
+
+    with patch("time.monotonic", return_value=report_state.REPORT_RATE_PERIOD + 1):
+        stats.async_record(message)
+
+    assert len(stats._report_times) == 1
+    assert stats.reports == 6
+    assert stats.entities_reported == 6
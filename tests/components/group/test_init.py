@@ -6,6 +6,7 @@ import unittest
 import homeassistant.components.group as group
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     EVENT_HOMEASSISTANT_START,
@@ -965,3 +966,67 @@ async def test_switch_removed(hass):
     await hass.async_block_till_done()
 
     assert hass.states.get("group.group_zero").state == "off"
+
+
+async def test_expand_entity_ids_cache(hass):
+    """Test cached expansions follow changes to the members of nested groups."""
+    hass.states.async_set("group.inner", "on", {ATTR_ENTITY_ID: ["light.one"]})
+    hass.states.async_set(
+        "group.outer", "on", {ATTR_ENTITY_ID: ["group.inner", "switch.one"]}
+    )
+
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.one",
+        "switch.one",
+    ]
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.one",
+        "switch.one",
+    ]
+
+    hass.states.async_set(
+        "group.inner", "on", {ATTR_ENTITY_ID: ["light.one", "light.two"]}
+    )
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.one",
+        "light.two",
+        "switch.one",
+    ]
+
+    hass.states.async_remove("group.inner")
+    assert group.expand_entity_ids(hass, ["group.outer"]) == ["switch.one"]
+
+
+async def test_all_mode_counts_members(hass):
+    """Test a group in all mode only turns on when every member is on."""
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("light.two", "off", {ATTR_ASSUMED_STATE: True})
+
+    assert await async_setup_component(hass, "light", {})
+    assert await async_setup_component(
+        hass,
+        "group",
+        {"group": {"group_zero": {"all": "true", "entities": "light.one, light.two"}}},
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("group.group_zero")
+    assert state.state == "off"
+    assert not state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_set("light.two", "on", {ATTR_ASSUMED_STATE: True})
+    await hass.async_block_till_done()
+    state = hass.states.get("group.group_zero")
+    assert state.state == "on"
+    assert state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_set("light.one", "off", {ATTR_ASSUMED_STATE: True})
+    hass.states.async_set("light.one", "off")
+    await hass.async_block_till_done()
+    state = hass.states.get("group.group_zero")
+    assert state.state == "off"
+    assert not state.attributes.get(ATTR_ASSUMED_STATE)
+
+    hass.states.async_set("light.one", "on")
+    await hass.async_block_till_done()
+    assert hass.states.get("group.group_zero").state == "on"
@@ -152,6 +152,68 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    @patch(
+        "homeassistant.helpers.template.TemplateEnvironment.is_safe_callable",
+        return_value=True,
+    )
+    def test_measure_incremental(self, mock):
+        """Test the history is only queried once and then kept up to date."""
+        now = dt_util.utcnow()
+        t0 = now - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+        t2 = now - timedelta(minutes=10)
+        t3 = now - timedelta(minutes=5)
+
+        # Start     t0        t1        t2        t3        End
+        # |--20min--|--20min--|--10min--|--5min---|--5min---|
+        # |---off---|---on----|---off---|---on----|---off---|
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+                ha.State("binary_sensor.test_id", "on", last_changed=t2),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as mock_history, patch("homeassistant.util.dt.now") as mock_now:
+            mock_now.return_value = now + timedelta(minutes=1)
+            sensor.update()
+
+            assert mock_history.call_count == 1
+            assert sensor.state == 0.5
+
+            # A state change while the sensor is running
+            sensor._live_changes.append((t3.timestamp(), False))
+            mock_now.return_value = now + timedelta(minutes=2)
+            sensor.update()
+
+            assert sensor.state == round(25 / 60, 2)
+            assert sensor.count == 2
+
+            # The window slides past t0
+            mock_now.return_value = now + timedelta(minutes=35)
+            sensor.update()
+
+            assert sensor.state == round(10 / 60, 2)
+            assert sensor.count == 2
+
+            # The window moves back before the known history
+            mock_now.return_value = now - timedelta(minutes=10)
+            sensor.update()
+
+        assert mock_history.call_count == 2
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
@@ -0,0 +1,279 @@
+"""The tests for the InfluxDB batching writer."""
+import asyncio
+import datetime
+import gzip
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import homeassistant.components.influxdb as influxdb
+from homeassistant.components.influxdb.writer import get_write_request, point_to_line
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.setup import async_setup_component
+
+from tests.async_mock import MagicMock, patch
+from tests.common import get_system_health_info
+
+INFLUX_PATH = "homeassistant.components.influxdb"
+
+
+class FakeInflux:
+    """Record the line protocol written to a local HTTP server."""
+
+    def __init__(self):
+        """Start the server."""
+        self.requests = []
+        self.lines = []
+        self.statuses = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Handle write requests."""
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Record a write request."""
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                url = urlparse(self.path)
+                fake.requests.append((url.path, parse_qs(url.query), self.headers))
+                status = fake.statuses.pop(0) if fake.statuses else 204
+                if status == 204:
+                    fake.lines.extend(body.decode().split("\n"))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                """Do not log requests."""
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+@pytest.fixture(name="fake_influx")
+def fake_influx_fixture():
+    """Run a fake InfluxDB server."""
+    fake = FakeInflux()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture(name="setup_writer")
+def setup_writer_fixture(hass, fake_influx):
+    """Set up the component with the batch writer."""
+    hass.bus.listen = MagicMock()
+    writers = []
+
+    async def setup(batch_config=None, config_ext=None):
+        config = {
+            "influxdb": {
+                "host": "127.0.0.1",
+                "port": fake_influx.port,
+                "database": "db",
+                "batch": batch_config,
+            }
+        }
+        config["influxdb"].update(config_ext or {})
+        with patch(f"{INFLUX_PATH}.InfluxDBClient"):
+            assert await async_setup_component(hass, influxdb.DOMAIN, config)
+            await hass.async_block_till_done()
+
+        writer = hass.data[influxdb.DOMAIN]
+        writers.append(writer)
+        assert hass.bus.listen.call_args_list[0][0][0] == EVENT_STATE_CHANGED
+        return writer, hass.bus.listen.call_args_list[0][0][1]
+
+    yield setup
+
+    for writer in writers:
+        writer.stop()
+
+
+def _event(entity_id, state, time_fired):
+    """Return a state changed event."""
+    domain, object_id = entity_id.split(".")
+    state = MagicMock(
+        state=state,
+        domain=domain,
+        entity_id=entity_id,
+        object_id=object_id,
+        attributes={},
+    )
+    return MagicMock(data={"new_state": state}, time_fired=time_fired)
+
+
+def test_point_to_line():
+    """Test serializing points to line protocol."""
+    point = {
+        "measurement": "my measurement,1",
+        "tags": {"domain": "sensor", "entity id": "a=b", "empty": ""},
+        "time": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        "fields": {
+            "value": 1.5,
+            "count": 3,
+            "on": True,
+            "state": 'say "hi"\\',
+            "inf": float("inf"),
+        },
+    }
+
+    assert point_to_line(point) == (
+        r"my\ measurement\,1,domain=sensor,entity\ id=a\=b "
+        r'value=1.5,count=3i,on=true,state="say \"hi\"\\" '
+        "1577836800000000000"
+    )
+    assert point_to_line(point, "s").endswith(" 1577836800")
+    assert point_to_line(point, "ms").endswith(" 1577836800000")
+
+    point["fields"] = {"inf": float("nan")}
+    assert point_to_line(point) == ""
+
+
+def test_get_write_request():
+    """Test the write request for both API versions."""
+    url, params, headers = get_write_request(
+        influxdb.INFLUX_SCHEMA(
+            {"host": "host", "path": "/influx", "username": "u", "password": "p"}
+        )
+    )
+    assert url == "http://host:8086/influx/write"
+    assert params == {"db": "home_assistant", "u": "u", "p": "p"}
+    assert "Authorization" not in headers
+
+    url, params, headers = get_write_request(
+        influxdb.INFLUX_SCHEMA(
+            {
+                "api_version": "2",
+                "host": "host",
+                "organization": "org",
+                "token": "token",
+                "precision": "s",
+            }
+        )
+    )
+    assert url == "https://host/api/v2/write"
+    assert params == {"org": "org", "bucket": "Home Assistant", "precision": "s"}
+    assert headers["Authorization"] == "Token token"
+
+
+async def test_batch_writer(hass, fake_influx, setup_writer):
+    """Test events are written in batches."""
+    writer, handler_method = await setup_writer({"max_points": 2})
+
+    for idx in range(5):
+        handler_method(_event("sensor.temp", str(idx), 1577836800 + idx))
+    await hass.async_add_executor_job(writer.block_till_done)
+
+    assert len(fake_influx.requests) == 3
+    path, params, headers = fake_influx.requests[0]
+    assert path == "/write"
+    assert params == {"db": ["db"]}
+    assert headers["Content-Encoding"] == "gzip"
+    assert sorted(fake_influx.lines) == [
+        f"sensor.temp,domain=sensor,entity_id=temp value={idx}.0 "
+        f"{1577836800 + idx}000000000"
+        for idx in range(5)
+    ]
+
+    stats = writer.stats
+    assert stats["events"] == 5
+    assert stats["points_written"] == 5
+    assert stats["batches_written"] == 3
+    assert stats["queued_events"] == stats["retry_points"] == 0
+    assert stats["write_errors"] == 0
+
+    assert await get_system_health_info(hass, influxdb.DOMAIN) == writer.stats
+
+
+async def test_batch_writer_max_bytes(hass, fake_influx, setup_writer):
+    """Test the batch size is counted in encoded bytes."""
+    writer, handler_method = await setup_writer({"max_bytes": 150, "gzip": False})
+
+    # Each line is about 110 characters but 160 bytes
+    for idx in range(2):
+        handler_method(_event("sensor.temp", "µ" * 50, 1577836800 + idx))
+    await hass.async_add_executor_job(writer.block_till_done)
+
+    assert len(fake_influx.requests) == 2
+    assert writer.stats["bytes_written"] == sum(
+        len(line.encode()) for line in fake_influx.lines
+    )
+
+
+async def test_batch_writer_flush_interval(hass, fake_influx, setup_writer):
+    """Test a partial batch is written after the flush interval."""
+    writer, handler_method = await setup_writer({"flush_interval": 0.01, "gzip": False})
+
+    handler_method(_event("sensor.temp", "1", 1577836800))
+    for _ in range(100):
+        if writer.stats["points_written"]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(fake_influx.requests) == 1
+    assert "Content-Encoding" not in fake_influx.requests[0][2]
+    assert writer.stats["points_written"] == 1
+
+
+async def test_batch_writer_retry(hass, fake_influx, setup_writer, caplog):
+    """Test failed batches are retried and dropped when the buffer is full."""
+    writer, handler_method = await setup_writer(
+        {"max_points": 2, "retry_buffer": 3, "connections": 1}
+    )
+
+    fake_influx.statuses = [500, 500, 500]
+    with patch(f"{INFLUX_PATH}.writer.RETRY_DELAY", 3600):
+        for idx in range(6):
+            handler_method(_event("sensor.temp", str(idx), 1577836800 + idx))
+        await hass.async_add_executor_job(writer.block_till_done)
+
+    assert fake_influx.lines == []
+    assert writer.stats["points_dropped"] == 4
+    assert writer.stats["retry_points"] == 2
+    assert writer.stats["write_errors"] == 3
+    assert "Retry buffer full, dropped 2 points." in caplog.text
+
+    # The remaining batch is retried once the delay has passed
+    writer._retry_at = 0
+    handler_method(_event("sensor.temp", "6", 1577836806))
+    await hass.async_add_executor_job(writer.block_till_done)
+    await hass.async_add_executor_job(writer._batches.join)
+    for _ in range(100):
+        if len(fake_influx.lines) == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert sorted(fake_influx.lines) == [
+        f"sensor.temp,domain=sensor,entity_id=temp value={idx}.0 "
+        f"{1577836800 + idx}000000000"
+        for idx in (4, 5, 6)
+    ]
+    assert writer.stats["retry_points"] == 0
+    assert writer.stats["points_dropped"] == 4
+    assert writer.stats["write_errors"] == 3
+    assert "Resumed, lost 4 events." in caplog.text
+
+
+async def test_batch_writer_invalid_inputs(hass, fake_influx, setup_writer, caplog):
+    """Test batches rejected by InfluxDB are not retried."""
+    writer, handler_method = await setup_writer()
+
+    fake_influx.statuses = [400]
+    handler_method(_event("sensor.temp", "1", 1577836800))
+    await hass.async_add_executor_job(writer.block_till_done)
+
+    assert len(fake_influx.requests) == 1
+    assert writer.stats["retry_points"] == 0
+    assert writer.stats["write_errors"] == 1
+    assert "Could not write '1 points' to influx" in caplog.text
@@ -32,9 +32,11 @@ class FilterTest:
     should_pass: bool
 
 
-async def prometheus_client(hass, hass_client):
+async def prometheus_client(hass, hass_client, config=None):
     """Initialize an hass_client with Prometheus component."""
-    await async_setup_component(hass, prometheus.DOMAIN, {prometheus.DOMAIN: {}})
+    await async_setup_component(
+        hass, prometheus.DOMAIN, {prometheus.DOMAIN: config or {}}
+    )
 
     await async_setup_component(hass, sensor.DOMAIN, {"sensor": [{"platform": "demo"}]})
 
@@ -202,6 +204,71 @@ async def test_view(hass, hass_client):
     )
 
 
+async def test_view_collect_on_scrape(hass, hass_client):
+    """Test prometheus metrics view collecting the states when scraped."""
+    client = await prometheus_client(
+        hass, hass_client, {"namespace": "scrape", "collect_on_scrape": True}
+    )
+
+    hass.states.async_set(
+        "sensor.outside_temperature",
+        "17.2",
+        {"unit_of_measurement": "°C", "friendly_name": "Outside Temperature"},
+    )
+    hass.states.async_set(
+        "sensor.outside_temperature",
+        "18.3",
+        {"unit_of_measurement": "°C", "friendly_name": "Outside Temperature"},
+    )
+    await hass.async_block_till_done()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+
+    assert resp.status == 200
+    body = (await resp.text()).split("\n")
+
+    assert (
+        'scrape_sensor_unit_c{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside Temperature"} 18.3' in body
+    )
+
+    assert (
+        'scrape_current_temperature_c{domain="climate",'
+        'entity="climate.heatpump",'
+        'friendly_name="HeatPump"} 25.0' in body
+    )
+
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside Temperature"} 3.0' in body
+    )
+
+    assert (
+        'scrape_last_updated_time_seconds{domain="sensor",'
+        'entity="sensor.radio_energy",'
+        'friendly_name="Radio Energy"} 86400.0' in body
+    )
+
+    # State changes are only counted once
+    with mock.patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor:
+        resp = await client.get(prometheus.API_ENDPOINT)
+        body = (await resp.text()).split("\n")
+
+    # The states are collected in the executor
+    assert len(mock_executor.mock_calls) == 1
+    assert mock_executor.mock_calls[0][1][0].__name__ == "_collect"
+
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside_temperature",'
+        'friendly_name="Outside Temperature"} 3.0' in body
+    )
+
+
 @pytest.fixture(name="mock_client")
 def mock_client_fixture():
     """Mock the prometheus client."""
@@ -1,11 +1,7 @@
 """Common test utils for working with recorder."""
 
 from homeassistant.components import recorder
-from homeassistant.util import dt as dt_util
-
-from tests.common import fire_time_changed
-
-DB_COMMIT_INTERVAL = 50
+from homeassistant.util.async_ import run_callback_threadsafe
 
 
 def wait_recording_done(hass):
@@ -18,6 +14,8 @@ def wait_recording_done(hass):
 
 def trigger_db_commit(hass):
     """Force the recorder to commit."""
-    for _ in range(DB_COMMIT_INTERVAL):
-        # We only commit on time change
-        fire_time_changed(hass, dt_util.utcnow())
+    instance = hass.data[recorder.DATA_INSTANCE]
+    # Queue the commit from the loop, after the listeners of fired events
+    run_callback_threadsafe(
+        hass.loop, hass.loop.call_soon, instance.queue.put, recorder.CommitTask()
+    ).result()
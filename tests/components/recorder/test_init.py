@@ -16,7 +16,12 @@ from homeassistant.components.recorder import (
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import Events, RecorderRuns, States
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP,
+    MATCH_ALL,
+    STATE_LOCKED,
+    STATE_UNLOCKED,
+)
 from homeassistant.core import Context, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
@@ -452,3 +457,15 @@ def test_run_information(hass_recorder):
 
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
+
+
+def test_periodic_tasks_stop(hass_recorder):
+    """Test keep alives and commits are no longer queued after stop."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    assert len(instance._periodic_listeners) == 2
+
+    hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+    hass.block_till_done()
+
+    assert instance._periodic_listeners == []
@@ -1,33 +1,119 @@
 """Test the SSDP integration."""
 import asyncio
-from unittest.mock import Mock, patch
+from datetime import timedelta
+import socket
 
 import aiohttp
 import pytest
 
 from homeassistant.components import ssdp
+import homeassistant.util.dt as dt_util
 
-from tests.common import mock_coro
+from tests.async_mock import patch
+from tests.common import async_fire_time_changed
 
+DESCRIPTION = """
+<root>
+  <device>
+    <deviceType>Paulus</deviceType>
+    <manufacturer>Paulus</manufacturer>
+  </device>
+</root>
+"""
+
+
+class FakeNetwork(asyncio.DatagramProtocol):
+    """Stand in for the devices on the network, answering searches."""
+
+    def __init__(self):
+        """Initialize the fake network."""
+        self.responses = []
+        self.searches = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        """Store the transport."""
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        """Answer a search."""
+        self.searches.append(data)
+        for response in self.responses:
+            self.transport.sendto(response.encode(), addr)
+
+
+@pytest.fixture(name="network")
+async def network_fixture(hass):
+    """Run the scanner against a local UDP stand in for the network."""
+    network = FakeNetwork()
+    transport, _ = await hass.loop.create_datagram_endpoint(
+        lambda: network, local_addr=("127.0.0.1", 0)
+    )
+
+    with patch.object(ssdp, "get_all_addresses", return_value=["127.0.0.1"]), patch(
+        "homeassistant.components.ssdp.SSDP_PORT", 0
+    ), patch(
+        "homeassistant.components.ssdp.SSDP_TARGET",
+        transport.get_extra_info("sockname"),
+    ), patch(
+        "homeassistant.components.ssdp.SEARCH_REPEAT_DELAY", 0.01
+    ):
+        yield network
+
+    transport.close()
+
+
+def _message(first_line, **headers):
+    """Return a search response or an announcement."""
+    lines = [first_line]
+    lines.extend(f"{key.upper()}: {value}" for key, value in headers.items())
+    return "\r\n".join(lines + ["", ""])
+
+
+def _response(**headers):
+    """Return a search response."""
+    return _message("HTTP/1.1 200 OK", **headers)
 
-async def test_scan_match_st(hass):
+
+def _notify(**headers):
+    """Return an announcement."""
+    return _message("NOTIFY * HTTP/1.1", **headers)
+
+
+async def _async_wait_for(hass, condition):
+    """Wait until the scanner processed the datagrams it received."""
+    for _ in range(100):
+        if condition():
+            break
+        await asyncio.sleep(0.01)
+    await hass.async_block_till_done()
+
+
+async def _async_scan(hass, network, matchers, responses):
+    """Start a scanner and return the discovery flows it started."""
+    network.responses = responses
+    scanner = ssdp.Scanner(hass, matchers)
+
+    with patch.object(hass.config_entries.flow, "async_init") as mock_init:
+        await scanner.async_start()
+        await _async_wait_for(
+            hass, lambda: len(network.searches) == 2 * ssdp.SEARCH_REPEAT
+        )
+        await scanner.async_stop()
+
+    return mock_init
+
+
+async def test_scan_match_st(hass, network):
     """Test matching based on ST."""
-    scanner = ssdp.Scanner(hass, {"mock-domain": [{"st": "mock-st"}]})
-
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[
-            Mock(
-                st="mock-st",
-                location=None,
-                values={"usn": "mock-usn", "server": "mock-server", "ext": ""},
-            )
-        ],
-    ), patch.object(
-        hass.config_entries.flow, "async_init", return_value=mock_coro()
-    ) as mock_init:
-        await scanner.async_scan(None)
+    mock_init = await _async_scan(
+        hass,
+        network,
+        {"mock-domain": [{"st": "mock-st"}]},
+        [_response(st="mock-st", usn="mock-usn", server="mock-server", ext="")],
+    )
 
+    assert len(network.searches) == 2 * ssdp.SEARCH_REPEAT
     assert len(mock_init.mock_calls) == 1
     assert mock_init.mock_calls[0][1][0] == "mock-domain"
     assert mock_init.mock_calls[0][2]["context"] == {"source": "ssdp"}
@@ -43,34 +129,22 @@ async def test_scan_match_st(hass):
 @pytest.mark.parametrize(
     "key", (ssdp.ATTR_UPNP_MANUFACTURER, ssdp.ATTR_UPNP_DEVICE_TYPE)
 )
-async def test_scan_match_upnp_devicedesc(hass, aioclient_mock, key):
+async def test_scan_match_upnp_devicedesc(hass, network, aioclient_mock, key):
     """Test matching based on UPnP device description data."""
-    aioclient_mock.get(
-        "http://1.1.1.1",
-        text=f"""
-<root>
-  <device>
-    <{key}>Paulus</{key}>
-  </device>
-</root>
-    """,
+    aioclient_mock.get("http://1.1.1.1", text=DESCRIPTION)
+    mock_init = await _async_scan(
+        hass,
+        network,
+        {"mock-domain": [{key: "Paulus"}]},
+        [_response(st="mock-st", location="http://1.1.1.1")],
     )
-    scanner = ssdp.Scanner(hass, {"mock-domain": [{key: "Paulus"}]})
-
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[Mock(st="mock-st", location="http://1.1.1.1", values={})],
-    ), patch.object(
-        hass.config_entries.flow, "async_init", return_value=mock_coro()
-    ) as mock_init:
-        await scanner.async_scan(None)
 
     assert len(mock_init.mock_calls) == 1
     assert mock_init.mock_calls[0][1][0] == "mock-domain"
     assert mock_init.mock_calls[0][2]["context"] == {"source": "ssdp"}
 
 
-async def test_scan_not_all_present(hass, aioclient_mock):
+async def test_scan_not_all_present(hass, network, aioclient_mock):
     """Test match fails if some specified attributes are not present."""
     aioclient_mock.get(
         "http://1.1.1.1",
@@ -82,8 +156,9 @@ async def test_scan_not_all_present(hass, aioclient_mock):
 </root>
     """,
     )
-    scanner = ssdp.Scanner(
+    mock_init = await _async_scan(
         hass,
+        network,
         {
             "mock-domain": [
                 {
@@ -92,34 +167,18 @@ async def test_scan_not_all_present(hass, aioclient_mock):
                 }
             ]
         },
+        [_response(st="mock-st", location="http://1.1.1.1")],
     )
 
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[Mock(st="mock-st", location="http://1.1.1.1", values={})],
-    ), patch.object(
-        hass.config_entries.flow, "async_init", return_value=mock_coro()
-    ) as mock_init:
-        await scanner.async_scan(None)
-
     assert not mock_init.mock_calls
 
 
-async def test_scan_not_all_match(hass, aioclient_mock):
+async def test_scan_not_all_match(hass, network, aioclient_mock):
     """Test match fails if some specified attribute values differ."""
-    aioclient_mock.get(
-        "http://1.1.1.1",
-        text="""
-<root>
-  <device>
-    <deviceType>Paulus</deviceType>
-    <manufacturer>Paulus</manufacturer>
-  </device>
-</root>
-    """,
-    )
-    scanner = ssdp.Scanner(
+    aioclient_mock.get("http://1.1.1.1", text=DESCRIPTION)
+    mock_init = await _async_scan(
         hass,
+        network,
         {
             "mock-domain": [
                 {
@@ -128,33 +187,27 @@ async def test_scan_not_all_match(hass, aioclient_mock):
                 }
             ]
         },
+        [_response(st="mock-st", location="http://1.1.1.1")],
     )
 
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[Mock(st="mock-st", location="http://1.1.1.1", values={})],
-    ), patch.object(
-        hass.config_entries.flow, "async_init", return_value=mock_coro()
-    ) as mock_init:
-        await scanner.async_scan(None)
-
     assert not mock_init.mock_calls
 
 
 @pytest.mark.parametrize("exc", [asyncio.TimeoutError, aiohttp.ClientError])
-async def test_scan_description_fetch_fail(hass, aioclient_mock, exc):
+async def test_scan_description_fetch_fail(hass, network, aioclient_mock, exc):
     """Test failing to fetch description."""
     aioclient_mock.get("http://1.1.1.1", exc=exc)
-    scanner = ssdp.Scanner(hass, {})
+    mock_init = await _async_scan(
+        hass,
+        network,
+        {"mock-domain": [{ssdp.ATTR_UPNP_DEVICE_TYPE: "Paulus"}]},
+        [_response(st="mock-st", location="http://1.1.1.1")],
+    )
 
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[Mock(st="mock-st", location="http://1.1.1.1", values={})],
-    ):
-        await scanner.async_scan(None)
+    assert not mock_init.mock_calls
 
 
-async def test_scan_description_parse_fail(hass, aioclient_mock):
+async def test_scan_description_parse_fail(hass, network, aioclient_mock):
     """Test invalid XML."""
     aioclient_mock.get(
         "http://1.1.1.1",
@@ -162,10 +215,102 @@ async def test_scan_description_parse_fail(hass, aioclient_mock):
 <root>INVALIDXML
     """,
     )
+    mock_init = await _async_scan(
+        hass,
+        network,
+        {"mock-domain": [{ssdp.ATTR_UPNP_DEVICE_TYPE: "Paulus"}]},
+        [_response(st="mock-st", location="http://1.1.1.1")],
+    )
+
+    assert not mock_init.mock_calls
+
+
+async def test_announcements(hass, network, aioclient_mock):
+    """Test devices announcing themselves are discovered."""
+    aioclient_mock.get("http://1.1.1.1", text=DESCRIPTION)
+    scanner = ssdp.Scanner(
+        hass, {"mock-domain": [{ssdp.ATTR_UPNP_MANUFACTURER: "Paulus"}]}
+    )
+
+    with patch.object(hass.config_entries.flow, "async_init") as mock_init:
+        await scanner.async_start()
+        await _async_wait_for(
+            hass, lambda: len(network.searches) == 2 * ssdp.SEARCH_REPEAT
+        )
+        assert not mock_init.mock_calls
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listen_addr = (
+            "127.0.0.1",
+            scanner._listen_transport.get_extra_info("sockname")[1],
+        )
+        for message in (
+            _notify(nt="mock-nt", nts="ssdp:byebye", usn="mock-usn"),
+            _notify(nt="mock-nt", nts="ssdp:alive", location="http://1.1.1.1"),
+            _notify(nt="mock-nt", nts="ssdp:alive", location="http://1.1.1.1"),
+            _notify(nt="mock-nt-2", nts="ssdp:alive", location="http://1.1.1.1"),
+            _message("M-SEARCH * HTTP/1.1", st="ssdp:all"),
+        ):
+            sock.sendto(message.encode(), listen_addr)
+        sock.close()
+
+        await _async_wait_for(hass, lambda: len(scanner.seen) == 2)
+        await scanner.async_stop()
+
+    assert len(mock_init.mock_calls) == 2
+    assert {call[2]["data"][ssdp.ATTR_SSDP_ST] for call in mock_init.mock_calls} == {
+        "mock-nt",
+        "mock-nt-2",
+    }
+    # The description is shared by both entries
+    assert aioclient_mock.call_count == 1
+
+
+async def test_search_on_network_change(hass, network):
+    """Test the network is only searched again when the addresses change."""
     scanner = ssdp.Scanner(hass, {})
+    await scanner.async_start()
+    await _async_wait_for(hass, lambda: len(network.searches) == 2 * ssdp.SEARCH_REPEAT)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + ssdp.SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    await asyncio.sleep(0.05)
+    assert len(network.searches) == 2 * ssdp.SEARCH_REPEAT
 
-    with patch(
-        "netdisco.ssdp.scan",
-        return_value=[Mock(st="mock-st", location="http://1.1.1.1", values={})],
+    with patch.object(
+        ssdp, "get_all_addresses", return_value=["127.0.0.1", "127.0.0.2"]
     ):
-        await scanner.async_scan(None)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + ssdp.SCAN_INTERVAL + timedelta(seconds=1)
+        )
+        await _async_wait_for(
+            hass, lambda: len(network.searches) == 6 * ssdp.SEARCH_REPEAT
+        )
+
+    assert len(network.searches) == 6 * ssdp.SEARCH_REPEAT
+    await scanner.async_stop()
+
+
+def test_integration_matchers():
+    """Test only candidate matchers are checked."""
+    matchers = ssdp.IntegrationMatchers(
+        {
+            "st_domain": [{"st": "mock-st"}],
+            "multi_domain": [
+                {"manufacturer": "Paulus", "modelName": "Model"},
+                {"st": "other-st"},
+            ],
+            "all_domain": [{}],
+        }
+    )
+
+    assert matchers.matching_domains({"st": "mock-st"}) == {"st_domain", "all_domain"}
+    assert matchers.matching_domains(
+        {"st": "other-st", "serviceList": {"service": []}}
+    ) == {"multi_domain", "all_domain"}
+    assert matchers.matching_domains(
+        {"st": "unknown", "manufacturer": "Paulus", "modelName": "Model"}
+    ) == {"multi_domain", "all_domain"}
+    assert matchers.matching_domains({"st": "unknown", "manufacturer": "Paulus"}) == {
+        "all_domain"
+    }
@@ -1,9 +1,14 @@
 """The test for the Trend sensor platform."""
 from datetime import timedelta
 from os import path
+import random
+
+import numpy as np
+import pytest
 
 from homeassistant import config as hass_config, setup
 from homeassistant.components.trend import DOMAIN
+from homeassistant.components.trend.binary_sensor import TrendSamples
 from homeassistant.const import SERVICE_RELOAD
 import homeassistant.util.dt as dt_util
 
@@ -417,3 +422,65 @@ async def test_reload(hass):
 
 def _get_fixtures_base_path():
     return path.dirname(path.dirname(path.dirname(__file__)))
+
+
+def test_trend_samples_gradient():
+    """Test the streaming gradient matches a full least squares fit."""
+    random.seed(0)
+    samples = TrendSamples(50)
+    timestamp = dt_util.utcnow().timestamp()
+    points = []
+
+    for _ in range(500):
+        timestamp += random.uniform(0.001, 60)
+        value = random.uniform(-100, 100)
+        samples.append(timestamp, value)
+        points = (points + [(timestamp, value)])[-50:]
+
+        if len(points) < 2:
+            continue
+
+        timestamps, values = np.array(points).T
+        assert samples.gradient() == pytest.approx(
+            np.polyfit(timestamps, values, 1)[0], rel=1e-6, abs=1e-9
+        )
+
+    assert len(samples) == 50
+    timestamps, values = samples.arrays()
+    assert timestamps.tolist() == [t for t, _ in points]
+    assert values.tolist() == [v for _, v in points]
+
+
+def test_trend_samples_purge():
+    """Test purging old samples from the window."""
+    samples = TrendSamples(10)
+    for timestamp in range(10):
+        samples.append(timestamp, 2.0 * timestamp)
+
+    samples.purge(8)
+    assert len(samples) == 2
+    assert samples.gradient() == pytest.approx(2.0)
+
+    samples.purge(9)
+    assert len(samples) == 1
+    assert samples.gradient() is None
+
+    samples.purge(20)
+    assert len(samples) == 0
+    samples.append(30, 1.0)
+    samples.append(30, 2.0)
+    assert samples.gradient() is None
+    samples.append(31, 0.0)
+    assert samples.gradient() == pytest.approx(-1.5)
+
+
+def test_trend_samples_empty_window():
+    """Test a window of zero samples keeps nothing."""
+    samples = TrendSamples(0)
+    samples.append(1, 1.0)
+    samples.append(2, 2.0)
+    samples.purge(3)
+
+    assert len(samples) == 0
+    assert samples.gradient() is None
+    assert samples.arrays()[0].tolist() == []
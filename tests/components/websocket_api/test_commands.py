@@ -10,7 +10,7 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import Context, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity
+from homeassistant.helpers import entity, startup_trace
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
@@ -201,7 +201,7 @@ async def test_get_states(hass, websocket_client):
 
     states = []
     for state in hass.states.async_all():
-        state = state.as_dict()
+        state = dict(state.as_dict())
         state["last_changed"] = state["last_changed"].isoformat()
         state["last_updated"] = state["last_updated"].isoformat()
         states.append(state)
@@ -806,3 +806,33 @@ async def test_test_condition(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"]["result"] is True
+
+
+async def test_startup_trace(hass, websocket_client, hass_admin_user):
+    """Test downloading the startup trace."""
+    await websocket_client.send_json({"id": 5, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+    trace = startup_trace.async_start_trace(hass)
+    with trace.async_stage("stage_1", ["websocket_api"]):
+        pass
+    trace.async_finish()
+
+    await websocket_client.send_json({"id": 6, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+    assert msg["result"]["stages"]["stage_1"]["domains"] == ["websocket_api"]
+    assert msg["result"]["stages"]["stage_1"]["critical_path"] == []
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 7, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
@@ -1,4 +1,5 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     cached_event_message,
@@ -50,14 +51,16 @@ async def test_message_to_json(caplog):
 
     json_str = message_to_json({"id": 1, "message": "xyz"})
 
-    assert json_str == '{"id": 1, "message": "xyz"}'
+    assert json.loads(json_str) == {"id": 1, "message": "xyz"}
 
     json_str2 = message_to_json({"id": 1, "message": _Unserializeable()})
 
-    assert (
-        json_str2
-        == '{"id": 1, "type": "result", "success": false, "error": {"code": "unknown_error", "message": "Invalid JSON in response"}}'
-    )
+    assert json.loads(json_str2) == {
+        "id": 1,
+        "type": "result",
+        "success": False,
+        "error": {"code": "unknown_error", "message": "Invalid JSON in response"},
+    }
     assert "Unable to serialize to JSON" in caplog.text
 
 
@@ -1,4 +1,6 @@
 """Test Zeroconf component setup process."""
+from time import monotonic
+
 from zeroconf import (
     BadTypeInNameException,
     InterfaceChoice,
@@ -438,6 +440,85 @@ async def test_homekit_not_paired(hass, mock_zeroconf):
     assert mock_config_flow.mock_calls[0][1][0] == "homekit_controller"
 
 
+async def test_zeroconf_duplicates(hass, mock_zeroconf):
+    """Test unchanged services are resolved once and discovered once."""
+    service_type = "_http._tcp.local."
+    name = f"shelly108.{service_type}"
+
+    def duplicate_service_update_mock(zeroconf, services, handlers):
+        """Call service update handler twice for the same service."""
+        for _ in range(2):
+            handlers[0](zeroconf, service_type, name, ServiceStateChange.Added)
+        handlers[0](zeroconf, service_type, name, ServiceStateChange.Removed)
+
+    with patch.dict(
+        zc_gen.ZEROCONF,
+        {service_type: [{"domain": "shelly", "name": "shelly*"}]},
+        clear=True,
+    ), patch.object(
+        hass.config_entries.flow, "async_init"
+    ) as mock_config_flow, patch.object(
+        zeroconf, "HaServiceBrowser", side_effect=duplicate_service_update_mock
+    ):
+        mock_zeroconf.get_service_info.side_effect = get_zeroconf_info_mock(
+            "FFAADDCC11DD"
+        )
+        assert await async_setup_component(hass, zeroconf.DOMAIN, {zeroconf.DOMAIN: {}})
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+
+        assert len(mock_zeroconf.get_service_info.mock_calls) == 1
+        assert len(mock_config_flow.mock_calls) == 1
+
+        discovery = hass.data[zeroconf.DATA_DISCOVERY]
+
+        # Found again within the cooldown
+        discovery.async_queue(service_type, name)
+        await hass.async_block_till_done()
+        assert len(mock_zeroconf.get_service_info.mock_calls) == 2
+        assert len(mock_config_flow.mock_calls) == 1
+
+        # Properties changed
+        mock_zeroconf.get_service_info.side_effect = get_zeroconf_info_mock(
+            "FFAADDCC11DE"
+        )
+        discovery.async_queue(service_type, name)
+        await hass.async_block_till_done()
+        assert len(mock_config_flow.mock_calls) == 2
+
+        # Port changed
+        service_info = mock_zeroconf.get_service_info.side_effect(service_type, name)
+        service_info.port = 8080
+        mock_zeroconf.get_service_info.side_effect = None
+        mock_zeroconf.get_service_info.return_value = service_info
+        discovery.async_queue(service_type, name)
+        await hass.async_block_till_done()
+        assert len(mock_config_flow.mock_calls) == 3
+
+        # Host changed
+        service_info.addresses = [b"\n\x00\x00\x15"]
+        discovery.async_queue(service_type, name)
+        await hass.async_block_till_done()
+        assert len(mock_config_flow.mock_calls) == 4
+        assert mock_config_flow.mock_calls[3][2]["data"]["host"] == "10.0.0.21"
+
+        # Cooldown passed
+        with patch(
+            "homeassistant.components.zeroconf.monotonic",
+            return_value=monotonic() + zeroconf.DISCOVERY_COOLDOWN,
+        ):
+            discovery.async_queue(service_type, name)
+            await hass.async_block_till_done()
+        assert len(mock_config_flow.mock_calls) == 5
+
+    stats = discovery.stats
+    assert stats["queue_depth"] == 0
+    assert stats["queue_depth_max"] == 1
+    assert stats["resolved"] == 6
+    assert stats["duplicates"] == 1
+    assert stats["resolve_time_max"] >= stats["resolve_time_avg"] >= 0
+
+
 async def test_info_from_service_non_utf8(hass):
     """Test info_from_service handles non UTF-8 property keys and values correctly."""
     service_type = "_test._tcp.local."
@@ -1,4 +1,6 @@
 """Test zone component."""
+import random
+
 import pytest
 
 from homeassistant import setup
@@ -14,6 +16,7 @@ from homeassistant.const import (
 from homeassistant.core import Context
 from homeassistant.exceptions import Unauthorized
 from homeassistant.helpers import entity_registry
+from homeassistant.util.location import distance
 
 from tests.async_mock import patch
 from tests.common import MockConfigEntry
@@ -502,3 +505,80 @@ async def test_unavailable_zone(hass):
     assert zone.async_active_zone(hass, 0.0, 0.01) is None
 
     assert zone.in_zone(hass.states.get("zone.bla"), 0, 0) is False
+
+
+async def test_active_zone_index(hass):
+    """Test the zone index finds the same zones as checking every zone."""
+    rnd = random.Random(42)
+    zones = {}
+    for idx in range(200):
+        zones[f"zone.zone_{idx}"] = {
+            "latitude": 52 + rnd.uniform(-0.5, 0.5),
+            "longitude": 5 + rnd.uniform(-0.5, 0.5),
+            "radius": rnd.choice([50, 100, 500, 2000, 50000]),
+            "passive": idx % 10 == 0,
+        }
+        hass.states.async_set(f"zone.zone_{idx}", "zoning", zones[f"zone.zone_{idx}"])
+
+    def closest_zone(latitude, longitude, radius):
+        closest = None
+        for entity_id, attrs in sorted(zones.items()):
+            if attrs["passive"]:
+                continue
+            zone_dist = distance(
+                latitude, longitude, attrs["latitude"], attrs["longitude"]
+            )
+            if zone_dist - radius >= attrs["radius"]:
+                continue
+            if (
+                closest is None
+                or zone_dist < closest[0]
+                or (zone_dist == closest[0] and attrs["radius"] < closest[1])
+            ):
+                closest = (zone_dist, attrs["radius"], entity_id)
+        return closest and closest[2]
+
+    for _ in range(500):
+        latitude = 52 + rnd.uniform(-0.6, 0.6)
+        longitude = 5 + rnd.uniform(-0.6, 0.6)
+        radius = rnd.choice([0, 20, 1000, 100000])
+        active = zone.async_active_zone(hass, latitude, longitude, radius)
+        assert (active and active.entity_id) == closest_zone(
+            latitude, longitude, radius
+        )
+
+    index = hass.data[zone.DATA_ZONE_INDEX]
+    assert index.async_candidates(52.3, 5.3, 0) < set(index.states)
+
+    # The index follows the zone states
+    hass.states.async_set(
+        "zone.moved", "zoning", {"latitude": 10, "longitude": 10, "radius": 100}
+    )
+    await hass.async_block_till_done()
+    assert zone.async_active_zone(hass, 10, 10).entity_id == "zone.moved"
+
+    hass.states.async_set(
+        "zone.moved", "zoning", {"latitude": 20, "longitude": 20, "radius": 100}
+    )
+    assert zone.async_active_zone(hass, 10, 10) is None
+    await hass.async_block_till_done()
+    assert zone.async_active_zone(hass, 20, 20).entity_id == "zone.moved"
+
+    hass.states.async_set(
+        "zone.moved",
+        "zoning",
+        {"latitude": 20, "longitude": 20, "radius": 100, "passive": True},
+    )
+    await hass.async_block_till_done()
+    assert zone.async_active_zone(hass, 20, 20) is None
+
+    # Zones the index has not seen yet are taken from the state machine
+    hass.states.async_set(
+        "zone.new", "zoning", {"latitude": 30, "longitude": 30, "radius": 100}
+    )
+    assert zone.async_active_zone(hass, 30, 30).entity_id == "zone.new"
+    assert "zone.new" in index.states
+
+    hass.states.async_remove("zone.zone_1")
+    await hass.async_block_till_done()
+    assert "zone.zone_1" not in index.states
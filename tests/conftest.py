@@ -10,7 +10,7 @@ from aiohttp.test_utils import make_mocked_request
 import pytest
 import requests_mock as _requests_mock
 
-from homeassistant import core as ha, loader, runner, util
+from homeassistant import config as config_util, core as ha, loader, runner, util
 from homeassistant.auth.const import GROUP_ID_ADMIN, GROUP_ID_READ_ONLY
 from homeassistant.auth.providers import homeassistant, legacy_api_password
 from homeassistant.components import mqtt
@@ -103,6 +103,16 @@ def hass_storage():
         yield stored_data
 
 
+@pytest.fixture(autouse=True)
+def mock_yaml_cache():
+    """Load the YAML configuration without writing a cache to the config dir."""
+    with patch(
+        "homeassistant.config.load_yaml_cached",
+        side_effect=lambda fname, cache_file: config_util.load_yaml(fname),
+    ):
+        yield
+
+
 @pytest.fixture
 def hass(loop, hass_storage, request):
     """Fixture to provide a test instance of Home Assistant."""
@@ -14,10 +14,13 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_TIMER_WHEEL,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_state_change_dispatch_stats,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -93,6 +96,83 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_timer_wheel(hass):
+    """Test timers sharing a second run in order from one loop timer."""
+    now = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    runs = []
+
+    for offset, name in ((0.5, "b"), (0.2, "a"), (0.7, "c"), (2.1, "d")):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x, name=name: runs.append(name)),
+            now + timedelta(seconds=offset),
+        )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("cancelled")), now
+    )
+    unsub()
+
+    timer_handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled() and "_TimerWheel" in repr(handle)
+    ]
+    assert len(timer_handles) == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=0.6))
+    await hass.async_block_till_done()
+    assert runs == ["a", "b"]
+
+    async_fire_time_changed(hass, now + timedelta(seconds=3))
+    await hass.async_block_till_done()
+    assert runs == ["a", "b", "c", "d"]
+    assert len(hass.data[TRACK_TIMER_WHEEL]) == 0
+
+
+async def test_track_point_in_time_timer_wheel_cancel_due(hass):
+    """Test a timer cancelled by a job running before it in a batch."""
+    now = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    runs = []
+
+    @callback
+    def cancel_later(utc_now):
+        """Cancel the later timer."""
+        runs.append("first")
+        unsub()
+
+    async_track_point_in_utc_time(hass, cancel_later, now + timedelta(seconds=0.1))
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("cancelled")), now + timedelta(seconds=0.2)
+    )
+
+    async_fire_time_changed(hass, now + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+
+
+async def test_track_point_in_time_timer_wheel_compact(hass):
+    """Test cancelled timers do not leave seconds in the heap."""
+    now = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1)
+    runs = []
+
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append(x)), now + timedelta(days=idx + 1)
+        )
+        for idx in range(100)
+    ]
+    for unsub in unsubs[1:]:
+        unsub()
+
+    wheel = hass.data[TRACK_TIMER_WHEEL]
+    assert len(wheel) == 1
+    assert len(wheel._seconds) <= 2
+
+    async_fire_time_changed(hass, now + timedelta(days=2))
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -486,6 +566,58 @@ async def test_async_track_state_change_event(hass):
     unsub_throws()
 
 
+async def test_async_track_state_change_event_removed_while_dispatching(hass):
+    """Test listeners removed or added while dispatching a state change."""
+    calls = []
+    unsubs = {}
+
+    @ha.callback
+    def first_callback(event):
+        calls.append("first")
+        unsubs["second"]()
+        unsubs["added"] = async_track_state_change_event(
+            hass, ["light.bowl"], added_callback
+        )
+
+    @ha.callback
+    def second_callback(event):
+        calls.append("second")
+
+    @ha.callback
+    def added_callback(event):
+        calls.append("added")
+
+    unsubs["first"] = async_track_state_change_event(
+        hass, ["light.bowl"], first_callback
+    )
+    unsubs["second"] = async_track_state_change_event(
+        hass, ["light.bowl"], second_callback
+    )
+    # The same action can be registered more than once
+    unsubs["twice"] = async_track_state_change_event(
+        hass, ["light.bowl", "light.bowl"], second_callback
+    )
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert calls == ["first", "second", "second"]
+
+    unsubs["first"]()
+    calls.clear()
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert calls == ["second", "second", "added"]
+
+    assert async_state_change_dispatch_stats(hass) == {
+        "light.bowl": {"listeners": 3, "events": 2, "calls": 6}
+    }
+
+    unsubs["twice"]()
+    unsubs["added"]()
+    assert not hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+    assert async_state_change_dispatch_stats(hass) == {}
+
+
 async def test_async_track_state_added_domain(hass):
     """Test async_track_state_added_domain."""
     single_entity_id_tracker = []
@@ -1,10 +1,29 @@
 """Test Home Assistant remote methods and classes."""
+from collections import namedtuple
+from dataclasses import dataclass
+import json
+import uuid
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_backend, json_bytes, json_dumps
 from homeassistant.util import dt as dt_util
 
+from tests.async_mock import patch
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request):
+    """Run a test with each JSON backend."""
+    if request.param == "json":
+        with patch("homeassistant.helpers.json.orjson", None):
+            yield request.param
+        return
+
+    pytest.importorskip("orjson")
+    yield request.param
+
 
 def test_json_encoder(hass):
     """Test the JSON Encoder."""
@@ -19,3 +38,76 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_dumps(backend):
+    """Test serializing Home Assistant objects with each backend."""
+    assert json_backend() == backend
+
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", {"now": now}, context=core.Context("a"))
+    event = core.Event("test_event", {"state": state}, time_fired=now)
+    point = namedtuple("Point", ["x", "y"])(1, 2)
+
+    data = {
+        "state": state,
+        "event": event,
+        "set": {1},
+        "point": point,
+        "time": now,
+        1: "int key",
+    }
+    expected = json.loads(json.dumps(data, cls=JSONEncoder))
+
+    assert json.loads(json_dumps(data)) == expected
+    assert json.loads(json_bytes(data)) == expected
+    assert json.loads(json_dumps(data, indent=4)) == expected
+
+    data = {"b": 1, "a": [2, 1]}
+    assert json_dumps(data, sort_keys=True).index('"a"') < json_dumps(
+        data, sort_keys=True
+    ).index('"b"')
+
+
+def test_json_dumps_errors(backend):
+    """Test both backends report unserializable data the same way."""
+    with pytest.raises(TypeError):
+        json_dumps({"hello": object()})
+
+    with pytest.raises(TypeError):
+        json_bytes({"hello": object()})
+
+    # Only the Home Assistant encoder knows about sets
+    with pytest.raises(TypeError):
+        json_dumps({"hello": {1}}, encoder=json.JSONEncoder)
+
+
+def test_json_dumps_nan(backend):
+    """Test NaN is handled by the standard library with both backends."""
+    with pytest.raises(ValueError):
+        json_dumps(float("NaN"))
+    with pytest.raises(ValueError):
+        json_bytes({"value": None, "nan": [float("inf")]})
+    assert json_dumps(float("NaN"), allow_nan=True) == "NaN"
+    assert json.loads(json_dumps({"value": None})) == {"value": None}
+
+
+def test_json_dumps_stdlib_compatible(backend):
+    """Test orjson is not used where it would change the output."""
+    data = {"b": [1, 2], "a": {"c": None}}
+    assert json_dumps(data, indent=4) == json.dumps(data, indent=4)
+    assert json.loads(json_dumps(data, indent=2)) == data
+
+    # The plain encoder rejects what only orjson can encode
+    now = dt_util.utcnow()
+    with pytest.raises(TypeError):
+        json_dumps({"now": now}, encoder=json.JSONEncoder)
+    with pytest.raises(TypeError):
+        json_dumps({"id": uuid.uuid4()}, encoder=json.JSONEncoder)
+
+    @dataclass
+    class Point:
+        x: int
+
+    with pytest.raises(TypeError):
+        json_dumps(Point(1))
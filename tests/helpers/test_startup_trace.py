@@ -0,0 +1,69 @@
+"""Test the startup trace helper."""
+import asyncio
+from time import monotonic
+
+from homeassistant.helpers import startup_trace
+
+from tests.async_mock import patch
+
+
+async def test_trace_setup_and_phases(hass):
+    """Test recording setups and phases of integrations."""
+    future = hass.loop.create_future()
+    startup_trace.async_trace_setup(hass, "light", future)
+    assert startup_trace.async_get_trace(hass) is None
+
+    trace = startup_trace.async_start_trace(hass)
+    startup_trace.async_trace_setup(hass, "light", future)
+    startup_trace.async_trace_dependencies(hass, "light", ["group"])
+    startup_trace.async_add_phase_time(hass, "light", "setup", 1)
+    with startup_trace.async_trace_phase(hass, "light", "setup"):
+        pass
+
+    itg_trace = trace.integrations["light"]
+    assert itg_trace.start is not None
+    assert itg_trace.end is None
+    assert itg_trace.dependencies == ["group"]
+    assert 1 <= itg_trace.phases["setup"] < 2
+
+    future.set_result(True)
+    await asyncio.sleep(0)
+    assert itg_trace.end >= itg_trace.start
+
+    trace.async_finish()
+    startup_trace.async_add_phase_time(hass, "light", "setup", 1)
+    startup_trace.async_trace_platform(hass, "light.hue", monotonic())
+    assert itg_trace.phases["setup"] < 2
+    assert trace.platforms == {}
+
+
+async def test_critical_path(hass):
+    """Test finding the chain of setups that took the longest."""
+    with patch("homeassistant.helpers.startup_trace.monotonic", return_value=0):
+        trace = startup_trace.async_start_trace(hass)
+
+    def add(domain, start, end, dependencies=()):
+        itg_trace = trace.integration(domain)
+        itg_trace.start = start
+        itg_trace.end = end
+        itg_trace.dependencies.extend(dependencies)
+
+    add("http", 0, 4)
+    add("api", 0, 5, ["http"])
+    add("frontend", 0, 6, ["api", "http", "websocket_api"])
+    add("websocket_api", 0, 3, ["http"])
+    add("cloud", 0, 2, ["http"])
+    add("late", 7, 8, ["http"])
+    trace.platforms["light.hue"] = [8, 12]
+    trace.platforms["switch.hue"] = [8, 10]
+    trace.stages = {
+        "stage_1": {"start": 0, "end": 6, "domains": ["cloud", "frontend"]},
+        "stage_2": {"start": 6, "end": 8, "domains": ["late"]},
+        "wrap_up": {"start": 8, "end": 12, "domains": []},
+    }
+
+    assert trace.critical_path("stage_1") == ["http", "api", "frontend"]
+    # http finished before late started
+    assert trace.critical_path("stage_2") == ["late"]
+    assert trace.critical_path("wrap_up") == ["light.hue"]
+    assert trace.critical_path("unknown") == []
@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import threading
 
 import pytest
 
@@ -21,6 +22,9 @@ MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
 
+# Store._write_data is mocked by the hass_storage fixture
+ORIG_WRITE_DATA = storage.Store._write_data
+
 
 @pytest.fixture
 def store(hass):
@@ -186,6 +190,116 @@ async def test_writing_while_writing_delay(hass, store, hass_storage):
     assert data == {"delay": "no"}
 
 
+async def test_delayed_writes_are_batched(hass, hass_storage):
+    """Test delayed writes of multiple stores that are due together are batched."""
+    store1 = storage.Store(hass, MOCK_VERSION, "store-1")
+    store2 = storage.Store(hass, MOCK_VERSION, "store-2")
+    store1.async_delay_save(lambda: MOCK_DATA, 1)
+    store2.async_delay_save(lambda: MOCK_DATA2, 1)
+
+    with patch(
+        "homeassistant.helpers.storage._write_stores", wraps=storage._write_stores
+    ) as mock_write_stores:
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert len(mock_write_stores.mock_calls) == 1
+    assert hass_storage["store-1"]["data"] == MOCK_DATA
+    assert hass_storage["store-2"]["data"] == MOCK_DATA2
+
+
+async def test_final_writes_are_batched(hass, hass_storage):
+    """Test final writes of all stores are batched."""
+    stores = [storage.Store(hass, MOCK_VERSION, f"store-{idx}") for idx in range(3)]
+    for store in stores:
+        store.async_delay_save(lambda: MOCK_DATA, 10)
+
+    hass.state = CoreState.stopping
+    with patch(
+        "homeassistant.helpers.storage._write_stores", wraps=storage._write_stores
+    ) as mock_write_stores:
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    assert len(mock_write_stores.mock_calls) == 1
+    for store in stores:
+        assert hass_storage[store.key]["data"] == MOCK_DATA
+
+
+async def test_batched_write_error_is_isolated(hass, hass_storage, caplog):
+    """Test a store failing to generate its data does not affect the batch."""
+
+    def _raise():
+        raise ValueError("Boom")
+
+    stores = [storage.Store(hass, MOCK_VERSION, f"store-{idx}") for idx in range(3)]
+    stores[0].async_delay_save(lambda: MOCK_DATA, 1)
+    stores[1].async_delay_save(_raise, 1)
+    stores[2].async_delay_save(lambda: MOCK_DATA2, 1)
+
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert hass_storage["store-0"]["data"] == MOCK_DATA
+    assert "store-1" not in hass_storage
+    assert hass_storage["store-2"]["data"] == MOCK_DATA2
+    assert "Error generating data for store-1" in caplog.text
+
+
+async def test_compact_store_and_write_stats(hass, tmpdir):
+    """Test compact stores and write statistics."""
+    hass.config.config_dir = str(tmpdir)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    compact_store = storage.Store(hass, MOCK_VERSION, "compact", compact=True)
+
+    with patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA):
+        await store.async_save(MOCK_DATA)
+        await store.async_save(MOCK_DATA2)
+        await compact_store.async_save(MOCK_DATA)
+
+    with open(store.path) as fp:
+        assert "\n" in fp.read()
+    with open(compact_store.path) as fp:
+        compact_content = fp.read()
+    assert "\n" not in compact_content
+    assert json.loads(compact_content)["data"] == MOCK_DATA
+
+    stats = storage.async_get_write_stats(hass)
+    assert stats[MOCK_KEY]["writes"] == 2
+    assert stats[MOCK_KEY]["bytes_written"] > 2 * len(compact_content)
+    assert stats["compact"] == {"writes": 1, "bytes_written": len(compact_content)}
+
+
+async def test_data_func_runs_in_event_loop(hass, tmpdir):
+    """Test the data is generated in the event loop and encoded in the executor."""
+    hass.config.config_dir = str(tmpdir)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    loop_thread = threading.get_ident()
+    threads = {}
+
+    def data_func():
+        threads["data_func"] = threading.get_ident()
+        return MOCK_DATA
+
+    def save_json(*args, **kwargs):
+        threads["save_json"] = threading.get_ident()
+        return orig_save_json(*args, **kwargs)
+
+    orig_save_json = storage.json_util.save_json
+
+    with patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA), patch.object(
+        storage.json_util, "save_json", save_json
+    ):
+        store.async_delay_save(data_func, 1)
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert threads["data_func"] == loop_thread
+    assert threads["save_json"] != loop_thread
+    with open(store.path) as fp:
+        assert json.load(fp)["data"] == MOCK_DATA
+
+
 async def test_migrator_no_existing_config(hass, store, hass_storage):
     """Test migrator with no existing config."""
     with patch("os.path.isfile", return_value=False), patch.object(
@@ -1,7 +1,9 @@
 """Test Home Assistant template helper methods."""
+import asyncio
 from datetime import datetime, timedelta
 import math
 import random
+import threading
 
 import pytest
 import pytz
@@ -9,6 +11,7 @@ import pytz
 from homeassistant.components import group
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STOP,
     LENGTH_METERS,
     MASS_GRAMS,
     MATCH_ALL,
@@ -759,6 +762,56 @@ def test_render_with_possible_json_value_non_string_value(hass):
     assert tpl.async_render_with_possible_json_value(value) == expected
 
 
+@pytest.mark.parametrize(
+    "template_str,value,expected",
+    [
+        ("{{ value }}", " 21.5 ", "21.5"),
+        ("{{ value | float | round(1) }}", "21.46", "21.5"),
+        ("{{ value | int }}", "abc", "0"),
+        ("{{ value_json.a.b }}", '{"a": {"b": 12}}', "12"),
+        ("{{ value_json['a'][1] | multiply(2) }}", '{"a": [1, 2]}', "4.0"),
+        ("{{ value_json['items'] }}", '{"items": 1}', "1"),
+        ("{{ value_json.hello | upper }}", '{"hello": "world"}', "WORLD"),
+        ("\n  {{ value_json.temperature | float * 2 }}  ", '{"temperature": 1}', "2.0"),
+    ],
+)
+def test_render_with_possible_json_value_fast_path(hass, template_str, value, expected):
+    """Test trivial templates render the same with and without the fast path."""
+    tpl = template.Template(template_str, hass)
+    assert tpl.async_render_with_possible_json_value(value) == expected
+    tpl._fast_path = None
+    assert tpl.async_render_with_possible_json_value(value) == expected
+
+
+def test_render_with_possible_json_value_fast_path_eligibility(hass):
+    """Test which templates are compiled into the fast path."""
+    tpl = template.Template("{{ value_json.a[0] | float | round(2) }}", hass)
+    tpl.async_render_with_possible_json_value('{"a": [1.234]}')
+    assert tpl._fast_path is not None
+
+    for template_str in (
+        "{{ value_json.a }} {{ value }}",
+        "{{ states('sensor.test') }}",
+        "{{ value | round(precision) }}",
+        "{{ value | random }}",
+        "{% if value %}on{% endif %}",
+    ):
+        tpl = template.Template(template_str, hass)
+        tpl.async_render_with_possible_json_value('{"a": 1}')
+        assert tpl._fast_path is None
+
+
+def test_render_with_possible_json_value_fast_path_fallback(hass):
+    """Test the fast path falls back to Jinja for undefined values."""
+    tpl = template.Template("{{ value_json.bye | is_defined }}", hass)
+    assert (
+        tpl.async_render_with_possible_json_value('{"hello": "world"}', "err") == "err"
+    )
+    assert tpl._fast_path is not None
+    assert tpl.async_render_with_possible_json_value('{"bye": "now"}') == "now"
+    assert tpl.async_render_with_possible_json_value("not json") == "not json"
+
+
 def test_if_state_exists(hass):
     """Test if state exists works."""
     hass.states.async_set("test.object", "available")
@@ -2520,6 +2573,91 @@ async def test_template_timeout(hass):
     assert await tmp5.async_render_will_timeout(0.000001) is True
 
 
+async def test_render_will_timeout_loop_limit(hass):
+    """Test loops are limited by the iteration budget without any calls."""
+    tmp = template.Template(
+        """
+{% set items = range(100) %}
+{% for a in items %}{% for b in items %}{% for c in items %}
+{% endfor %}{% endfor %}{% endfor %}
+""",
+        hass,
+    )
+    with patch.object(template, "MAX_RENDER_LOOP_ITERATIONS", 1000):
+        assert await tmp.async_render_will_timeout(3) is True
+
+    # Renders outside of the worker pool are not limited
+    with patch.object(template, "MAX_RENDER_LOOP_ITERATIONS", 1000):
+        assert tmp.async_render() == ""
+
+
+async def test_render_will_timeout_reuses_pool(hass):
+    """Test budgeted renders share a worker pool and do not leak budgets."""
+    tmp = template.Template("{% for i in range(10) %}{{ i }}{% endfor %}", hass)
+    assert await tmp.async_render_will_timeout(3) is False
+    pool = hass.data[template._RENDER_POOL]
+    assert await tmp.async_render_will_timeout(3) is False
+    assert hass.data[template._RENDER_POOL] is pool
+    assert tmp.async_render() == "0123456789"
+
+
+async def test_render_will_timeout_queued(hass):
+    """Test a render that does not get a free worker in time times out."""
+    pool = template._async_get_render_pool(hass)
+    release = threading.Event()
+    busy = [
+        hass.loop.run_in_executor(pool, release.wait)
+        for _ in range(template.RENDER_POOL_WORKERS)
+    ]
+
+    tmp = template.Template("{{ 1 + 1 }}", hass)
+    with patch.object(
+        template.BudgetedTemplateEnvironment, "render_with_budget"
+    ) as mock_render:
+        assert await tmp.async_render_will_timeout(0.1) is True
+        release.set()
+        await asyncio.gather(*busy)
+
+    # The queued render was dropped
+    assert not mock_render.called
+    assert await tmp.async_render_will_timeout(3) is False
+
+
+async def test_loop_guard_only_for_budgeted_renders(hass):
+    """Test only budgeted renders route loops through the environment."""
+    source = "{% for i in range(3) %}{{ i }}{% endfor %}"
+    assert "guard_iter" not in template.TemplateEnvironment(hass).compile(
+        source, raw=True
+    )
+    assert "guard_iter" in template.BudgetedTemplateEnvironment(hass).compile(
+        source, raw=True
+    )
+
+    env = template._async_get_budgeted_env(hass)
+    render_with_budget = env.render_with_budget
+    threads = []
+
+    def _render_with_budget(*args):
+        threads.append(threading.current_thread().name)
+        return render_with_budget(*args)
+
+    tmp = template.Template(source, hass)
+    with patch.object(env, "render_with_budget", _render_with_budget), patch.object(
+        env, "guard_iter", wraps=env.guard_iter
+    ) as mock_guard_iter:
+        assert await tmp.async_render_will_timeout(3) is False
+        assert await tmp.async_render_will_timeout(3) is False
+
+    assert len(threads) == 2
+    assert all(name.startswith("TemplateRender") for name in threads)
+    assert len(mock_guard_iter.mock_calls) == 2
+    assert template._RENDER_POOL in hass.data
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert template._RENDER_POOL not in hass.data
+
+
 async def test_lights(hass):
     """Test we can sort lights."""
 
@@ -7,9 +7,10 @@ from unittest.mock import Mock
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, loader, runner
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
 import homeassistant.util.dt as dt_util
 
 from tests.async_mock import patch
@@ -104,6 +105,86 @@ async def test_setting_up_config(hass):
     assert "group" in hass.config.components
 
 
+async def test_prefetch_integrations(hass):
+    """Test integrations are imported in the executor before set up."""
+    mock_integration(hass, MockModule(domain="mocked"))
+
+    with patch.object(
+        bootstrap,
+        "_import_integration_modules",
+        wraps=bootstrap._import_integration_modules,
+    ) as mock_import, patch.object(
+        bootstrap, "STAGE_1_INTEGRATIONS", {"group", "mocked"}
+    ):
+        await bootstrap._async_set_up_integrations(
+            hass, {"group": {}, "light": {}, "mocked": {}}
+        )
+
+    assert [call[1][0].domain for call in mock_import.mock_calls] == [
+        "group",
+        "light",
+    ]
+    components = hass.data[loader.DATA_COMPONENTS]
+    import_times = hass.data[bootstrap.DATA_IMPORT_TIMES]
+    for cache_key in ("group", "group.light", "light"):
+        assert cache_key in components
+        assert import_times[cache_key] >= 0
+    assert "mocked" not in import_times
+
+
+async def test_prefetch_stage_2_requirements_failed(hass, caplog):
+    """Test stage 2 integrations are not imported if requirements fail."""
+    mock_integration(hass, MockModule(domain="mocked", requirements=["mock-req"]))
+
+    with patch.object(
+        bootstrap,
+        "_import_integration_modules",
+        wraps=bootstrap._import_integration_modules,
+    ) as mock_import, patch(
+        "homeassistant.util.package.is_installed", return_value=False
+    ), patch(
+        "homeassistant.util.package.install_package", return_value=False
+    ):
+        hass.config.skip_pip = False
+        await bootstrap._async_set_up_integrations(hass, {"mocked": {}})
+
+    assert mock_import.mock_calls == []
+    # The failure is not cached by the prefetch, setup reports it
+    assert "mocked" not in hass.config.components
+    assert "Requirements for mocked not found" in caplog.text
+
+
+async def test_startup_trace(hass):
+    """Test the startup trace records the critical path."""
+
+    async def async_setup_root(hass, config):
+        await asyncio.sleep(0.01)
+        return True
+
+    mock_integration(hass, MockModule(domain="root", async_setup=async_setup_root))
+    mock_integration(hass, MockModule(domain="dependant", dependencies=["root"]))
+    mock_integration(hass, MockModule(domain="other"))
+
+    await bootstrap._async_set_up_integrations(hass, {"dependant": {}, "other": {}})
+
+    trace = startup_trace.async_get_trace(hass)
+    assert trace.finished
+    assert trace.integrations["dependant"].dependencies == ["root"]
+    assert trace.integrations["root"].phases["setup"] >= 0.01
+    assert set(trace.integrations["dependant"].phases) == {
+        "dependencies",
+        "import",
+        "config",
+        "setup",
+        "config_entries",
+    }
+
+    as_dict = trace.as_dict()
+    assert as_dict["stages"]["stage_2"]["domains"] == ["dependant", "other", "root"]
+    assert as_dict["stages"]["stage_2"]["critical_path"] == ["root", "dependant"]
+    assert as_dict["stages"]["wrap_up"]["critical_path"] == []
+
+
 async def test_setup_after_deps_all_present(hass):
     """Test after_dependencies when all present."""
     order = []
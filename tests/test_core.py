@@ -3,9 +3,11 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
+import time
 import unittest
 
 import pytest
@@ -38,7 +40,11 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
 from tests.async_mock import MagicMock, Mock, PropertyMock, patch
-from tests.common import async_mock_service, get_test_home_assistant
+from tests.common import (
+    async_capture_events,
+    async_mock_service,
+    get_test_home_assistant,
+)
 
 PST = pytz.timezone("America/Los_Angeles")
 
@@ -532,6 +538,60 @@ def test_state_repr():
     )
 
 
+def test_state_as_dict():
+    """Test a State as dictionary."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+        context=ha.Context(id="abc"),
+    )
+    expected = {
+        "context": {"id": "abc", "parent_id": None, "user_id": None},
+        "entity_id": "happy.happy",
+        "attributes": {"pig": "dog"},
+        "last_changed": last_time,
+        "last_updated": last_time,
+        "state": "on",
+    }
+    as_dict_1 = state.as_dict()
+    assert as_dict_1 == expected
+    # 2nd time to verify cache
+    assert state.as_dict() is as_dict_1
+
+    with pytest.raises(RuntimeError):
+        as_dict_1["state"] = "off"
+    with pytest.raises(RuntimeError):
+        as_dict_1["attributes"]["pig"] = "cow"
+
+
+def test_state_as_json():
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+        context=ha.Context(id="abc"),
+    )
+    as_json = state.as_json()
+    assert json.loads(as_json) == {
+        "context": {"id": "abc", "parent_id": None, "user_id": None},
+        "entity_id": "happy.happy",
+        "attributes": {"pig": "dog"},
+        "last_changed": "1984-12-08T12:00:00+00:00",
+        "last_updated": "1984-12-08T12:00:00+00:00",
+        "state": "on",
+    }
+    assert state.as_json() is as_json
+    assert ha.State.from_dict(json.loads(as_json)) == state
+
+
 class TestStateMachine(unittest.TestCase):
     """Test State machine methods."""
 
@@ -1037,6 +1097,34 @@ def test_create_timer(mock_monotonic, loop):
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
 
+async def test_timer_fires_time_changed_only_with_listeners(hass):
+    """Test the timer only fires time changed events with explicit listeners."""
+    funcs = []
+    orig_callback = ha.callback
+
+    def mock_callback(func):
+        funcs.append(func)
+        return orig_callback(func)
+
+    events = async_capture_events(hass, MATCH_ALL)
+
+    with patch.object(ha, "callback", mock_callback):
+        ha._async_create_timer(hass)
+
+    fire_time_event, stop_timer = funcs[:2]
+    fire_time_event(time.monotonic())
+    assert not [event for event in events if event.event_type == EVENT_TIME_CHANGED]
+    assert not hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+
+    time_events = async_capture_events(hass, EVENT_TIME_CHANGED)
+    assert hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+    fire_time_event(time.monotonic())
+    await hass.async_block_till_done()
+    assert len(time_events) == 1
+
+    stop_timer(None)
+
+
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
@@ -3,6 +3,7 @@ import pytest
 
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.const import __version__
 import homeassistant.loader as loader
 
 from tests.async_mock import ANY, patch
@@ -251,6 +252,68 @@ async def test_get_custom_components_internal(hass):
     assert integrations == {"test": ANY, "test_package": ANY}
 
 
+async def test_integration_index(hass, hass_storage):
+    """Test resolved integrations are added to the index."""
+    integration = await loader.async_get_integration(hass, "hue")
+    assert "light" in integration.platforms
+    assert "manifest" not in integration.platforms
+
+    index = await loader.async_get_integration_index(hass)
+    stored = index._data_to_save()
+    entry = stored["integrations"]["homeassistant.components.hue"]
+    assert entry["manifest"]["domain"] == "hue"
+    assert entry["path"] == str(integration.file_path)
+    assert "light" in entry["platforms"]
+
+    # A new run resolves the integration from the stored index
+    entry["manifest"] = {**entry["manifest"], "name": "Indexed Hue"}
+    hass_storage[loader.INDEX_STORAGE_KEY] = {
+        "version": loader.INDEX_STORAGE_VERSION,
+        "key": loader.INDEX_STORAGE_KEY,
+        "data": stored,
+    }
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+
+    with patch.object(loader.Integration, "resolve_from_root") as mock_resolve:
+        integration = await loader.async_get_integration(hass, "hue")
+
+    assert not mock_resolve.mock_calls
+    assert integration.name == "Indexed Hue"
+    assert integration.is_built_in
+    assert "light" in integration.platforms
+
+    # Entries are not used when the manifest has changed
+    entry["mtime"] -= 1
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Philips Hue"
+
+    # Entries are not used when a platform was added or removed
+    entry["mtime"] += 1
+    entry["dir_mtime"] -= 1
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    hass.data.pop(loader.DATA_INTEGRATION_INDEX)
+
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Philips Hue"
+
+
+async def test_integration_index_load_error(hass, hass_storage):
+    """Test integrations are resolved when the index fails to load."""
+    hass_storage[loader.INDEX_STORAGE_KEY] = {
+        "version": loader.INDEX_STORAGE_VERSION,
+        "key": loader.INDEX_STORAGE_KEY,
+        "data": {"ha_version": __version__},
+    }
+
+    integration = await loader.async_get_integration(hass, "hue")
+    assert integration.name == "Philips Hue"
+    assert isinstance(hass.data[loader.DATA_INTEGRATION_INDEX], loader.IntegrationIndex)
+
+
 def _get_test_integration(hass, name, config_flow):
     """Return a generated test integration."""
     return loader.Integration(
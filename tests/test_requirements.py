@@ -1,18 +1,23 @@
 """Test requirements module."""
+import asyncio
 import os
+import sys
 
 import pytest
 
 from homeassistant import loader, setup
 from homeassistant.requirements import (
     CONSTRAINT_FILE,
+    DATA_REQUIREMENTS_CACHE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
     RequirementsNotFound,
     async_get_integration_with_requirements,
     async_process_requirements,
 )
 
 from tests.async_mock import call, patch
-from tests.common import MockModule, mock_integration
+from tests.common import MockModule, flush_store, mock_integration
 
 
 def env_without_wheel_links():
@@ -91,6 +96,27 @@ async def test_install_missing_package(hass):
     assert len(mock_inst.mock_calls) == 1
 
 
+async def test_get_integration_with_requirements_failed(hass):
+    """Test a failure to process requirements is not cached."""
+    hass.config.skip_pip = False
+    mock_integration(
+        hass, MockModule("test_component", requirements=["test-comp==1.0.0"])
+    )
+
+    with patch("homeassistant.util.package.is_installed", return_value=False), patch(
+        "homeassistant.util.package.install_package", side_effect=[False, True]
+    ) as mock_inst:
+        with pytest.raises(RequirementsNotFound):
+            await async_get_integration_with_requirements(hass, "test_component")
+
+        integration = await async_get_integration_with_requirements(
+            hass, "test_component"
+        )
+
+    assert integration.domain == "test_component"
+    assert len(mock_inst.mock_calls) == 2
+
+
 async def test_get_integration_with_requirements(hass):
     """Check getting an integration with loaded requirements."""
     hass.config.skip_pip = False
@@ -125,11 +151,15 @@ async def test_get_integration_with_requirements(hass):
         assert integration
         assert integration.domain == "test_component"
 
-    assert len(mock_is_installed.mock_calls) == 3
+    # Checked again after waiting for the pip lock
+    assert len(mock_is_installed.mock_calls) == 6
     assert sorted(mock_call[1][0] for mock_call in mock_is_installed.mock_calls) == [
         "test-comp-after-dep==1.0.0",
+        "test-comp-after-dep==1.0.0",
+        "test-comp-dep==1.0.0",
         "test-comp-dep==1.0.0",
         "test-comp==1.0.0",
+        "test-comp==1.0.0",
     ]
 
     assert len(mock_inst.mock_calls) == 3
@@ -227,3 +257,104 @@ async def test_discovery_requirements_zeroconf(hass, partial_manifest):
 
     assert len(mock_process.mock_calls) == 2  # zeroconf also depends on http
     assert mock_process.mock_calls[0][1][2] == zeroconf.requirements
+
+
+async def test_satisfied_requirements_cached(hass, hass_storage):
+    """Test requirements are only checked once while packages do not change."""
+    with patch(
+        "homeassistant.requirements._packages_fingerprint", return_value="abc"
+    ), patch(
+        "homeassistant.util.package.is_installed",
+        side_effect=lambda req: req == "hello==1.0.0",
+    ) as mock_is_installed, patch(
+        "homeassistant.util.package.install_package", return_value=True
+    ) as mock_inst:
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+        assert len(mock_is_installed.mock_calls) == 1
+
+        await async_process_requirements(hass, "test_component", ["world==1.0.0"])
+
+    assert len(mock_is_installed.mock_calls) == 3
+    assert len(mock_inst.mock_calls) == 1
+    assert mock_inst.mock_calls[0][1][0] == "world==1.0.0"
+
+    # Installing a package changes the fingerprint, others are checked again
+    req_cache = hass.data[DATA_REQUIREMENTS_CACHE]
+    assert req_cache.satisfied == {"world==1.0.0"}
+
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"fingerprint": "abc", "satisfied": ["hello==1.0.0"]},
+    }
+
+    # A new run uses the stored requirements when the fingerprint matches
+    for fingerprint, is_installed_calls in (("abc", 0), ("def", 1)):
+        hass.data.pop(DATA_REQUIREMENTS_CACHE)
+        with patch(
+            "homeassistant.requirements._packages_fingerprint",
+            return_value=fingerprint,
+        ), patch(
+            "homeassistant.util.package.is_installed", return_value=True
+        ) as mock_is_installed:
+            await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+
+        assert len(mock_is_installed.mock_calls) == is_installed_calls
+
+
+async def test_requirement_installed_while_waiting(hass):
+    """Test a requirement installed by another install is not installed again."""
+    installed = set()
+
+    def mock_install(req, **kwargs):
+        """Install a requirement with its dependency."""
+        installed.update((req, "dep==1.0.0"))
+        return True
+
+    with patch(
+        "homeassistant.util.package.is_installed", side_effect=installed.__contains__
+    ), patch(
+        "homeassistant.util.package.install_package", side_effect=mock_install
+    ) as mock_inst:
+        await asyncio.gather(
+            async_process_requirements(hass, "test_component", ["hello==1.0.0"]),
+            async_process_requirements(hass, "test_component_2", ["dep==1.0.0"]),
+        )
+
+    assert len(mock_inst.mock_calls) == 1
+    assert mock_inst.mock_calls[0][1][0] == "hello==1.0.0"
+
+
+async def test_packages_fingerprint(hass, hass_storage, tmp_path):
+    """Test the fingerprint only changes with the package directories."""
+    site_packages = tmp_path / "lib" / "site-packages"
+    site_packages.mkdir(parents=True)
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    os.utime(site_packages, ns=(1, 1))
+    os.utime(config_dir, ns=(1, 1))
+
+    async def process_requirements():
+        """Process the requirements of a new run."""
+        hass.data.pop(DATA_REQUIREMENTS_CACHE, None)
+        with patch(
+            "homeassistant.util.package.is_installed", return_value=True
+        ) as mock_is_installed:
+            await async_process_requirements(hass, "test_component", ["hello==1.0.0"])
+        await flush_store(hass.data[DATA_REQUIREMENTS_CACHE]._store)
+        return len(mock_is_installed.mock_calls)
+
+    with patch.object(sys, "path", [str(config_dir), str(site_packages)]):
+        assert await process_requirements() == 1
+
+        # The config dir changes on every run
+        (config_dir / "home-assistant.log").write_text("log")
+        os.utime(config_dir, ns=(2, 2))
+        assert await process_requirements() == 0
+
+        # A package was installed
+        (site_packages / "hello").mkdir()
+        os.utime(site_packages, ns=(2, 2))
+        assert await process_requirements() == 1
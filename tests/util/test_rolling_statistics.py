@@ -0,0 +1,148 @@
+"""Test Home Assistant rolling statistics."""
+from datetime import timedelta
+import random
+import statistics
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.rolling_statistics import RollingStatistics
+
+
+def _assert_matches(stats, values):
+    """Assert that the statistics match a full recomputation."""
+    assert stats.count == len(values)
+    assert stats.total == pytest.approx(sum(values))
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.median == pytest.approx(statistics.median(values))
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    if len(values) > 1:
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+    else:
+        assert stats.variance is None
+        assert stats.stdev is None
+
+
+def test_empty():
+    """Test statistics of an empty window."""
+    stats = RollingStatistics(10)
+
+    assert len(stats) == 0
+    assert stats.count == 0
+    assert stats.total is None
+    assert stats.mean is None
+    assert stats.median is None
+    assert stats.variance is None
+    assert stats.stdev is None
+    assert stats.min is None
+    assert stats.max is None
+    assert stats.next_expiry() is None
+
+
+def test_max_count():
+    """Test samples are evicted when the window is full."""
+    random.seed(0)
+    now = dt_util.utcnow()
+    stats = RollingStatistics(20)
+    values = []
+
+    for i in range(500):
+        value = round(random.uniform(-50, 50), 1)
+        values.append(value)
+        stats.add(value, now + timedelta(seconds=i))
+        _assert_matches(stats, values[-20:])
+
+    assert list(stats.values) == values[-20:]
+
+
+def test_max_age():
+    """Test samples are evicted when they are too old."""
+    now = dt_util.utcnow()
+    stats = RollingStatistics(max_age=timedelta(minutes=3))
+    values = [17, 20, 15.2, 5, 3.8, 9.2, 6.7, 14, 6]
+
+    for i, value in enumerate(values):
+        stats.add(value, now + timedelta(minutes=i))
+
+    assert stats.next_expiry() == now + timedelta(minutes=3)
+
+    stats.purge(now + timedelta(minutes=8))
+    _assert_matches(stats, values[-4:])
+    assert stats.next_expiry() == now + timedelta(minutes=8)
+
+    stats.purge(now + timedelta(minutes=20))
+    assert stats.count == 0
+    assert stats.mean is None
+    assert stats.min is None
+
+    stats.add(4, now + timedelta(minutes=20))
+    _assert_matches(stats, [4])
+
+
+def test_duplicates():
+    """Test evicting duplicated values keeps min, max and median right."""
+    now = dt_util.utcnow()
+    stats = RollingStatistics(3)
+    values = [5, 5, 1, 1, 5, 1, 9, 9, 9, 0]
+
+    for i, value in enumerate(values):
+        stats.add(value, now + timedelta(seconds=i))
+        _assert_matches(stats, values[max(0, i - 2) : i + 1])
+
+
+def test_clear():
+    """Test clearing the window."""
+    now = dt_util.utcnow()
+    stats = RollingStatistics(5)
+    stats.add(1, now)
+    stats.add(2, now)
+    stats.clear()
+
+    assert stats.count == 0
+    assert stats.max is None
+
+    stats.add(3, now)
+    stats.add(7, now)
+    _assert_matches(stats, [3, 7])
+
+
+def test_non_numeric():
+    """Test a non numeric window only keeps the samples."""
+    now = dt_util.utcnow()
+    stats = RollingStatistics(2, numeric=False)
+
+    for value in ("on", "off", "on"):
+        stats.add(value, now)
+
+    assert list(stats.values) == ["off", "on"]
+    assert stats.count == 2
+    assert stats.mean is None
+
+
+def test_no_drift():
+    """Test the variance does not drift after many evictions."""
+    random.seed(0)
+    now = dt_util.utcnow()
+    stats = RollingStatistics(100)
+
+    for _ in range(20000):
+        stats.add(1e7 + random.random() / 100, now)
+
+    values = list(stats.values)
+    assert stats.mean == pytest.approx(statistics.mean(values), rel=1e-15)
+    assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+
+
+def test_median_heaps_bounded():
+    """Test evicted samples do not accumulate in the median heaps."""
+    now = dt_util.utcnow()
+    stats = RollingStatistics(10)
+
+    for value in range(10000):
+        stats.add(value, now)
+        assert stats.median == value - min(value, 9) / 2
+
+    median = stats._median
+    assert len(median._low) + len(median._high) < 100
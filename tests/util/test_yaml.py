@@ -461,3 +461,170 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert "contains duplicate key" in caplog.text
+
+
+def test_load_yaml_cached(tmp_path):
+    """Test the cache is used until an included file changes."""
+    config_file = tmp_path / YAML_CONFIG_FILE
+    config_file.write_text("key: !include included.yaml\npw: !secret pw\n")
+    included = tmp_path / "included.yaml"
+    included.write_text("value: 1\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("pw: abc\n")
+    cache_file = str(tmp_path / ".storage" / "yaml_cache")
+
+    data = yaml.load_yaml_cached(str(config_file), cache_file)
+    assert data == {"key": {"value": 1}, "pw": "abc"}
+    assert os.path.isfile(cache_file)
+
+    with patch.object(yaml_loader, "load_yaml") as mock_load:
+        data = yaml.load_yaml_cached(str(config_file), cache_file)
+    assert not mock_load.called
+    assert data == {"key": {"value": 1}, "pw": "abc"}
+    assert data.__config_file__ == str(config_file)
+    assert data.__line__ == 0
+
+    # Same content with a new modification time
+    os.utime(included, ns=(0, 0))
+    with patch.object(yaml_loader, "load_yaml") as mock_load:
+        yaml.load_yaml_cached(str(config_file), cache_file)
+    assert not mock_load.called
+
+    included.write_text("value: 2\n")
+    data = yaml.load_yaml_cached(str(config_file), cache_file)
+    assert data["key"] == {"value": 2}
+
+    yaml.clear_secret_cache()
+    (tmp_path / yaml.SECRET_YAML).write_text("pw: def\n")
+    data = yaml.load_yaml_cached(str(config_file), cache_file)
+    assert data["pw"] == "def"
+
+
+def test_load_yaml_cached_include_dir(tmp_path):
+    """Test the cache is invalidated when files are added to a directory."""
+    (tmp_path / YAML_CONFIG_FILE).write_text("key: !include_dir_list items\n")
+    cache_file = str(tmp_path / "yaml_cache")
+
+    data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert data == {"key": []}
+
+    (tmp_path / "items").mkdir()
+    (tmp_path / "items" / "one.yaml").write_text("1\n")
+    data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert data == {"key": [1]}
+
+    (tmp_path / "items" / "two.yaml").write_text("2\n")
+    data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert data == {"key": [1, 2]}
+
+
+def test_load_yaml_cached_env_var(tmp_path):
+    """Test environment variables are looked up but not stored in the cache."""
+    (tmp_path / YAML_CONFIG_FILE).write_text("key: !env_var YAML_CACHE_TEST\n")
+    cache_file = str(tmp_path / "yaml_cache")
+
+    with patch.dict(os.environ, {"YAML_CACHE_TEST": "a"}):
+        data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert data == {"key": "a"}
+
+    with patch.dict(os.environ, {"YAML_CACHE_TEST": "b"}):
+        data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert data == {"key": "b"}
+
+    with open(cache_file, "rb") as fil:
+        assert b"YAML_CACHE_TEST" in fil.read()
+    with patch.dict(os.environ, {"YAML_CACHE_TEST": "secret_env_value"}):
+        yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+        with open(cache_file, "rb") as fil:
+            assert b"secret_env_value" not in fil.read()
+
+        with patch.object(yaml_loader, "load_yaml") as mock_load:
+            data = yaml.load_yaml_cached(str(tmp_path / YAML_CONFIG_FILE), cache_file)
+    assert not mock_load.called
+    assert data == {"key": "secret_env_value"}
+
+
+def test_load_yaml_cached_not_cacheable(tmp_path):
+    """Test loads of files that are not on disk are not cached."""
+    cache_file = str(tmp_path / "yaml_cache")
+    files = {YAML_CONFIG_FILE: "key: thing"}
+    with patch_yaml_files(files):
+        data = yaml.load_yaml_cached(YAML_CONFIG_FILE, cache_file)
+    assert data == {"key": "thing"}
+    assert not os.path.exists(cache_file)
+
+
+def test_load_yaml_cached_secrets(tmp_path):
+    """Test secrets are not stored in the cache and looked up on every load."""
+    config_file = tmp_path / YAML_CONFIG_FILE
+    config_file.write_text("pw: !secret pw\nkeyring: !secret keyring_pw\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("pw: secret_from_file\n")
+    cache_file = tmp_path / "yaml_cache"
+
+    with patch.object(yaml_loader, "keyring") as mock_keyring:
+        mock_keyring.get_password.return_value = "secret_from_keyring"
+        data = yaml.load_yaml_cached(str(config_file), str(cache_file))
+    assert data == {"pw": "secret_from_file", "keyring": "secret_from_keyring"}
+    assert b"secret_from" not in cache_file.read_bytes()
+
+    yaml.clear_secret_cache()
+    with patch.object(yaml_loader, "keyring") as mock_keyring, patch.object(
+        yaml_loader, "load_yaml", wraps=yaml_loader.load_yaml
+    ) as mock_load:
+        mock_keyring.get_password.return_value = "changed"
+        data = yaml.load_yaml_cached(str(config_file), str(cache_file))
+    # Only secrets files are loaded
+    assert str(config_file) not in [call[1][0] for call in mock_load.mock_calls]
+    assert str(tmp_path / yaml.SECRET_YAML) in [
+        call[1][0] for call in mock_load.mock_calls
+    ]
+    assert data == {"pw": "secret_from_file", "keyring": "changed"}
+    assert data.__config_file__ == str(config_file)
+    yaml.clear_secret_cache()
+
+
+@pytest.mark.parametrize(
+    "loader_class", [yaml_loader.FastSafeLoader, yaml_loader.SafeLineLoader]
+)
+def test_loaders_annotate(loader_class, tmp_path):
+    """Test both loaders add the same file and line references."""
+    (tmp_path / "included.yaml").write_text("- a\n- b\n")
+    (tmp_path / yaml.SECRET_YAML).write_text("pw: abc\n")
+    config_file = tmp_path / YAML_CONFIG_FILE
+    config_file.write_text(
+        "key:\n"
+        "  nested: value\n"
+        "  list: [1, 2]\n"
+        "pw: !secret pw\n"
+        "included: !include included.yaml\n"
+    )
+
+    with patch.object(yaml_loader, "FastSafeLoader", loader_class):
+        data = yaml.load_yaml(str(config_file))
+
+    assert data == {
+        "key": {"nested": "value", "list": [1, 2]},
+        "pw": "abc",
+        "included": ["a", "b"],
+    }
+    assert data.__config_file__ == str(config_file)
+    assert data["key"].__line__ == 1
+    assert isinstance(data["key"]["list"], yaml_loader.NodeListClass)
+    assert data["key"]["list"].__line__ == 2
+    assert isinstance(data["included"], yaml_loader.NodeListClass)
+    assert data["included"].__config_file__ == str(config_file)
+    assert data["included"].__line__ == 4
+
+
+def test_fast_loader_error(tmp_path):
+    """Test errors are reported the same way with libyaml."""
+    config_file = tmp_path / YAML_CONFIG_FILE
+    config_file.write_text("key: value\n  other: [1\n")
+
+    with pytest.raises(HomeAssistantError) as fast_err:
+        yaml.load_yaml(str(config_file))
+    with patch.object(
+        yaml_loader, "FastSafeLoader", yaml_loader.SafeLineLoader
+    ), pytest.raises(HomeAssistantError) as line_err:
+        yaml.load_yaml(str(config_file))
+
+    assert str(fast_err.value) == str(line_err.value)